@@ -0,0 +1,123 @@
+"""
+Benchmark the asyncio driver facade against the fake Appium server.
+
+Reads name and price of every product on the PRODUCTS screen, and captures
+screenshot plus page source, once command by command and once through
+AsyncDriver, with an injected per-command server latency standing in for the
+round trip to a remote Appium server.
+
+Usage: python benchmarks/bench_async_driver.py [--latency 0.02] [--rounds 5]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from appium.options.android import UiAutomator2Options  # noqa: E402
+
+from pages.products_page import ProductsPage  # noqa: E402
+from utils import http_client  # noqa: E402
+from utils.async_driver import AsyncDriver  # noqa: E402
+from utils.fake_appium import FakeAppiumServer  # noqa: E402
+
+
+def _options():
+    options = UiAutomator2Options()
+    options.app_package = "com.swaglabsmobileapp"
+    return options
+
+
+def read_products_sequential(page, items):
+    return [
+        (
+            item.find_element(*page.ITEM_TITLE).text,
+            item.find_element(*page.ITEM_PRICE).text,
+        )
+        for item in items
+    ]
+
+
+async def _read_product(adriver, page, item):
+    return tuple(
+        await adriver.gather(
+            adriver.child_text(item, *page.ITEM_TITLE),
+            adriver.child_text(item, *page.ITEM_PRICE),
+        )
+    )
+
+
+def read_products_async(page, items):
+    adriver = page.async_driver
+    return adriver.run_sync(
+        adriver.gather(*(_read_product(adriver, page, item) for item in items))
+    )
+
+
+def capture_sequential(driver):
+    return driver.get_screenshot_as_png(), driver.page_source
+
+
+def capture_async(driver):
+    adriver = AsyncDriver.for_driver(driver)
+    return adriver.run_sync(adriver.gather(adriver.screenshot(), adriver.page_source()))
+
+
+def measure(func, rounds):
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="Server delay per command (s)"
+    )
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    with FakeAppiumServer(latency=args.latency) as server:
+        driver = http_client.create_driver(
+            server.url, _options(), pool_size=args.concurrency
+        )
+        AsyncDriver.for_driver(driver, max_concurrency=args.concurrency)
+        page = ProductsPage(driver)
+        items = driver.find_elements(*page.PRODUCT_ITEMS)
+
+        cases = {
+            f"product details ({len(items)} items)": (
+                lambda: read_products_sequential(page, items),
+                lambda: read_products_async(page, items),
+            ),
+            "screenshot + page source": (
+                lambda: capture_sequential(driver),
+                lambda: capture_async(driver),
+            ),
+        }
+
+        print(
+            f"{args.latency * 1000:.0f} ms per command, "
+            f"concurrency {args.concurrency}, median of {args.rounds} rounds"
+        )
+        print(f"{'workload':<30}{'sync ms':>10}{'async ms':>10}{'speedup':>9}")
+        for name, (sync_func, async_func) in cases.items():
+            sync_time = measure(sync_func, args.rounds)
+            async_time = measure(async_func, args.rounds)
+            print(
+                f"{name:<30}{sync_time * 1000:>10.1f}{async_time * 1000:>10.1f}"
+                f"{sync_time / async_time:>8.1f}x"
+            )
+        driver.quit()
+    http_client.close_all()
+
+
+if __name__ == "__main__":
+    main()
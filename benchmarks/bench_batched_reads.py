@@ -0,0 +1,92 @@
+"""
+Benchmark batched reads of element collections against the fake Appium server.
+
+Reads name, price and bounds of every product on PRODUCTS screens of growing
+length, once element by element through the driver and once with
+BasePage.read_records, and reports commands sent and time taken. Per-element
+reads grow linearly with the list, read_records stays at one page source
+request.
+
+Usage: python benchmarks/bench_batched_reads.py [--latency 0.02] [--sizes 5 20 50]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from appium.options.android import UiAutomator2Options  # noqa: E402
+
+from pages.products_page import ProductsPage  # noqa: E402
+from utils import http_client  # noqa: E402
+from utils.fake_appium import FakeAppiumServer, products_screen  # noqa: E402
+
+
+def _options():
+    options = UiAutomator2Options()
+    options.app_package = "com.swaglabsmobileapp"
+    return options
+
+
+def read_per_element(page):
+    return [
+        {
+            "name": item.find_element(*page.ITEM_TITLE).text,
+            "price": item.find_element(*page.ITEM_PRICE).text,
+            "bounds": item.rect,
+        }
+        for item in page.driver.find_elements(*page.PRODUCT_ITEMS)
+    ]
+
+
+def read_batched(page):
+    page.invalidate_snapshot()
+    return page.read_records(
+        page.PRODUCT_ITEMS,
+        {"name": page.ITEM_TITLE, "price": page.ITEM_PRICE, "bounds": "bounds"},
+    )
+
+
+def measure(server, func):
+    before = sum(server.stats.commands.values())
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    return sum(server.stats.commands.values()) - before, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="Server delay per command (s)"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 20, 50])
+    args = parser.parse_args()
+
+    print(f"{args.latency * 1000:.0f} ms per command")
+    print(
+        f"{'items':>6}{'per-element calls':>19}{'ms':>9}"
+        f"{'batched calls':>15}{'ms':>9}{'speedup':>9}"
+    )
+    with FakeAppiumServer(latency=args.latency) as server:
+        driver = http_client.create_driver(server.url, _options())
+        page = ProductsPage(driver)
+        for size in args.sizes:
+            products = [(f"Product {i}", f"${i}.99") for i in range(size)]
+            server.set_page_source(products_screen(products), driver.session_id)
+
+            calls, elapsed = measure(server, lambda: read_per_element(page))
+            batched_calls, batched_elapsed = measure(server, lambda: read_batched(page))
+            print(
+                f"{size:>6}{calls:>19}{elapsed * 1000:>9.1f}"
+                f"{batched_calls:>15}{batched_elapsed * 1000:>9.1f}"
+                f"{elapsed / batched_elapsed:>8.1f}x"
+            )
+        driver.quit()
+    http_client.close_all()
+
+
+if __name__ == "__main__":
+    main()
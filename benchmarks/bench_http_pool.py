@@ -0,0 +1,97 @@
+"""
+Benchmark Appium HTTP connection handling against the fake Appium server.
+
+Runs the same session workload (create session, N commands, quit) with
+connection reuse disabled, with the client's default per-driver connection
+and with the shared pool, and prints per-command latency and the number of
+TCP connections the server accepted.
+
+Usage: python benchmarks/bench_http_pool.py [--sessions 10] [--commands 50]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from appium import webdriver  # noqa: E402
+from appium.options.android import UiAutomator2Options  # noqa: E402
+
+from utils import http_client  # noqa: E402
+from utils.fake_appium import FakeAppiumServer  # noqa: E402
+
+APP_ID = "com.swaglabsmobileapp"
+
+
+def _options():
+    options = UiAutomator2Options()
+    options.app_package = APP_ID
+    return options
+
+
+def _default_driver(server_url, options):
+    return webdriver.Remote(server_url, options=options)
+
+
+def _no_keep_alive_driver(server_url, options):
+    return http_client.create_driver(server_url, options, keep_alive=False)
+
+
+def _pooled_driver(server_url, options):
+    return http_client.create_driver(server_url, options)
+
+
+MODES = {
+    "no keep-alive": _no_keep_alive_driver,
+    "per-driver (default)": _default_driver,
+    "shared pool": _pooled_driver,
+}
+
+
+def run(create_driver, sessions, commands, latency):
+    """Run the workload and return (command latencies, server connections)."""
+    http_client.close_all()
+    timings = []
+    with FakeAppiumServer(latency=latency) as server:
+        for _ in range(sessions):
+            driver = create_driver(server.url, _options())
+            for _ in range(commands):
+                started = time.perf_counter()
+                driver.query_app_state(APP_ID)
+                timings.append(time.perf_counter() - started)
+            driver.quit()
+        connections = server.stats.connections
+    http_client.close_all()
+    return timings, connections
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--commands", type=int, default=50)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Server delay per command (s)"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{args.sessions} sessions x {args.commands} commands, "
+        f"{args.latency * 1000:.1f} ms server latency"
+    )
+    print(f"{'mode':<22}{'mean ms':>10}{'p95 ms':>10}{'connections':>13}")
+    for name, create_driver in MODES.items():
+        timings, connections = run(
+            create_driver, args.sessions, args.commands, args.latency
+        )
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        print(
+            f"{name:<22}{statistics.mean(timings) * 1000:>10.3f}"
+            f"{p95 * 1000:>10.3f}{connections:>13}"
+        )
+
+
+if __name__ == "__main__":
+    main()
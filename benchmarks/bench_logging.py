@@ -0,0 +1,75 @@
+"""
+Benchmark the cost of a log record on the logging thread.
+
+Logs bursts of INFO records like the page objects do, once with handlers
+running on the calling thread (logging.basicConfig style: file, console and
+per-test file) and once through utils.log_queue's queue and listener thread,
+with both f-string and "%s"-style messages. Reports microseconds per record
+spent by the caller, and for the queue the time until everything is written.
+
+Usage: python benchmarks/bench_logging.py [--records 20000]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils import log_queue  # noqa: E402
+
+logger = logging.getLogger("pages.products_page")
+
+
+def log_fstring(count):
+    for i in range(count):
+        name, price = f"Product {i}", f"${i}.99"
+        logger.info(f"Product {i}: {name} - {price}")
+
+
+def log_lazy(count):
+    for i in range(count):
+        name, price = f"Product {i}", f"${i}.99"
+        logger.info("Product %d: %s - %s", i, name, price)
+
+
+def measure(directory, use_queue, func, count):
+    with open(os.devnull, "w") as console:
+        log_queue.configure(
+            directory / f"queue_{use_queue}.log", use_queue=use_queue, stream=console
+        )
+        log_queue.start_test(directory / "test.log")
+        started = time.perf_counter()
+        func(count)
+        caller = time.perf_counter() - started
+        log_queue.flush()
+        total = time.perf_counter() - started
+        log_queue.end_test()
+        log_queue.shutdown()
+    return caller, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{args.records} records, microseconds per record")
+    print(f"{'handlers':<12}{'message':<10}{'caller':>10}{'until written':>15}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for use_queue in (False, True):
+            for label, func in (("f-string", log_fstring), ("lazy", log_lazy)):
+                caller, total = measure(Path(tmp), use_queue, func, args.records)
+                print(
+                    f"{'queue' if use_queue else 'inline':<12}{label:<10}"
+                    f"{caller * 1e6 / args.records:>10.1f}"
+                    f"{total * 1e6 / args.records:>15.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark test-thread time of screenshots written inline and in the background.
+
+Saves bursts of screenshot payloads of a device-like size, once decoding and
+writing each file on the calling thread (what driver.save_screenshot does
+after the capture) and once handing it to ScreenshotWriter, and reports the
+time the calling thread spends per screenshot. The capture request itself is
+the same in both cases and is left out.
+
+Usage: python benchmarks/bench_screenshots.py [--size-kb 1500] [--count 20] [--queue 8]
+"""
+
+import argparse
+import base64
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.screenshot_writer import ScreenshotWriter  # noqa: E402
+
+
+def write_inline(payloads, directory):
+    for i, payload in enumerate(payloads):
+        (directory / f"inline_{i}.png").write_bytes(base64.b64decode(payload))
+
+
+def write_background(payloads, directory, writer):
+    for i, payload in enumerate(payloads):
+        writer.submit(payload, directory / f"background_{i}.png")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-kb", type=int, default=1500, help="PNG size (KB)")
+    parser.add_argument("--count", type=int, default=20, help="Screenshots per burst")
+    parser.add_argument("--queue", type=int, default=8, help="Writer queue size")
+    args = parser.parse_args()
+
+    payloads = [
+        base64.b64encode(os.urandom(args.size_kb * 1024)).decode("ascii")
+        for _ in range(args.count)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+
+        started = time.perf_counter()
+        write_inline(payloads, directory)
+        inline = time.perf_counter() - started
+
+        writer = ScreenshotWriter(max_queue=args.queue)
+        started = time.perf_counter()
+        write_background(payloads, directory, writer)
+        background = time.perf_counter() - started
+        writer.flush()
+        total = time.perf_counter() - started
+        writer.close()
+
+    print(f"{args.count} screenshots of {args.size_kb} KB, queue of {args.queue}")
+    print(f"{'':<12}{'test thread ms':>16}{'per shot ms':>13}{'until on disk ms':>18}")
+    print(
+        f"{'inline':<12}{inline * 1000:>16.1f}"
+        f"{inline * 1000 / args.count:>13.2f}{inline * 1000:>18.1f}"
+    )
+    print(
+        f"{'background':<12}{background * 1000:>16.1f}"
+        f"{background * 1000 / args.count:>13.2f}{total * 1000:>18.1f}"
+    )
+    print(
+        f"Blocked on a full queue: {writer.stats['blocked_seconds'] * 1000:.1f} ms; "
+        f"saved on the test thread: {(inline - background) * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
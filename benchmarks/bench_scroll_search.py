@@ -0,0 +1,120 @@
+"""
+Benchmark multi-target scroll search against per-target UiScrollable scrolls.
+
+Runs login screen flows on the fake Appium server, once scrolling to each
+target with UiScrollable.scrollIntoView (which swipes back to the top of the
+list before searching forward) and once with BasePage.scroll_search plus
+scroll_to_target, and reports swipes and time taken. Every swipe costs
+--swipe-time seconds, every command --latency seconds.
+
+Usage: python benchmarks/bench_scroll_search.py [--swipe-time 0.3] [--latency 0.02]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from appium.options.android import UiAutomator2Options  # noqa: E402
+
+from pages.login_page import LoginPage  # noqa: E402
+from utils import http_client  # noqa: E402
+from utils.fake_appium import LOGIN_ROWS, FakeAppiumServer, list_screens  # noqa: E402
+
+
+def _options():
+    options = UiAutomator2Options()
+    options.app_package = "com.swaglabsmobileapp"
+    return options
+
+
+def login_per_target(page):
+    page.scroll_to_standard_user()
+    page.select_standard_user()
+    page.scroll_to_accessibility_id("test-LOGIN")
+
+
+def login_search(page):
+    targets = page.scroll_search(
+        texts=[page.STANDARD_USER_TEXT], accessibility_ids=["test-LOGIN"]
+    )
+    page.select_standard_user(targets)
+    page.scroll_to_target(targets, "test-LOGIN")
+
+
+def form_per_target(page):
+    page.scroll_to_text(page.STANDARD_USER_TEXT)
+    page.scroll_to_accessibility_id("test-Username")
+    page.scroll_to_accessibility_id("test-LOGIN")
+
+
+def form_search(page):
+    targets = page.scroll_search(
+        texts=[page.STANDARD_USER_TEXT],
+        accessibility_ids=["test-Username", "test-LOGIN"],
+    )
+    for target in (page.STANDARD_USER_TEXT, "test-Username", "test-LOGIN"):
+        page.scroll_to_target(targets, target)
+
+
+def run(server, driver, flow, rounds):
+    swipes = []
+    timings = []
+    session = server.sessions[driver.session_id]
+    for _ in range(rounds):
+        server.set_page_source(list_screens(LOGIN_ROWS, 3), driver.session_id)
+        session.app_events.clear()
+        started = time.perf_counter()
+        flow(LoginPage(driver))
+        timings.append(time.perf_counter() - started)
+        swipes.append(
+            sum(1 for event in session.app_events if event[0] in ("actions", "scroll"))
+        )
+    return statistics.median(swipes), statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--swipe-time", type=float, default=0.3, help="Duration of a swipe (s)"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="Server delay per command (s)"
+    )
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    cases = {
+        "standard_user, LOGIN": (login_per_target, login_search),
+        "standard_user, Username, LOGIN": (form_per_target, form_search),
+    }
+    print(
+        f"{args.swipe_time * 1000:.0f} ms per swipe, "
+        f"{args.latency * 1000:.0f} ms per command, median of {args.rounds} rounds"
+    )
+    print(
+        f"{'targets':<32}{'per-target swipes':>18}{'ms':>8}"
+        f"{'search swipes':>15}{'ms':>8}"
+    )
+    with FakeAppiumServer(
+        page_source=list_screens(LOGIN_ROWS, 3),
+        latency=args.latency,
+        swipe_time=args.swipe_time,
+    ) as server:
+        driver = http_client.create_driver(server.url, _options())
+        for name, (per_target, search) in cases.items():
+            old_swipes, old_time = run(server, driver, per_target, args.rounds)
+            new_swipes, new_time = run(server, driver, search, args.rounds)
+            print(
+                f"{name:<32}{old_swipes:>18}{old_time * 1000:>8.0f}"
+                f"{new_swipes:>15}{new_time * 1000:>8.0f}"
+            )
+        driver.quit()
+    http_client.close_all()
+
+
+if __name__ == "__main__":
+    main()
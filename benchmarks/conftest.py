@@ -0,0 +1,218 @@
+"""
+Fixtures of the framework-overhead benchmarks (pytest-benchmark).
+
+The page objects run against a FakeAppiumServer through an
+InProcessConnection, so an operation costs only what the framework does:
+the Appium client, the connection hooks, page objects, snapshots and
+logging. For each operation the `overhead` fixture records
+
+- calls per operation: WebDriver commands the fake server received,
+- framework CPU time: CPU time of the test thread minus the time spent in
+  the fake server (work moved to background threads is not counted),
+
+and compares both with benchmarks/baselines.json: more calls than the
+baseline, or CPU time above baseline * --cpu-tolerance (plus
+CPU_SLACK_MS for timer noise on sub-millisecond operations), fails the test.
+Wall times are reported by pytest-benchmark as usual and include the
+latency injected with --fake-latency / --command-latency.
+"""
+
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from appium.options.android import UiAutomator2Options
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import settings  # noqa: E402
+from utils import log_queue, screenshot_writer  # noqa: E402
+from utils.fake_appium import FakeAppiumServer, in_process_driver  # noqa: E402
+
+BASELINES = Path(__file__).parent / "baselines.json"
+PAGE_SOURCES = Path(__file__).parent.parent / "tests" / "fixtures" / "page_sources"
+CPU_SLACK_MS = 0.5
+
+logger = logging.getLogger(__name__)
+
+measured = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("framework overhead")
+    group.addoption(
+        "--fake-latency",
+        type=float,
+        default=0.0,
+        help="Seconds the fake driver adds to every command",
+    )
+    group.addoption(
+        "--command-latency",
+        action="append",
+        default=[],
+        metavar="COMMAND=SECONDS",
+        help="Latency of one fake server command, e.g. page_source=0.3",
+    )
+    group.addoption(
+        "--cpu-tolerance",
+        type=float,
+        default=3.0,
+        help="Fail when framework CPU time exceeds the baseline by this factor",
+    )
+    group.addoption(
+        "--update-baselines",
+        action="store_true",
+        help="Write the measured calls and CPU times to benchmarks/baselines.json",
+    )
+
+
+def pytest_sessionfinish(session):
+    if not session.config.getoption("--update-baselines") or not measured:
+        return
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    baselines.update(measured)
+    BASELINES.write_text(json.dumps(dict(sorted(baselines.items())), indent=2) + "\n")
+    logger.info(f"Baselines of {len(measured)} benchmarks written to {BASELINES}")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def bench_logging(tmp_path_factory):
+    """Log like a test run does, to a scratch file instead of the console."""
+    with open(os.devnull, "w") as devnull:
+        log_queue.configure(
+            tmp_path_factory.mktemp("logs") / "bench.log",
+            use_queue=settings.LOG_QUEUE,
+            stream=devnull,
+        )
+        yield
+        log_queue.shutdown()
+    screenshot_writer.shutdown()
+
+
+def _options():
+    options = UiAutomator2Options()
+    options.app_package = "com.swaglabsmobileapp"
+    return options
+
+
+def _latencies(config):
+    latencies = {}
+    for entry in config.getoption("--command-latency"):
+        command, _, seconds = entry.partition("=")
+        latencies[command] = float(seconds)
+    return latencies
+
+
+@pytest.fixture
+def products_screens():
+    return [
+        (PAGE_SOURCES / "products_top.xml").read_text(),
+        (PAGE_SOURCES / "products_bottom.xml").read_text(),
+    ]
+
+
+@pytest.fixture
+def cart_screen():
+    return (PAGE_SOURCES / "cart.xml").read_text()
+
+
+@pytest.fixture
+def server(request, products_screens):
+    return FakeAppiumServer(
+        latency=request.config.getoption("--fake-latency"),
+        latencies=_latencies(request.config),
+        page_source=products_screens,
+    )
+
+
+@pytest.fixture
+def driver(server):
+    driver = in_process_driver(server, _options())
+    yield driver
+    driver.quit()
+
+
+class OverheadMeter:
+    """Run an operation under pytest-benchmark, counting calls and CPU time."""
+
+    def __init__(self, benchmark, server, driver, name, tolerance, update):
+        self.benchmark = benchmark
+        self.server = server
+        self.connection = driver.command_executor
+        self.name = name
+        self.tolerance = tolerance
+        self.update = update
+
+    def _commands(self):
+        return sum(self.server.stats.commands.values())
+
+    def __call__(self, operation, setup=None, rounds=20):
+        """Benchmark operation and check it against its baseline.
+
+        Args:
+            operation: Callable doing one operation.
+            setup: Callable run before every round, not measured.
+            rounds: Measured rounds, after one warm-up round.
+
+        Returns:
+            Dict with 'calls_per_op' and 'cpu_ms_per_op'.
+        """
+        samples = []
+
+        def measured_operation():
+            commands = self._commands()
+            server_seconds = self.connection.server_seconds
+            started = time.thread_time()
+            operation()
+            cpu = time.thread_time() - started
+            cpu -= self.connection.server_seconds - server_seconds
+            samples.append((self._commands() - commands, cpu))
+
+        self.benchmark.pedantic(
+            measured_operation, setup=setup, rounds=rounds, warmup_rounds=1
+        )
+        result = {
+            "calls_per_op": max(calls for calls, _ in samples),
+            "cpu_ms_per_op": round(
+                statistics.median(cpu for _, cpu in samples) * 1000, 3
+            ),
+        }
+        self.benchmark.extra_info.update(result)
+        if self.update:
+            measured[self.name] = result
+        else:
+            self._check(result)
+        return result
+
+    def _check(self, result):
+        baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+        baseline = baselines.get(self.name)
+        if baseline is None:
+            pytest.fail(f"No baseline for {self.name}, run with --update-baselines")
+        assert result["calls_per_op"] <= baseline["calls_per_op"], (
+            f"{self.name} sends {result['calls_per_op']} WebDriver commands per "
+            f"operation, baseline is {baseline['calls_per_op']}"
+        )
+        limit = baseline["cpu_ms_per_op"] * self.tolerance + CPU_SLACK_MS
+        assert result["cpu_ms_per_op"] <= limit, (
+            f"{self.name} takes {result['cpu_ms_per_op']} ms framework CPU per "
+            f"operation, more than {limit:.3f} ms "
+            f"(baseline {baseline['cpu_ms_per_op']} ms x {self.tolerance})"
+        )
+
+
+@pytest.fixture
+def overhead(benchmark, server, driver, request):
+    return OverheadMeter(
+        benchmark,
+        server,
+        driver,
+        request.node.name,
+        request.config.getoption("--cpu-tolerance"),
+        request.config.getoption("--update-baselines"),
+    )
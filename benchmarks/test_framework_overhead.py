@@ -0,0 +1,81 @@
+"""
+Framework overhead of page object operations against an in-process fake driver.
+
+Run: pytest benchmarks/ [--fake-latency 0.05] [--update-baselines]
+"""
+
+import itertools
+
+from appium.webdriver.common.appiumby import AppiumBy
+
+from pages.base_page import BasePage
+from pages.cart_page import CartPage
+from pages.products_page import ProductsPage
+from utils import screenshot_writer
+from utils.helpers import take_screenshot
+
+PRODUCTS_TITLE = (AppiumBy.XPATH, '//android.widget.TextView[@text="PRODUCTS"]')
+PRODUCT_FIELDS = {"name": ProductsPage.ITEM_TITLE, "price": ProductsPage.ITEM_PRICE}
+
+
+class TestBasePage:
+    def test_get_text(self, overhead, driver):
+        page = BasePage(driver)
+
+        overhead(lambda: page.get_text(PRODUCTS_TITLE), rounds=50)
+
+    def test_read_records(self, overhead, driver):
+        page = BasePage(driver)
+
+        overhead(
+            lambda: page.read_records(ProductsPage.PRODUCT_ITEMS, PRODUCT_FIELDS),
+            setup=page.invalidate_snapshot,
+            rounds=50,
+        )
+
+
+class TestProductsPage:
+    def test_get_all_products(self, overhead, server, driver, products_screens):
+        overhead(
+            lambda: ProductsPage(driver).get_all_products(refresh=True),
+            setup=lambda: server.set_page_source(products_screens),
+        )
+
+    def test_add_product_on_screen(self, overhead, server, driver, products_screens):
+        overhead(
+            lambda: ProductsPage(driver).add_product_to_cart_by_name(
+                "Sauce Labs Backpack"
+            ),
+            setup=lambda: server.set_page_source(products_screens),
+        )
+
+    def test_add_product_off_screen(self, overhead, server, driver, products_screens):
+        overhead(
+            lambda: ProductsPage(driver).add_product_to_cart_by_name(
+                "Test.allTheThings() T-Shirt (Red)"
+            ),
+            setup=lambda: server.set_page_source(products_screens),
+        )
+
+
+class TestCartPage:
+    def test_remove_all_items(self, overhead, server, driver, cart_screen):
+        def remove_all():
+            cart_page = CartPage(driver)
+            for _ in range(2):
+                item_name = cart_page.get_first_item_name()
+                cart_page.remove_first_item()
+                assert not cart_page.item_exists(item_name)
+
+        overhead(remove_all, setup=lambda: server.set_page_source(cart_screen))
+
+
+class TestScreenshots:
+    def test_take_screenshot(self, overhead, driver, tmp_path):
+        names = itertools.count()
+
+        overhead(
+            lambda: take_screenshot(driver, tmp_path, f"step_{next(names)}"),
+            setup=screenshot_writer.flush,
+            rounds=50,
+        )
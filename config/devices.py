@@ -0,0 +1,85 @@
+import json
+from pathlib import Path
+from urllib.parse import urlparse
+
+from config import settings
+
+
+class Device:
+    """Device entry in the registry: one UDID driven through one Appium server."""
+
+    def __init__(
+        self,
+        udid,
+        appium_server=None,
+        system_port=None,
+        platform_version=None,
+        name=None,
+    ):
+        self.udid = udid
+        self.appium_server = appium_server or settings.APPIUM_SERVER
+        self.system_port = system_port
+        self.platform_version = platform_version
+        self.name = name or udid or "default"
+
+    def env(self):
+        """Environment variables pointing config.settings at this device."""
+        env = {"APPIUM_SERVER": self.appium_server, "DEVICE_NAME": self.name}
+        if self.udid:
+            env["UDID"] = self.udid
+        if self.system_port:
+            env["SYSTEM_PORT"] = str(self.system_port)
+        if self.platform_version:
+            env["PLATFORM_VERSION"] = str(self.platform_version)
+        return env
+
+    def __repr__(self):
+        return (
+            f"Device({self.name!r}, udid={self.udid!r}, server={self.appium_server!r})"
+        )
+
+
+def load_devices(path=None):
+    """Load device registry.
+
+    The registry is a JSON list of objects with 'udid', 'appium_server',
+    'system_port', 'platform_version' and optional 'name' keys. Without a
+    registry file the single device from settings is returned.
+
+    Args:
+        path: Registry file path. Defaults to settings.DEVICES_FILE.
+
+    Returns:
+        List of Device instances.
+
+    Raises:
+        ValueError: If names or UDIDs are not unique, or two devices on the
+            same host share a systemPort.
+    """
+    path = path or settings.DEVICES_FILE
+    if not path:
+        return [
+            Device(
+                settings.UDID,
+                settings.APPIUM_SERVER,
+                settings.SYSTEM_PORT,
+                settings.PLATFORM_VERSION,
+                settings.DEVICE_NAME,
+            )
+        ]
+
+    entries = json.loads(Path(path).read_text())
+    devices = [Device(**entry) for entry in entries]
+
+    for attribute in ("name", "udid"):
+        values = [getattr(device, attribute) for device in devices]
+        if len(values) != len(set(values)):
+            raise ValueError(f"Duplicate device {attribute} in {path}")
+    ports = [
+        (urlparse(device.appium_server).hostname, device.system_port)
+        for device in devices
+        if device.system_port
+    ]
+    if len(ports) != len(set(ports)):
+        raise ValueError(f"Duplicate systemPort on the same host in {path}")
+    return devices
@@ -9,9 +9,54 @@ if env_path.exists():
     load_dotenv(env_path)
 
 APPIUM_SERVER = os.getenv("APPIUM_SERVER", "http://localhost:4723")
+APPIUM_HTTP_POOL_SIZE = int(os.getenv("APPIUM_HTTP_POOL_SIZE", "4"))
+APPIUM_HTTP_KEEP_ALIVE = os.getenv("APPIUM_HTTP_KEEP_ALIVE", "true").lower() == "true"
+APPIUM_HTTP_CONNECT_TIMEOUT = float(os.getenv("APPIUM_HTTP_CONNECT_TIMEOUT", "10"))
+APPIUM_HTTP_READ_TIMEOUT = float(os.getenv("APPIUM_HTTP_READ_TIMEOUT", "120"))
+APPIUM_HTTP_RETRIES = int(os.getenv("APPIUM_HTTP_RETRIES", "2"))
+DRIVER_CONCURRENCY = int(os.getenv("DRIVER_CONCURRENCY", str(APPIUM_HTTP_POOL_SIZE)))
 UDID = os.getenv("UDID")
+DEVICE_NAME = os.getenv("DEVICE_NAME")
+SYSTEM_PORT = int(os.getenv("SYSTEM_PORT")) if os.getenv("SYSTEM_PORT") else None
+DEVICES_FILE = os.getenv("DEVICES_FILE")
 PLATFORM_VERSION = os.getenv("PLATFORM_VERSION")
 APP_PATH = os.getenv("APP_PATH")
 APP_PACKAGE = os.getenv("APP_PACKAGE")
 APP_ACTIVITY = os.getenv("APP_ACTIVITY")
 FULL_RESET = os.getenv("FULL_RESET", "false").lower() == "true"
+APK_CACHE = os.getenv("APK_CACHE", "true").lower() == "true"
+APK_CACHE_FILE = Path(
+    os.getenv("APK_CACHE_FILE", BASE_DIR / "results" / "apk_cache.json")
+)
+SESSION_POOL = os.getenv("SESSION_POOL", "true").lower() == "true"
+SESSION_RESET = os.getenv("SESSION_RESET", "clear" if FULL_RESET else "relaunch")
+SESSION_PREWARM = int(os.getenv("SESSION_PREWARM", "0"))
+WAIT_TIMEOUT = float(os.getenv("WAIT_TIMEOUT", "20"))
+WAIT_POLL_FIRST = float(os.getenv("WAIT_POLL_FIRST", "0.05"))
+WAIT_POLL_FACTOR = float(os.getenv("WAIT_POLL_FACTOR", "2"))
+WAIT_POLL_MAX = float(os.getenv("WAIT_POLL_MAX", "1"))
+WAIT_BUDGET = float(os.getenv("WAIT_BUDGET", "120"))
+ABSENCE_WINDOW = float(os.getenv("ABSENCE_WINDOW", "0.5"))
+SCROLL_FRACTION = float(os.getenv("SCROLL_FRACTION", "0.7"))
+SCROLL_MAX_SWIPES = int(os.getenv("SCROLL_MAX_SWIPES", "20"))
+SCREENSHOT_ASYNC = os.getenv("SCREENSHOT_ASYNC", "true").lower() == "true"
+SCREENSHOT_QUEUE_SIZE = int(os.getenv("SCREENSHOT_QUEUE_SIZE", "8"))
+SCREENSHOT_MODE = os.getenv("SCREENSHOT_MODE", "always")
+SCREENSHOT_BUFFER_COUNT = int(os.getenv("SCREENSHOT_BUFFER_COUNT", "20"))
+SCREENSHOT_BUFFER_BYTES = int(
+    os.getenv("SCREENSHOT_BUFFER_BYTES", str(50 * 1024 * 1024))
+)
+SCREENSHOT_DEDUP = os.getenv("SCREENSHOT_DEDUP", "false").lower() == "true"
+SCREENSHOT_DEDUP_THRESHOLD = float(os.getenv("SCREENSHOT_DEDUP_THRESHOLD", "0.99"))
+LOG_QUEUE = os.getenv("LOG_QUEUE", "true").lower() == "true"
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+COMMAND_STATS = os.getenv("COMMAND_STATS", "true").lower() == "true"
+PAGE_PROFILE = os.getenv("PAGE_PROFILE", "false").lower() == "true"
+TRACE = os.getenv("TRACE", "false").lower() == "true"
+RESULTS_DIR = Path(os.getenv("RESULTS_DIR", BASE_DIR / "results"))
+ARTIFACT_STORE = os.getenv("ARTIFACT_STORE", "false").lower() == "true"
+ARTIFACT_DIR = Path(os.getenv("ARTIFACT_DIR", RESULTS_DIR / "artifacts"))
+ARTIFACT_COMPRESS_LEVEL = int(os.getenv("ARTIFACT_COMPRESS_LEVEL", "6"))
+ARTIFACT_MAX_BYTES = int(os.getenv("ARTIFACT_MAX_BYTES", str(2 * 1024**3)))
+ARTIFACT_MAX_AGE_DAYS = float(os.getenv("ARTIFACT_MAX_AGE_DAYS", "14"))
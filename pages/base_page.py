@@ -1,9 +1,16 @@
 import logging
+import time
 from appium.webdriver.webdriver import WebDriver
 from appium.webdriver.common.appiumby import AppiumBy
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+
+from config import settings
+from utils import page_profiler, scrolling, tracing
+from utils.async_driver import AsyncDriver
+from utils.element_cache import ElementCache
+from utils.page_source import PageSnapshot
+from utils.waits import AdaptiveWait
 
 logger = logging.getLogger(__name__)
 
@@ -12,36 +19,167 @@ class BasePage:
     """Base page object class for all page models.
 
     Provides common methods for element interaction and navigation.
+
+    Read-heavy code can query snapshot() instead of the driver: the page
+    source is fetched once and locators are evaluated locally until an action
+    of this page (click, send_keys, swipe, scroll) invalidates it. Actions
+    done directly on the driver must call invalidate_snapshot().
+
+    Pages setting CACHE_ELEMENTS reuse located elements per locator in
+    find_element, click, send_keys and get_text. A stale element is located
+    again transparently, and clicks (unless navigates=False), swipes and
+    scrolls clear the cache.
+
+    Lists are traversed with scroll_list(), which swipes by most of the
+    scrollable container's height and stops at the end of the list.
+    scroll_search() locates several off-screen targets in one traversal.
+
+    Public methods of every page class are recorded as spans while tracing
+    is on (see utils/tracing.py) and profiled while page profiling is on (see
+    utils/page_profiler.py).
     """
 
-    def __init__(self, driver: WebDriver):
+    CACHE_ELEMENTS = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        tracing.trace_methods(cls)
+        page_profiler.profile_methods(cls)
+
+    def __init__(self, driver: WebDriver, cache_elements=None):
         """Initialize BasePage with Appium driver.
 
         Args:
             driver: Appium WebDriver instance.
+            cache_elements: Enable the element cache, overriding the page's
+                CACHE_ELEMENTS.
         """
         self.driver = driver
-        self.wait = WebDriverWait[WebDriver](driver, 20)
+        self.wait = AdaptiveWait(driver)
+        self._snapshot = None
+        if cache_elements is None:
+            cache_elements = self.CACHE_ELEMENTS
+        self.element_cache = ElementCache() if cache_elements else None
 
-    def find_element(self, locator):
-        """Find single element using explicit wait.
+    @property
+    def async_driver(self):
+        """Asyncio facade of the driver for concurrent independent commands.
+
+        Returns:
+            AsyncDriver shared by all page objects of this session.
+        """
+        return AsyncDriver.for_driver(self.driver)
+
+    def snapshot(self):
+        """Get the page source snapshot of the current screen.
+
+        Returns:
+            PageSnapshot, fetched from the driver on first use after
+            creation or invalidation.
+        """
+        if self._snapshot is None:
+            self._snapshot = PageSnapshot.from_driver(self.driver)
+        return self._snapshot
+
+    def invalidate_snapshot(self):
+        """Drop the snapshot, the next snapshot() call fetches a fresh one."""
+        self._snapshot = None
+
+    def snapshot_elements(self, locator):
+        """Find elements in the snapshot, waiting on the device if there are none.
 
         Args:
             locator: Tuple of (AppiumBy, value) for element localization.
 
         Returns:
-            WebElement if found.
+            List of SnapshotElements.
 
         Raises:
-            TimeoutException: If element not found within timeout.
+            TimeoutException: If elements not found within timeout.
         """
+        elements = self.snapshot().find_elements(*locator)
+        if not elements:
+            self.find_elements(locator)
+            self.invalidate_snapshot()
+            elements = self.snapshot().find_elements(*locator)
+        return elements
+
+    def read_records(self, locator, fields=None):
+        """Read fields of all elements matching locator with one request.
+
+        Values come from the page source snapshot, so the number of calls
+        doesn't depend on the number of elements.
+
+        Args:
+            locator: Tuple of (AppiumBy, value) for element localization.
+            fields: Dict mapping record key to an attribute name ('text',
+                'content-desc', 'bounds', ...) or to a child locator whose
+                first match's text is read. Defaults to {'text': 'text'}.
+
+        Returns:
+            List of dicts, one per element in screen order. Missing
+            attributes and children are None, 'bounds' is a dict with x, y,
+            width and height.
+
+        Raises:
+            TimeoutException: If elements not found within timeout.
+        """
+        fields = fields or {"text": "text"}
+        records = []
+        for element in self.snapshot_elements(locator):
+            record = {}
+            for key, field in fields.items():
+                if isinstance(field, tuple):
+                    children = element.find_elements(*field)
+                    record[key] = children[0].text if children else None
+                elif field == "bounds":
+                    record[key] = element.rect
+                else:
+                    record[key] = element.get_attribute(field)
+            records.append(record)
+        return records
+
+    def invalidate_elements(self):
+        """Clear the element cache, e.g. after leaving the screen."""
+        if self.element_cache is not None:
+            self.element_cache.invalidate()
+
+    def _locate(self, locator):
         try:
-            element = self.wait.until(EC.presence_of_element_located(locator))
+            element = self.wait.until(
+                EC.presence_of_element_located(locator), key=locator
+            )
             return element
         except TimeoutException:
             logger.error(f"Element not found: {locator}")
             raise
 
+    def _with_element(self, locator, action, resolve):
+        if self.element_cache is None:
+            return action(resolve())
+        element = self.element_cache.get(locator, resolve)
+        try:
+            return action(element)
+        except StaleElementReferenceException:
+            self.element_cache.discard_stale(locator)
+            return action(self.element_cache.get(locator, resolve))
+
+    def find_element(self, locator):
+        """Find single element using explicit wait.
+
+        Args:
+            locator: Tuple of (AppiumBy, value) for element localization.
+
+        Returns:
+            WebElement if found, from the element cache when enabled.
+
+        Raises:
+            TimeoutException: If element not found within timeout.
+        """
+        if self.element_cache is None:
+            return self._locate(locator)
+        return self.element_cache.get(locator, lambda: self._locate(locator))
+
     def find_elements(self, locator):
         """Find multiple elements using explicit wait.
 
@@ -55,20 +193,30 @@ class BasePage:
             TimeoutException: If elements not found within timeout.
         """
         try:
-            elements = self.wait.until(EC.presence_of_all_elements_located(locator))
+            elements = self.wait.until(
+                EC.presence_of_all_elements_located(locator), key=locator
+            )
             return elements
         except TimeoutException:
             logger.error(f"Elements not found: {locator}")
             raise
 
-    def click(self, locator):
+    def click(self, locator, navigates=True):
         """Click on element after waiting for it to be clickable.
 
         Args:
             locator: Tuple of (AppiumBy, value) for element localization.
+            navigates: The click may change the screen, clear the element
+                cache afterwards. Defaults to True.
         """
-        element = self.wait.until(EC.element_to_be_clickable(locator))
-        element.click()
+        self.invalidate_snapshot()
+        self._with_element(
+            locator,
+            lambda element: element.click(),
+            lambda: self.wait.until(EC.element_to_be_clickable(locator), key=locator),
+        )
+        if navigates:
+            self.invalidate_elements()
 
     def send_keys(self, locator, text):
         """Clear and send text to input element.
@@ -77,9 +225,13 @@ class BasePage:
             locator: Tuple of (AppiumBy, value) for element localization.
             text: Text to enter into the element.
         """
-        element = self.find_element(locator)
-        element.clear()
-        element.send_keys(text)
+        self.invalidate_snapshot()
+
+        def enter_text(element):
+            element.clear()
+            element.send_keys(text)
+
+        self._with_element(locator, enter_text, lambda: self._locate(locator))
 
     def get_text(self, locator):
         """Get text content from element.
@@ -90,8 +242,9 @@ class BasePage:
         Returns:
             Text content of the element.
         """
-        element = self.find_element(locator)
-        return element.text
+        return self._with_element(
+            locator, lambda element: element.text, lambda: self._locate(locator)
+        )
 
     def is_displayed(self, locator, timeout=5):
         """Check if element is visible on screen.
@@ -104,12 +257,60 @@ class BasePage:
             True if element is visible, False otherwise.
         """
         try:
-            wait = WebDriverWait[WebDriver](self.driver, timeout)
-            wait.until(EC.visibility_of_element_located(locator))
+            self.wait.until(
+                EC.visibility_of_element_located(locator), timeout=timeout, key=locator
+            )
             return True
         except TimeoutException:
             return False
 
+    def is_absent(self, locator, stable_for=0.0, screen_marker=None):
+        """Check that no visible element matches locator, without waiting.
+
+        Resolved from a fresh page source snapshot. An element that may still
+        show up (e.g. a validation error after a click) is covered by
+        stable_for: absence is then confirmed by a second snapshot after the
+        window, unless screen_marker shows the screen was already left.
+
+        Args:
+            locator: Tuple of (AppiumBy, value) for element localization.
+            stable_for: Seconds the element must stay absent. Defaults to 0.
+            screen_marker: Locator of the current screen, its absence makes
+                the result final without the stability window.
+
+        Returns:
+            True if no visible element matches, False otherwise.
+        """
+        absent, settled = self._check_absent(locator, screen_marker)
+        if absent and not settled and stable_for > 0:
+            time.sleep(stable_for)
+            absent, _ = self._check_absent(locator, screen_marker)
+        return absent
+
+    def _check_absent(self, locator, screen_marker):
+        self.invalidate_snapshot()
+        snapshot = self.snapshot()
+        if any(element.is_displayed() for element in snapshot.find_elements(*locator)):
+            return False, True
+        left = screen_marker is not None and not snapshot.find_elements(*screen_marker)
+        return True, left
+
+    def assert_absent(self, locator, message=None, **options):
+        """Assert that no visible element matches locator, see is_absent().
+
+        Args:
+            locator: Tuple of (AppiumBy, value) for element localization.
+            message: AssertionError message. Defaults to one naming locator.
+            **options: stable_for and screen_marker of is_absent().
+
+        Raises:
+            AssertionError: If a matching element is visible.
+        """
+        if not self.is_absent(locator, **options):
+            raise AssertionError(
+                message or f"Element should not be displayed: {locator}"
+            )
+
     def scroll_to_text(self, text_to_find):
         """Scroll to element by text content (Android only).
 
@@ -120,6 +321,8 @@ class BasePage:
             WebElement at text location.
         """
         logger.info(f"Scrolling to text: {text_to_find}")
+        self.invalidate_snapshot()
+        self.invalidate_elements()
 
         android_uiautomator = (
             f"new UiScrollable(new UiSelector().scrollable(true))"
@@ -141,6 +344,8 @@ class BasePage:
             WebElement at accessibility ID location.
         """
         logger.info(f"Scrolling to element: {accessibility_id}")
+        self.invalidate_snapshot()
+        self.invalidate_elements()
 
         android_uiautomator = (
             f"new UiScrollable(new UiSelector().scrollable(true))"
@@ -151,3 +356,188 @@ class BasePage:
             AppiumBy.ANDROID_UIAUTOMATOR, android_uiautomator
         )
         return element
+
+    def swipe(self, start_x, start_y, end_x, end_y, duration=500):
+        """Swipe between two points.
+
+        Args:
+            start_x: Start x coordinate.
+            start_y: Start y coordinate.
+            end_x: End x coordinate.
+            end_y: End y coordinate.
+            duration: Swipe duration in milliseconds. Defaults to 500.
+        """
+        self.invalidate_snapshot()
+        self.invalidate_elements()
+        self.driver.swipe(
+            start_x=start_x,
+            start_y=start_y,
+            end_x=end_x,
+            end_y=end_y,
+            duration=duration,
+        )
+
+    def scroll_list(self, max_swipes=None, fraction=None):
+        """Traverse a scrollable list screen by screen, top to bottom.
+
+        Swipes are derived from the bounds of the scrollable container. The
+        traversal ends when a swipe leaves the list unchanged, when
+        max_swipes is reached or when the caller stops iterating.
+
+        Args:
+            max_swipes: Safety limit of swipes. Defaults to
+                settings.SCROLL_MAX_SWIPES.
+            fraction: Share of the container height scrolled per swipe.
+                Defaults to settings.SCROLL_FRACTION.
+
+        Yields:
+            PageSnapshot of each screen, also returned by snapshot() until
+            the caller acts on the page.
+        """
+        max_swipes = settings.SCROLL_MAX_SWIPES if max_swipes is None else max_swipes
+        fraction = settings.SCROLL_FRACTION if fraction is None else fraction
+        swipes = 0
+        reached_end = False
+        try:
+            snapshot = self.snapshot()
+            while True:
+                yield snapshot
+                # Re-read only if the caller acted on the screen meanwhile
+                before = self.snapshot()
+                if swipes >= max_swipes:
+                    logger.warning(f"Stopped scrolling after {swipes} swipes")
+                    break
+                area = self._scroll_area(before)
+                self.swipe(*scrolling.swipe_vector(area, fraction))
+                swipes += 1
+                snapshot = self.snapshot()
+                if scrolling.fingerprint(snapshot) == scrolling.fingerprint(before):
+                    reached_end = True
+                    break
+        finally:
+            scrolling.record_traversal(swipes, reached_end)
+
+    def scroll_to_top(self, max_swipes=None):
+        """Swipe back up the scrollable list until it no longer moves.
+
+        Args:
+            max_swipes: Safety limit of swipes. Defaults to
+                settings.SCROLL_MAX_SWIPES.
+
+        Returns:
+            Number of swipes made.
+        """
+        max_swipes = settings.SCROLL_MAX_SWIPES if max_swipes is None else max_swipes
+        before = self.snapshot()
+        vector = scrolling.swipe_vector(
+            self._scroll_area(before), settings.SCROLL_FRACTION, reverse=True
+        )
+        for swipes in range(max_swipes):
+            self.swipe(*vector)
+            snapshot = self.snapshot()
+            if scrolling.fingerprint(snapshot) == scrolling.fingerprint(before):
+                return swipes
+            before = snapshot
+        logger.warning(f"Stopped scrolling to the top after {max_swipes} swipes")
+        return max_swipes
+
+    def swipe_down_list(self, screens):
+        """Swipe forward through the scrollable list like scroll_list() does.
+
+        Args:
+            screens: Number of swipes.
+        """
+        if screens <= 0:
+            return
+        vector = scrolling.swipe_vector(
+            self._scroll_area(self.snapshot()), settings.SCROLL_FRACTION
+        )
+        for _ in range(screens):
+            self.swipe(*vector)
+
+    def _scroll_area(self, snapshot):
+        try:
+            return scrolling.scroll_area(snapshot)
+        except ValueError:
+            return scrolling.scroll_area(snapshot, self.driver.get_window_size())
+
+    def scroll_search(self, texts=(), accessibility_ids=(), max_swipes=None):
+        """Locate several targets with a single traversal of the scrollable list.
+
+        The list is scrolled down from its current position until every
+        target was seen or the list ends. scroll_to_target() then brings each
+        target into view with swipes relative to where the list is, instead
+        of one UiScrollable search from the top of the list per target.
+
+        Args:
+            texts: Texts to locate.
+            accessibility_ids: Accessibility IDs to locate.
+            max_swipes: Safety limit of swipes, see scroll_list().
+
+        Returns:
+            ScrollSearch with the screen and bounds of every target found.
+        """
+        locators = {
+            text: (AppiumBy.ANDROID_UIAUTOMATOR, f'new UiSelector().text("{text}")')
+            for text in texts
+        }
+        locators.update(
+            {
+                accessibility_id: (AppiumBy.ACCESSIBILITY_ID, accessibility_id)
+                for accessibility_id in accessibility_ids
+            }
+        )
+        search = scrolling.ScrollSearch(locators)
+        for screen, snapshot in enumerate(self.scroll_list(max_swipes=max_swipes)):
+            search.record(snapshot, screen)
+            search.screen = screen
+            if not search.missing:
+                break
+        if search.missing:
+            logger.info(f"Not found while scrolling: {search.missing}")
+        return search
+
+    def scroll_to_target(self, search, target):
+        """Bring a target located by scroll_search() into view.
+
+        Nothing is swiped if the target is on screen already. Otherwise
+        swipes from the current screen to the target's, and falls back to a
+        UiScrollable search if the target wasn't found or isn't visible
+        after swiping.
+
+        Args:
+            search: ScrollSearch from scroll_search().
+            target: Text or accessibility ID passed to scroll_search().
+
+        Returns:
+            WebElement of the target.
+        """
+        by, _ = locator = search.locators[target]
+        if any(e.is_displayed() for e in self.snapshot().find_elements(*locator)):
+            return self.find_element(locator)
+
+        position = search.positions.get(target)
+        if position is not None and search.screen is not None:
+            steps = position["screen"] - search.screen
+            if steps:
+                area = self._scroll_area(self.snapshot())
+                vector = scrolling.swipe_vector(
+                    area, settings.SCROLL_FRACTION, reverse=steps < 0
+                )
+                for _ in range(abs(steps)):
+                    self.swipe(*vector)
+                search.screen = position["screen"]
+            if any(e.is_displayed() for e in self.snapshot().find_elements(*locator)):
+                return self.find_element(locator)
+
+        logger.info(f"{target} not where expected, searching with UiScrollable")
+        if by == AppiumBy.ACCESSIBILITY_ID:
+            element = self.scroll_to_accessibility_id(target)
+        else:
+            element = self.scroll_to_text(target)
+        search.screen = position["screen"] if position is not None else None
+        return element
+
+
+tracing.trace_methods(BasePage)
+page_profiler.profile_methods(BasePage)
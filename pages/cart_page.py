@@ -11,12 +11,24 @@ class CartPage(BasePage):
     Handles cart operations like item removal, checkout, and verification.
     """
 
+    CACHE_ELEMENTS = True
+
     CART_TITLE = (AppiumBy.ANDROID_UIAUTOMATOR, 'new UiSelector().text("YOUR CART")')
     CHECKOUT_BUTTON = (AppiumBy.ACCESSIBILITY_ID, "test-CHECKOUT")
     FIRST_ITEM = (
         AppiumBy.XPATH,
         '(//android.view.ViewGroup[@content-desc="test-Item"])[1]',
     )
+    CART_ITEMS = (AppiumBy.XPATH, '//android.view.ViewGroup[@content-desc="test-Item"]')
+    ITEM_NAME = (
+        AppiumBy.XPATH,
+        './/android.view.ViewGroup[@content-desc="test-Description"]'
+        "/android.widget.TextView[1]",
+    )
+    ITEM_PRICE = (
+        AppiumBy.XPATH,
+        './/android.view.ViewGroup[@content-desc="test-Price"]/android.widget.TextView',
+    )
     REMOVE_BUTTON = (AppiumBy.ACCESSIBILITY_ID, "test-REMOVE")
 
     def verify_product_in_cart(self, product_name, product_price=None):
@@ -51,11 +63,17 @@ class CartPage(BasePage):
         Returns:
             Product name string.
         """
-        first_item = self.find_element(self.FIRST_ITEM)
-        text_views = first_item.find_elements(
-            AppiumBy.XPATH, ".//android.widget.TextView"
+        return self.read_records(self.FIRST_ITEM, {"name": self.ITEM_NAME})[0]["name"]
+
+    def get_items(self):
+        """Get all items visible in cart.
+
+        Returns:
+            List of dicts with 'name' and 'price' keys.
+        """
+        return self.read_records(
+            self.CART_ITEMS, {"name": self.ITEM_NAME, "price": self.ITEM_PRICE}
         )
-        return text_views[1].text if len(text_views) > 1 else text_views[0].text
 
     def remove_first_item(self):
         """Remove first item from cart."""
@@ -64,10 +82,12 @@ class CartPage(BasePage):
             AppiumBy.ACCESSIBILITY_ID, "test-REMOVE"
         )
         remove_button.click()
+        self.invalidate_snapshot()
+        self.invalidate_elements()
         logger.info("Item removed from cart")
 
     def item_exists(self, item_name):
-        """Check if product exists in cart.
+        """Check if product exists in cart, from one fresh page source read.
 
         Args:
             item_name: Product name to search for.
@@ -75,8 +95,6 @@ class CartPage(BasePage):
         Returns:
             True if product found in cart, False otherwise.
         """
-        elements = self.driver.find_elements(
-            AppiumBy.XPATH,
-            f'//android.widget.TextView[contains(text(), "{item_name}")]',
+        return not self.is_absent(
+            (AppiumBy.XPATH, f'//android.widget.TextView[@text="{item_name}"]')
         )
-        return len(elements) > 0
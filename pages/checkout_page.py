@@ -1,5 +1,6 @@
 import logging
 from appium.webdriver.common.appiumby import AppiumBy
+from config import settings
 from pages.base_page import BasePage
 
 logger = logging.getLogger(__name__)
@@ -11,6 +12,8 @@ class CheckoutPage(BasePage):
     Handles shipping and billing information collection.
     """
 
+    CACHE_ELEMENTS = True
+
     CHECKOUT_INFORMATION_TITLE = (
         AppiumBy.ANDROID_UIAUTOMATOR,
         'new UiSelector().text("CHECKOUT: INFORMATION")',
@@ -41,10 +44,16 @@ class CheckoutPage(BasePage):
     def verify_no_error_after_continue(self):
         """Verify no validation errors appeared after clicking continue.
 
+        Settled by one page source read once the information screen is left,
+        otherwise the error must stay absent for settings.ABSENCE_WINDOW.
+
         Raises:
             AssertionError: If validation error is displayed.
         """
-        has_error = self.is_displayed(self.ERROR_MESSAGE, timeout=2)
-        if has_error:
-            raise AssertionError("Validation error appeared - invalid checkout data")
+        self.assert_absent(
+            self.ERROR_MESSAGE,
+            "Validation error appeared - invalid checkout data",
+            stable_for=settings.ABSENCE_WINDOW,
+            screen_marker=self.CONTINUE_BUTTON,
+        )
         logger.info("Checkout data accepted")
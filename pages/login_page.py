@@ -1,6 +1,7 @@
 import logging
 from appium.webdriver.common.appiumby import AppiumBy
 from pages.base_page import BasePage
+from utils.product_catalog import ProductCatalog
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +20,10 @@ class LoginPage(BasePage):
         'new UiSelector().text("PRODUCTS")',
     )
     ERROR_MESSAGE = (AppiumBy.ACCESSIBILITY_ID, "test-Error message")
+    CART_BADGE = (
+        AppiumBy.XPATH,
+        '//android.view.ViewGroup[@content-desc="test-Cart"]//android.widget.TextView',
+    )
     STANDARD_USER_TEXT = "standard_user"
 
     def scroll_to_standard_user(self):
@@ -26,11 +31,20 @@ class LoginPage(BasePage):
         logger.info("Scrolling to standard_user option")
         self.scroll_to_text(self.STANDARD_USER_TEXT)
 
-    def select_standard_user(self):
-        """Click on standard_user option."""
+    def select_standard_user(self, targets=None):
+        """Click on standard_user option.
+
+        Args:
+            targets: Optional ScrollSearch from scroll_search() that located
+                the option, saves the UiScrollable search.
+        """
         logger.info("Clicking on standard_user option")
-        element = self.scroll_to_text(self.STANDARD_USER_TEXT)
+        if targets is None:
+            element = self.scroll_to_text(self.STANDARD_USER_TEXT)
+        else:
+            element = self.scroll_to_target(targets, self.STANDARD_USER_TEXT)
         element.click()
+        self.invalidate_snapshot()
         logger.info("Clicked on standard_user")
 
     def get_username_value(self):
@@ -65,11 +79,70 @@ class LoginPage(BasePage):
             AssertionError: If username not properly selected.
         """
         logger.info("=== Starting login with standard_user ===")
-        self.scroll_to_standard_user()
-        self.select_standard_user()
+        targets = self.scroll_search(
+            texts=[self.STANDARD_USER_TEXT],
+            accessibility_ids=[self.USERNAME_INPUT[1], self.LOGIN_BUTTON[1]],
+        )
+        self.select_standard_user(targets)
+        self.scroll_to_target(targets, self.USERNAME_INPUT[1])
         username = self.get_username_value()
         assert username == "standard_user", (
             f"Expected 'standard_user', got '{username}'"
         )
+        self.scroll_to_target(targets, self.LOGIN_BUTTON[1])
         self.click_login()
         logger.info("=== Login completed ===")
+
+    def is_on_products_page(self):
+        """Check without waiting whether the PRODUCTS screen is shown.
+
+        Returns:
+            True if PRODUCTS title is on screen, False otherwise.
+        """
+        return len(self.driver.find_elements(*self.PRODUCTS_TITLE)) > 0
+
+    def is_cart_empty(self):
+        """Check without waiting whether the cart badge is absent.
+
+        Returns:
+            True if no item count is shown on the cart icon, False otherwise.
+        """
+        return len(self.driver.find_elements(*self.CART_BADGE)) == 0
+
+    def ensure_logged_in(self):
+        """Bring the app to the PRODUCTS screen as standard_user.
+
+        The login flow only runs when needed: if the PRODUCTS screen is
+        already shown in the default order with an empty cart, the list is
+        only scrolled back to the top. If the app is on any other screen than
+        login, or the list was sorted by a filter, it is relaunched first.
+
+        Returns:
+            True if the login flow was performed, False if it was skipped.
+        """
+        if self.is_on_products_page() and self.is_cart_empty():
+            sort_order = ProductCatalog.current_sort(self.driver)
+            if sort_order is None:
+                self.scroll_to_top()
+                logger.info("Already logged in on PRODUCTS page, skipping login")
+                return False
+            logger.info(f"PRODUCTS sorted by '{sort_order}', resetting the app")
+
+        if not self.driver.find_elements(*self.LOGIN_BUTTON):
+            caps = self.driver.capabilities
+            app_id = caps.get("appPackage") or caps.get("appium:appPackage")
+            logger.info(f"Unexpected screen, relaunching {app_id}")
+            self.driver.terminate_app(app_id)
+            self.driver.activate_app(app_id)
+            self.is_displayed(self.LOGIN_BUTTON, timeout=10)
+
+        logger.info("Logging in with standard_user")
+        targets = self.scroll_search(
+            texts=[self.STANDARD_USER_TEXT], accessibility_ids=[self.LOGIN_BUTTON[1]]
+        )
+        self.select_standard_user(targets)
+        self.scroll_to_target(targets, self.LOGIN_BUTTON[1])
+        self.click_login()
+        self.wait_for_products_page()
+        ProductCatalog.sort_changed(self.driver)
+        return True
@@ -1,13 +1,11 @@
 from typing import Any
 
 
-from selenium.webdriver.remote.webelement import WebElement
-
-
 import logging
 import random
 from appium.webdriver.common.appiumby import AppiumBy
 from pages.base_page import BasePage
+from utils.product_catalog import ProductCatalog
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +24,18 @@ class ProductsPage(BasePage):
         AppiumBy.XPATH,
         '//android.view.ViewGroup[@content-desc="test-Item"]',
     )
+    ITEM_TITLE = (
+        AppiumBy.XPATH,
+        './/android.widget.TextView[@content-desc="test-Item title"]',
+    )
+    ITEM_PRICE = (
+        AppiumBy.XPATH,
+        './/android.widget.TextView[@content-desc="test-Price"]',
+    )
+    ITEM_ADD_TO_CART = (
+        AppiumBy.XPATH,
+        './/android.widget.TextView[@text="ADD TO CART"]',
+    )
 
     PRODUCTS = {
         "backpack": "Sauce Labs Backpack",
@@ -39,65 +49,121 @@ class ProductsPage(BasePage):
     def get_random_product(self):
         """Get random product key from PRODUCTS dictionary.
 
+        Once the catalog is built, only products listed in the app are drawn.
+
         Returns:
             Random product key (e.g., 'backpack', 'bike_light').
         """
-        product_key = random.choice(list(self.PRODUCTS.keys()))
+        product_keys = list(self.PRODUCTS.keys())
+        catalog = ProductCatalog.for_driver(self.driver)
+        if catalog is not None:
+            product_keys = [
+                key for key in product_keys if self.PRODUCTS[key] in catalog
+            ] or product_keys
+        product_key = random.choice(product_keys)
         logger.info(f"Randomly selected product: {product_key}")
         return product_key
 
-    def get_all_products(self):
-        """Get all available products by scrolling through list.
+    def catalog(self, refresh=False):
+        """Get the product catalog of this session, building it on first use.
+
+        The list is traversed when there is no catalog yet, when the sort
+        order changed since it was built, or on refresh.
+
+        Args:
+            refresh: Rebuild the catalog even if it is up to date.
 
         Returns:
-            List of dicts with 'name' and 'price' keys.
+            ProductCatalog instance.
         """
-        products = []
+        catalog = ProductCatalog.for_driver(self.driver)
+        if catalog is None or refresh or not catalog.is_ordered_for(self.driver):
+            catalog = self._build_catalog()
+        return catalog
+
+    def _build_catalog(self):
+        entries = []
         collected_product_names = set[Any]()
-        max_scroll_attempts = 10
-        scroll_attempts = 0
-
-        while scroll_attempts < max_scroll_attempts:
-            items = self.find_elements(self.PRODUCT_ITEMS)
-
-            items_added_this_round = False
-
-            for index, item in enumerate[WebElement](items):
-                try:
-                    name_element = item.find_element(
-                        AppiumBy.XPATH,
-                        './/android.widget.TextView[@content-desc="test-Item title"]',
-                    )
-                    price_element = item.find_element(
-                        AppiumBy.XPATH,
-                        './/android.widget.TextView[@content-desc="test-Price"]',
-                    )
-
-                    name = name_element.text
-                    price = price_element.text
-
-                    if name not in collected_product_names:
-                        products.append({"name": name, "price": price})
-                        collected_product_names.add(name)
-                        items_added_this_round = True
-                        logger.info(f"Product {len(products)}: {name} - {price}")
-                except Exception as e:
-                    logger.debug(f"Could not get product details: {e}")
-
-            if items_added_this_round or scroll_attempts == 0:
-                self.driver.swipe(
-                    start_x=500, start_y=400, end_x=500, end_y=200, duration=500
-                )
-                scroll_attempts += 1
-            else:
-                break
-
-        logger.info(f"Total products: {len(products)}")
-        return products
+
+        # Screens are counted from the top of the list
+        self.scroll_to_top()
+        for screen, _ in enumerate(self.scroll_list()):
+            records = self.read_records(
+                self.PRODUCT_ITEMS, {"name": self.ITEM_TITLE, "price": self.ITEM_PRICE}
+            )
+
+            for record in records:
+                name, price = record["name"], record["price"]
+                if name is None or price is None:
+                    logger.debug(f"Could not get product details: {record}")
+                    continue
+
+                if name not in collected_product_names:
+                    entries.append({"name": name, "price": price, "screen": screen})
+                    collected_product_names.add(name)
+                    logger.info("Product %d: %s - %s", len(entries), name, price)
+
+        logger.info(f"Total products: {len(entries)}")
+        catalog = ProductCatalog(entries, ProductCatalog.current_sort(self.driver))
+        catalog.attach(self.driver)
+        return catalog
+
+    def get_all_products(self, refresh=False):
+        """Get all available products in list order.
+
+        The list is scrolled through only to build the session's catalog,
+        later calls are answered from it (see catalog()).
+
+        Args:
+            refresh: Scroll through the list again even if the catalog is
+                up to date.
+
+        Returns:
+            List of dicts with 'name' and 'price' keys.
+        """
+        return self.catalog(refresh).products()
+
+    def _visible_product(self, product_name):
+        records = self.read_records(
+            self.PRODUCT_ITEMS,
+            {
+                "name": self.ITEM_TITLE,
+                "price": self.ITEM_PRICE,
+                "button": self.ITEM_ADD_TO_CART,
+            },
+        )
+        return next(
+            (
+                record
+                for record in records
+                if record["name"] == product_name
+                and record["price"]
+                and record["button"]
+            ),
+            None,
+        )
+
+    def _swipe_to_product(self, entry):
+        self.scroll_to_top()
+        self.swipe_down_list(entry["screen"])
+        product = self._visible_product(entry["name"])
+        if product is None:
+            # Seen first with its button cut off at the bottom edge
+            self.swipe_down_list(1)
+            product = self._visible_product(entry["name"])
+        if product is not None:
+            logger.info(f"Swiped to {entry['name']} on screen {entry['screen']}")
+        return product
 
     def add_product_to_cart_by_name(self, product_name):
         """Add product to cart by name.
 
+        With a catalog, unknown products fail at once, a product already on
+        screen is added without scrolling and any other is reached by
+        swiping from the top of the list straight to its catalog screen.
+        Without one (or if the product isn't where the catalog says), the
+        list is searched with UiScrollable.
+
         Args:
             product_name: Exact name of product to add.
 
@@ -109,66 +175,35 @@ class ProductsPage(BasePage):
         """
         logger.info(f"Adding product: {product_name}")
 
-        self.scroll_to_text(product_name)
-        logger.info(f"Scrolled to {product_name}")
-
-        all_products = self.find_elements(self.PRODUCT_ITEMS)
-        product_index = None
-
-        for index, product in enumerate(all_products, start=1):
-            try:
-                name_element = product.find_element(
-                    AppiumBy.XPATH,
-                    './/android.widget.TextView[@content-desc="test-Item title"]',
-                )
-                if name_element.text == product_name:
-                    product_index = index
-                    logger.info(f"Found {product_name} at index {product_index}")
+        catalog = ProductCatalog.for_driver(self.driver)
+        if catalog is not None and product_name not in catalog:
+            raise Exception(f"Product {product_name} is not in the product list")
+
+        product = self._visible_product(product_name)
+        if product is None and catalog is not None:
+            if catalog.is_ordered_for(self.driver):
+                product = self._swipe_to_product(catalog.get(product_name))
+        if product is None:
+            self.scroll_to_text(product_name)
+            logger.info(f"Scrolled to {product_name}")
+
+            for _ in self.scroll_list(max_swipes=4):
+                product = self._visible_product(product_name)
+                if product:
                     break
-            except Exception:
-                continue
+                logger.info("Price or button not visible, scrolling")
 
-        if product_index is None:
-            raise Exception(f"Could not find product {product_name} in visible items")
+        if product is None:
+            raise Exception(f"Could not find price or button for {product_name}")
 
-        max_swipe_attempts = 5
-        price = None
-        add_to_cart_button = None
-
-        price_xpath = f'(//android.view.ViewGroup[@content-desc="test-Item"])[{product_index}]//android.widget.TextView[@content-desc="test-Price"]'
+        price = product["price"]
+        logger.info(f"Price: {price}")
         add_to_cart_xpath = (
-            f'(//android.widget.TextView[@text="ADD TO CART"])[{product_index}]'
+            f'//android.view.ViewGroup[@content-desc="test-Item"]'
+            f'[.//android.widget.TextView[@text="{product_name}"]]'
+            f'//android.widget.TextView[@text="ADD TO CART"]'
         )
-
-        for attempt in range(max_swipe_attempts):
-            try:
-                from selenium.webdriver.support.ui import WebDriverWait
-
-                wait_short = WebDriverWait(self.driver, 2)
-
-                price_element = wait_short.until(
-                    lambda d: d.find_element(AppiumBy.XPATH, price_xpath)
-                )
-                price = price_element.text
-                logger.info(f"Price: {price}")
-
-                add_to_cart_button = wait_short.until(
-                    lambda d: d.find_element(AppiumBy.XPATH, add_to_cart_xpath)
-                )
-                logger.info("ADD TO CART button found and visible")
-                break
-            except Exception:
-                if attempt < max_swipe_attempts - 1:
-                    logger.info(f"Price or button not visible, attempt {attempt + 1}")
-                    self.driver.swipe(
-                        start_x=500, start_y=700, end_x=500, end_y=300, duration=500
-                    )
-                else:
-                    raise Exception(
-                        f"Could not find price or button for {product_name}"
-                    )
-
-        add_to_cart_button.click()
+        self.click((AppiumBy.XPATH, add_to_cart_xpath))
         logger.info(f"Clicked ADD TO CART for {product_name}")
 
         logger.info(f"Successfully added {product_name} ({price}) to cart")
@@ -202,4 +237,6 @@ class ProductsPage(BasePage):
             AppiumBy.XPATH, f'//android.widget.TextView[@text="{filter_name}"]'
         )
         filter_element.click()
+        self.invalidate_snapshot()
+        ProductCatalog.sort_changed(self.driver, filter_name)
         logger.info(f"Filter '{filter_name}' selected")
@@ -1,31 +1,145 @@
+import os
+import re
 import sys
 import logging
 import pytest
 from pathlib import Path
-from datetime import datetime
 
-from appium import webdriver
 from appium.options.android import UiAutomator2Options
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config import settings
+from pages.login_page import LoginPage
+from utils import (
+    artifact_store,
+    command_stats,
+    element_cache,
+    http_client,
+    log_queue,
+    page_profiler,
+    screenshot_buffer,
+    screenshot_writer,
+    scrolling,
+    tracing,
+    waits,
+)
+from utils.apk_cache import ApkCache
+from utils.product_catalog import ProductCatalog
+from utils.session_factory import PrewarmedSessionFactory
+from utils.session_pool import SessionPool
 
-results_dir = Path(__file__).parent.parent / "results"
-results_dir.mkdir(exist_ok=True)
+results_dir = settings.RESULTS_DIR
+results_dir.mkdir(parents=True, exist_ok=True)
 
 logs_dir = results_dir / "logs"
 logs_dir.mkdir(exist_ok=True)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler(logs_dir / "appium.log"), logging.StreamHandler()],
-)
+login_stats = {"performed": 0, "skipped": 0}
+device_tests = {"run": 0}
+
+log_queue.configure(logs_dir / "appium.log", use_queue=settings.LOG_QUEUE)
+
+if settings.PAGE_PROFILE:
+    page_profiler.enable()
+
+if settings.TRACE:
+    tracing.start(
+        f"{os.getenv('PYTEST_XDIST_WORKER', 'main')} "
+        f"({settings.DEVICE_NAME or settings.UDID or 'default device'})"
+    )
+
+
+def _test_dir(node):
+    """Get the results directory of a test, unique per process and test."""
+    return results_dir / artifact_store.RUN_ID / re.sub(r"[^\w.-]", "_", node.name)
+
+
+def build_options(install_decision=None):
+    app_path = Path(__file__).parent.parent / settings.APP_PATH
+
+    options = UiAutomator2Options()
+    if settings.PLATFORM_VERSION:
+        options.platform_version = settings.PLATFORM_VERSION
+    options.udid = settings.UDID
+    if settings.SYSTEM_PORT:
+        options.system_port = settings.SYSTEM_PORT
+    options.app = str(app_path.absolute())
+    options.full_reset = settings.FULL_RESET
+    options.app_package = settings.APP_PACKAGE
+    options.app_activity = settings.APP_ACTIVITY
+    options.app_wait_duration = 30000
+    if install_decision:
+        ApkCache.apply(options, install_decision, full_reset=settings.FULL_RESET)
+    return options
+
+
+@pytest.fixture(scope="session")
+def apk_cache():
+    return ApkCache(settings.APK_CACHE_FILE) if settings.APK_CACHE else None
+
+
+@pytest.fixture(scope="session")
+def install_decision(apk_cache):
+    if apk_cache is None:
+        return None
+    return apk_cache.decide(
+        settings.UDID,
+        Path(__file__).parent.parent / settings.APP_PATH,
+        package=settings.APP_PACKAGE,
+        full_reset=settings.FULL_RESET,
+        clear_data=settings.SESSION_RESET == "clear",
+    )
+
+
+@pytest.fixture(scope="session")
+def session_options(install_decision):
+    return build_options(install_decision)
+
+
+def create_session(options):
+    return http_client.create_driver(
+        settings.APPIUM_SERVER,
+        options,
+        pool_size=settings.APPIUM_HTTP_POOL_SIZE,
+        keep_alive=settings.APPIUM_HTTP_KEEP_ALIVE,
+        connect_timeout=settings.APPIUM_HTTP_CONNECT_TIMEOUT,
+        read_timeout=settings.APPIUM_HTTP_READ_TIMEOUT,
+        retries=settings.APPIUM_HTTP_RETRIES,
+    )
+
+
+@pytest.fixture(scope="session")
+def session_pool(session_options):
+    factory = None
+    if settings.SESSION_PREWARM and settings.SESSION_POOL:
+        # Pooled sessions are reused, warm ones would sit open next to them
+        logging.getLogger(__name__).warning(
+            "SESSION_PREWARM is ignored with SESSION_POOL=true"
+        )
+    elif settings.SESSION_PREWARM:
+        factory = PrewarmedSessionFactory(
+            create_session, lookahead=settings.SESSION_PREWARM
+        )
+        factory.prime(session_options)
+
+    pool = SessionPool(
+        settings.APPIUM_SERVER,
+        reset=settings.SESSION_RESET,
+        reuse=settings.SESSION_POOL,
+        session_factory=factory.get if factory else create_session,
+        on_reset=ProductCatalog.sort_changed,
+    )
+    yield pool
+    screenshot_writer.shutdown()
+    pool.close()
+    if factory:
+        factory.shutdown()
+    http_client.close_all()
 
 
 @pytest.fixture(scope="function")
-def driver(request):
+def driver(request, session_pool, session_options, apk_cache, install_decision):
     logger = logging.getLogger(__name__)
 
     logger.info("=" * 80)
@@ -33,6 +147,7 @@ def driver(request):
     logger.info("=" * 80)
     logger.info(f"Appium Server: {settings.APPIUM_SERVER}")
     logger.info(f"Device UDID: {settings.UDID if settings.UDID else 'Auto-detected'}")
+    logger.info(f"System Port: {settings.SYSTEM_PORT or 'Default'}")
     logger.info(
         f"Platform Version: {settings.PLATFORM_VERSION if settings.PLATFORM_VERSION else 'Auto-detected'}"
     )
@@ -40,30 +155,224 @@ def driver(request):
     logger.info(f"App Package: {settings.APP_PACKAGE}")
     logger.info(f"App Activity: {settings.APP_ACTIVITY}")
     logger.info(f"Full Reset: {settings.FULL_RESET}")
+    logger.info(f"Session Pool: {settings.SESSION_POOL} ({settings.SESSION_RESET})")
+    logger.info(f"Session Prewarm: {settings.SESSION_PREWARM}")
+    if install_decision:
+        logger.info(
+            f"App Install: {install_decision.action} ({install_decision.reason})"
+        )
     logger.info("=" * 80)
 
-    app_path = Path(__file__).parent.parent / settings.APP_PATH
-
-    test_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    test_results_dir = results_dir / test_timestamp
-    test_results_dir.mkdir(exist_ok=True)
-
-    screenshots_dir = test_results_dir / "screenshots"
-    screenshots_dir.mkdir(exist_ok=True)
+    screenshots_dir = _test_dir(request.node) / "screenshots"
+    screenshots_dir.mkdir(parents=True, exist_ok=True)
 
     if hasattr(request, "instance") and request.instance is not None:
         request.instance.screenshots_dir = screenshots_dir
 
-    options = UiAutomator2Options()
-    if settings.PLATFORM_VERSION:
-        options.platform_version = settings.PLATFORM_VERSION
-    options.udid = settings.UDID
-    options.app = str(app_path.absolute())
-    options.full_reset = settings.FULL_RESET
-    options.app_package = settings.APP_PACKAGE
-    options.app_activity = settings.APP_ACTIVITY
-    options.app_wait_duration = 30000
-
-    android_driver = webdriver.Remote(settings.APPIUM_SERVER, options=options)
+    # logged_in_driver restores the logged-in state itself, so the app is not
+    # reset between tests that use it
+    reset = "none" if "logged_in_driver" in request.fixturenames else None
+    android_driver = session_pool.acquire(session_options, reset=reset)
+    if apk_cache:
+        apk_cache.confirm(android_driver, install_decision)
     yield android_driver
-    android_driver.quit()
+    report = getattr(request.node, "rep_call", None)
+    failed = report is None or report.failed
+    screenshot_buffer.finish_test(
+        failed or request.node.get_closest_marker("keep_screenshots") is not None
+    )
+    screenshot_writer.flush()
+    session_pool.release(android_driver, dirty=failed)
+
+
+def _log_since(log_file, start):
+    """Read what was appended to a log file since its stat() result start.
+
+    If the RotatingFileHandler rolled the file over meanwhile (new inode,
+    smaller size or a newer backup), the new file is read from the start;
+    the earlier part of the run stays in the gzipped backup.
+    """
+    if start is None:
+        return log_file.read_bytes()
+    current = log_file.stat()
+    backup = log_file.with_name(f"{log_file.name}.1.gz")
+    rotated = (
+        current.st_ino != start.st_ino
+        or current.st_size < start.st_size
+        or (backup.exists() and backup.stat().st_mtime > start.st_mtime)
+    )
+    with open(log_file, "rb") as log:
+        if not rotated:
+            log.seek(start.st_size)
+        return log.read()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def artifacts():
+    """Store this run's log in the artifact store and apply the retention."""
+    log_file = logs_dir / "appium.log"
+    log_start = log_file.stat() if log_file.exists() else None
+    store = artifact_store.get_store()
+    yield store
+    if store is None:
+        return
+    log_queue.flush()
+    store.put(_log_since(log_file, log_start), log_file, kind="log")
+    store.evict(
+        max_bytes=settings.ARTIFACT_MAX_BYTES,
+        max_age_days=settings.ARTIFACT_MAX_AGE_DAYS,
+    )
+
+
+@pytest.fixture(scope="function")
+def logged_in_driver(driver):
+    logged_in = LoginPage(driver).ensure_logged_in()
+    login_stats["performed" if logged_in else "skipped"] += 1
+    return driver
+
+
+@pytest.fixture(autouse=True)
+def test_log(request):
+    """Write the records logged during a device test to its own log file too.
+
+    Unit tests (fakes, no device) leave no per-test files in results/.
+    """
+    if request.node.get_closest_marker("unit") is not None:
+        yield
+        return
+    device_tests["run"] += 1
+    log_queue.start_test(_test_dir(request.node) / "test.log")
+    yield
+    log_queue.end_test()
+
+
+@pytest.fixture(autouse=True)
+def command_statistics(request):
+    """Attribute the WebDriver commands sent during a test to it."""
+    command_stats.start_test(request.node.nodeid)
+    yield
+    command_stats.end_test()
+
+
+@pytest.fixture(autouse=True)
+def trace_test(request):
+    """Record the test as a span, closing its last step() at the end."""
+    with tracing.span(request.node.nodeid, "test"):
+        yield
+        tracing.end_step()
+
+
+@pytest.fixture(autouse=True)
+def wait_budget():
+    """Share settings.WAIT_BUDGET seconds of waiting between a test's waits."""
+    with waits.budget(settings.WAIT_BUDGET) as test_budget:
+        yield test_budget
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+
+def pytest_unconfigure(config):
+    if device_tests["run"] and command_stats.per_test():
+        command_stats.export(results_dir / artifact_store.RUN_ID)
+    if page_profiler.report():
+        page_profiler.export(results_dir / artifact_store.RUN_ID / "page_profile.json")
+    recorder = tracing.stop()
+    if recorder is not None:
+        recorder.export(results_dir / artifact_store.RUN_ID / "trace.json")
+    log_queue.shutdown()
+
+
+def pytest_terminal_summary(terminalreporter):
+    if login_stats["performed"] or login_stats["skipped"]:
+        terminalreporter.write_line(
+            f"Login flows: {login_stats['performed']} performed, "
+            f"{login_stats['skipped']} skipped"
+        )
+    connections = http_client.connection_stats()
+    if connections["requests"]:
+        terminalreporter.write_line(
+            f"Appium HTTP connections: {connections['new']} new, "
+            f"{connections['reused']} reused"
+        )
+    elements = element_cache.cache_stats()
+    if elements["hits"] or elements["misses"]:
+        terminalreporter.write_line(
+            f"Element cache: {elements['hits']} hits, {elements['misses']} misses, "
+            f"{elements['stale']} stale"
+        )
+    wait_summary = waits.wait_stats()
+    if wait_summary["waits"]:
+        terminalreporter.write_line(
+            f"Waits: {wait_summary['waits']} waits, "
+            f"{wait_summary['polls_per_wait']:.1f} polls per wait, "
+            f"time to satisfy median {wait_summary['time_to_satisfy']['median']:.2f}s "
+            f"/ p95 {wait_summary['time_to_satisfy']['p95']:.2f}s, "
+            f"{wait_summary['timeouts']} timeouts"
+        )
+    scroll_summary = scrolling.scroll_stats()
+    if scroll_summary["traversals"]:
+        terminalreporter.write_line(
+            f"Scrolling: {scroll_summary['traversals']} list traversals, "
+            f"{scroll_summary['swipes_per_traversal']:.1f} swipes per traversal "
+            f"(max {scroll_summary['max_swipes']}), "
+            f"{scroll_summary['ends_reached']} reached the end"
+        )
+    screenshots = screenshot_writer.screenshot_stats()
+    if screenshots["written"] or screenshots["errors"]:
+        terminalreporter.write_line(
+            f"Screenshots: {screenshots['written']} written in the background, "
+            f"{screenshots['duplicates']} near-duplicates skipped "
+            f"({screenshots['bytes_saved'] / 1024:.0f} KB saved), "
+            f"{screenshots['worker_seconds']:.2f}s of decoding and I/O off the "
+            f"test thread, {screenshots['blocked_seconds']:.2f}s blocked on a "
+            f"full queue, {screenshots['errors']} failed"
+        )
+    buffered = screenshot_buffer.buffer_stats()
+    if buffered["persisted"] or buffered["discarded"]:
+        terminalreporter.write_line(
+            f"Screenshot buffer: {buffered['persisted']} written for failed or "
+            f"marked tests, {buffered['discarded']} dropped "
+            f"({buffered['bytes_not_written'] / 1024:.0f} KB not written), "
+            f"{buffered['evicted']} evicted over the limits"
+        )
+    stored = artifact_store.artifact_stats()
+    if stored["artifacts"]:
+        terminalreporter.write_line(
+            f"Artifacts: {stored['artifacts']} stored, "
+            f"{stored['bytes_written'] / 1024:.0f} KB written for "
+            f"{stored['bytes_in'] / 1024:.0f} KB of content "
+            f"({stored['saved_by_dedup'] / 1024:.0f} KB saved by dedup, "
+            f"{stored['saved_by_compression'] / 1024:.0f} KB by compression)"
+        )
+    commands = command_stats.summary(limit=10)
+    if commands:
+        terminalreporter.write_line("Slowest WebDriver commands (total time):")
+        terminalreporter.write_line(
+            f"  {'command':<24}{'strategy':<20}{'count':>7}{'total ms':>10}"
+            f"{'mean':>8}{'p95':>8}{'max':>8}{'KB in':>8}{'retries':>9}"
+        )
+        for row in commands:
+            terminalreporter.write_line(
+                f"  {row['command']:<24}{row['strategy'] or '-':<20}"
+                f"{row['count']:>7}{row['total_ms']:>10.0f}{row['mean_ms']:>8.1f}"
+                f"{row['p95_ms']:>8.0f}{row['max_ms']:>8.0f}"
+                f"{row['bytes_received'] / 1024:>8.1f}{row['retries']:>9}"
+            )
+    methods = page_profiler.report(limit=15)
+    if methods:
+        terminalreporter.write_line("Page object methods (total time):")
+        terminalreporter.write_line(
+            f"  {'method':<48}{'calls':>7}{'total s':>9}{'mean ms':>9}"
+            f"{'p95 ms':>9}{'driver calls':>14}"
+        )
+        for row in methods:
+            terminalreporter.write_line(
+                f"  {row['method']:<48}{row['calls']:>7}{row['total_s']:>9.2f}"
+                f"{row['mean_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+                f"{row['driver_calls']:>14}"
+            )
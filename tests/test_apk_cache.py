@@ -0,0 +1,127 @@
+import pytest
+from appium.options.android import UiAutomator2Options
+
+from utils.apk_cache import CLEAR_DATA, INSTALL, RELAUNCH, ApkCache
+
+PACKAGE = "com.swaglabsmobileapp"
+
+
+class FakeInstaller:
+    """Stand-in for the device side of an Appium session."""
+
+    def __init__(self, installed=True):
+        self.installed = installed
+        self.installs = []
+
+    def is_app_installed(self, package):
+        return self.installed
+
+    def install_app(self, apk_path):
+        self.installs.append(apk_path)
+        self.installed = True
+
+    def activate_app(self, package):
+        pass
+
+
+@pytest.fixture
+def apk(tmp_path):
+    apk_path = tmp_path / "app.apk"
+    apk_path.write_bytes(b"build-1" * 1000)
+    return apk_path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ApkCache(tmp_path / "cache" / "apk_cache.json")
+
+
+def _options(apk):
+    options = UiAutomator2Options()
+    options.app = str(apk)
+    options.app_package = PACKAGE
+    return options
+
+
+def _install(cache, apk, udid="device-a"):
+    decision = cache.decide(udid, apk, package=PACKAGE)
+    cache.confirm(FakeInstaller(), decision)
+    return decision
+
+
+@pytest.mark.unit
+class TestApkCache:
+    def test_installs_unknown_build(self, cache, apk):
+        decision = cache.decide("device-a", apk, package=PACKAGE)
+
+        options = _options(apk)
+        cache.apply(options, decision)
+
+        assert decision.action == INSTALL
+        assert options.app == str(apk)
+
+    def test_relaunches_same_build(self, cache, apk):
+        _install(cache, apk)
+
+        decision = cache.decide("device-a", apk, package=PACKAGE)
+        options = _options(apk)
+        cache.apply(options, decision)
+
+        assert decision.action == RELAUNCH
+        assert options.no_reset is True
+        assert "appium:app" not in options.to_capabilities()
+        assert options.app_package == PACKAGE
+
+    def test_clears_data_for_same_build_on_full_reset(self, cache, apk):
+        _install(cache, apk)
+
+        decision = cache.decide("device-a", apk, package=PACKAGE, full_reset=True)
+        options = _options(apk)
+        cache.apply(options, decision, full_reset=True)
+
+        assert decision.action == CLEAR_DATA
+        assert options.no_reset is False
+        assert options.full_reset is False
+        assert "appium:app" not in options.to_capabilities()
+
+    def test_reinstalls_changed_build(self, cache, apk):
+        _install(cache, apk)
+        apk.write_bytes(b"build-2" * 1000)
+
+        decision = cache.decide("device-a", apk, package=PACKAGE)
+
+        assert decision.action == INSTALL
+        assert "build changed" in decision.reason
+
+    def test_tracks_devices_separately(self, cache, apk):
+        _install(cache, apk, udid="device-a")
+
+        assert cache.decide("device-b", apk, package=PACKAGE).action == INSTALL
+
+    def test_workers_do_not_overwrite_other_devices(self, tmp_path, apk):
+        cache_file = tmp_path / "cache" / "apk_cache.json"
+        worker_a, worker_b = ApkCache(cache_file), ApkCache(cache_file)
+        decision_a = worker_a.decide("device-a", apk, package=PACKAGE)
+        decision_b = worker_b.decide("192.168.1.5:5555", apk, package=PACKAGE)
+
+        worker_a.record_install(decision_a)
+        worker_b.record_install(decision_b)
+
+        assert worker_b.decide("device-a", apk, package=PACKAGE).action == RELAUNCH
+        assert worker_a.device_file("192.168.1.5:5555").exists()
+
+    def test_installs_when_app_missing_on_device(self, cache, apk):
+        _install(cache, apk)
+        decision = cache.decide("device-a", apk, package=PACKAGE)
+        device = FakeInstaller(installed=False)
+
+        cache.confirm(device, decision)
+        cache.confirm(device, decision)
+
+        assert device.installs == [str(apk)]
+
+    def test_decision_is_logged(self, cache, apk, caplog):
+        with caplog.at_level("INFO"):
+            cache.decide("device-a", apk, package=PACKAGE)
+
+        assert "APK cache [device-a]: install app.apk" in caplog.text
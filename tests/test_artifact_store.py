@@ -0,0 +1,194 @@
+import base64
+import os
+import threading
+import time
+
+import pytest
+from appium.options.android import UiAutomator2Options
+
+from config import settings
+from utils import artifact_store, http_client, screenshot_writer
+from utils.artifact_store import ArtifactStore
+from utils.fake_appium import SCREENSHOT_PNG, FakeAppiumServer
+from utils.helpers import take_screenshot
+from utils.screenshot_writer import ScreenshotWriter
+
+SOURCE = "<hierarchy>" + "<node text='Sauce Labs Backpack'/>" * 200 + "</hierarchy>"
+
+
+def _age(path, days):
+    old = time.time() - days * 86400
+    for item in [path, *path.rglob("*")]:
+        os.utime(item, (old, old))
+
+
+@pytest.mark.unit
+class TestArtifactStore:
+    def test_round_trip_by_path(self, tmp_path):
+        store = ArtifactStore(tmp_path / "store", base=tmp_path, run_id="run")
+        store.put(SOURCE, tmp_path / "test_a" / "01.xml", kind="page_source")
+
+        assert store.read(tmp_path / "test_a" / "01.xml") == SOURCE.encode()
+        assert store.index()["test_a/01.xml"]["kind"] == "page_source"
+
+    def test_same_content_is_stored_once(self, tmp_path):
+        store = ArtifactStore(tmp_path, run_id="run")
+        first = store.put(SCREENSHOT_PNG, "a.png")
+        second = store.put(SCREENSHOT_PNG, "b.png")
+
+        assert first == second
+        assert len(list((tmp_path / "objects").glob("*/*"))) == 1
+        assert store.stats["saved_by_dedup"] == len(SCREENSHOT_PNG)
+
+    def test_object_swept_during_put_is_written_again(self, tmp_path, monkeypatch):
+        store = ArtifactStore(tmp_path, run_id="run")
+        digest = store.put(SOURCE, "a.xml")
+        object_path = store._object_path(digest)
+
+        def swept(digest):
+            object_path.unlink()  # evict() of another worker, after the lookup
+            return object_path
+
+        monkeypatch.setattr(store, "_object_path", swept)
+        store.put(SOURCE, "b.xml")
+        monkeypatch.undo()
+
+        assert store.get(digest) == SOURCE.encode()
+
+    def test_compresses_when_smaller(self, tmp_path):
+        store = ArtifactStore(tmp_path, run_id="run")
+        store.put(SOURCE, "page.xml")
+        store.put(os.urandom(1024), "noise.bin")
+
+        index = store.index()
+        assert index["page.xml"]["compressed"]
+        assert not index["noise.bin"]["compressed"]
+        assert store.stats["bytes_written"] < store.stats["bytes_in"]
+        assert store.stats["saved_by_compression"] > 0
+
+    def test_concurrent_writers(self, tmp_path):
+        stores = [ArtifactStore(tmp_path, run_id=f"run{i}") for i in range(4)]
+
+        def write(store):
+            for i in range(20):
+                store.put(f"{SOURCE}{i % 5}", f"{i}.xml")
+
+        threads = [threading.Thread(target=write, args=(s,)) for s in stores]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(list((tmp_path / "objects").glob("*/*.gz"))) == 5
+        assert not list((tmp_path / "objects").glob("*/.tmp-*"))
+        assert all(len(store.index()) == 20 for store in stores)
+
+    def test_evicts_old_runs_and_their_objects(self, tmp_path):
+        ArtifactStore(tmp_path, run_id="old").put("old content", "a.txt")
+        _age(tmp_path, days=30)
+        store = ArtifactStore(tmp_path, run_id="new")
+        store.put("new content", "a.txt")
+
+        removed = store.evict(max_age_days=14)
+
+        assert removed["runs"] == 1
+        assert removed["objects"] == 1
+        assert [d.name for d in (tmp_path / "runs").iterdir()] == ["new"]
+        assert store.read("a.txt") == b"new content"
+
+    def test_evicts_oldest_runs_over_size(self, tmp_path):
+        for i in range(3):
+            ArtifactStore(tmp_path, run_id=f"run{i}").put(os.urandom(1000), "a.bin")
+            _age(tmp_path / "runs" / f"run{i}", days=3 - i)
+        store = ArtifactStore(tmp_path, run_id="current")
+
+        store.evict(max_bytes=1500, grace=0)
+
+        assert sorted(d.name for d in (tmp_path / "runs").iterdir()) == [
+            "current",
+            "run2",
+        ]
+
+    def test_objects_vanishing_during_sweep(self, tmp_path, monkeypatch):
+        store = ArtifactStore(tmp_path, run_id="current")
+        for i in range(3):
+            store._write_object(f"{i:02d}" * 32, os.urandom(100))
+        listed = list(store.objects_dir.glob("*/*"))
+        for path in listed[1:]:
+            path.unlink()  # evict() of another worker, after the listing
+        monkeypatch.setattr(type(store.objects_dir), "glob", lambda *_: iter(listed))
+
+        assert store._objects_size() == 100
+        removed = store.evict(max_bytes=0, grace=0)
+
+        assert removed["objects"] == 1
+        assert removed["bytes"] == 100
+
+    def test_keeps_runs_written_within_grace(self, tmp_path):
+        ArtifactStore(tmp_path, run_id="other_worker").put(os.urandom(1000), "a.bin")
+        store = ArtifactStore(tmp_path, run_id="current")
+        store.put(os.urandom(1000), "a.bin")
+
+        removed = store.evict(max_bytes=0, max_age_days=0, grace=60)
+
+        assert removed["runs"] == 0
+        assert len(store.index("other_worker")) == 1
+
+    def test_index_skips_unreadable_lines(self, tmp_path):
+        store = ArtifactStore(tmp_path, run_id="run")
+        store.put("first", "a.txt")
+        with open(store.run_dir / "index.jsonl", "a") as index:
+            index.write('{"path": "b.txt", "dig\n')  # writer killed mid-line
+        store.put("second", "c.txt")
+
+        assert sorted(store.index()) == ["a.txt", "c.txt"]
+
+    def test_put_recreates_removed_run_dir(self, tmp_path):
+        store = ArtifactStore(tmp_path, run_id="run")
+        store.run_dir.rmdir()
+
+        store.put("content", "a.txt")
+
+        assert store.read("a.txt") == b"content"
+
+    def test_screenshot_writer_puts_into_store(self, tmp_path):
+        store = ArtifactStore(tmp_path / "store", base=tmp_path, run_id="run")
+        writer = ScreenshotWriter(store=store)
+        writer.submit(base64.b64encode(SCREENSHOT_PNG).decode(), tmp_path / "s.png")
+        writer.close()
+
+        assert not (tmp_path / "s.png").exists()
+        assert store.read(tmp_path / "s.png") == SCREENSHOT_PNG
+
+    def test_synchronous_screenshot_goes_into_store(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "ARTIFACT_STORE", True)
+        monkeypatch.setattr(settings, "ARTIFACT_DIR", tmp_path / "store")
+        monkeypatch.setattr(settings, "RESULTS_DIR", tmp_path)
+        monkeypatch.setattr(settings, "SCREENSHOT_ASYNC", False)
+        monkeypatch.setattr(settings, "SCREENSHOT_MODE", "always")
+        monkeypatch.setattr(artifact_store, "_default", None)
+        options = UiAutomator2Options()
+        options.app_package = "com.swaglabsmobileapp"
+
+        with FakeAppiumServer() as server:
+            driver = http_client.create_driver(server.url, options)
+            take_screenshot(driver, tmp_path / "test_a", "state")
+            driver.quit()
+
+        store = artifact_store.get_store()
+        assert store.read(tmp_path / "test_a" / "state.png") == SCREENSHOT_PNG
+        assert not (tmp_path / "test_a" / "state.png").exists()
+
+    def test_no_near_duplicate_skipping_into_store(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "ARTIFACT_STORE", True)
+        monkeypatch.setattr(settings, "ARTIFACT_DIR", tmp_path / "store")
+        monkeypatch.setattr(settings, "SCREENSHOT_DEDUP", True)
+        monkeypatch.setattr(artifact_store, "_default", None)
+        screenshot_writer.shutdown()
+
+        try:
+            writer = screenshot_writer.get_writer()
+            assert writer.store is artifact_store.get_store()
+            assert writer.dedup is None
+        finally:
+            screenshot_writer.shutdown()
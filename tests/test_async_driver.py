@@ -0,0 +1,64 @@
+import time
+
+import pytest
+from appium.options.android import UiAutomator2Options
+
+from pages.products_page import ProductsPage
+from utils import http_client
+from utils.async_driver import AsyncDriver
+from utils.fake_appium import PRODUCTS, FakeAppiumServer
+from utils.helpers import capture_state
+
+LATENCY = 0.05
+
+
+def _options():
+    options = UiAutomator2Options()
+    options.app_package = "com.swaglabsmobileapp"
+    return options
+
+
+@pytest.fixture
+def server():
+    with FakeAppiumServer(latencies={"element_text": LATENCY}) as fake_server:
+        yield fake_server
+
+
+@pytest.fixture
+def driver(server):
+    driver = http_client.create_driver(server.url, _options())
+    yield driver
+    driver.quit()
+
+
+@pytest.mark.unit
+class TestAsyncDriver:
+    def test_respects_concurrency_limit(self, server, driver):
+        adriver = AsyncDriver(driver, max_concurrency=2)
+        items = driver.find_elements(*ProductsPage.PRODUCT_ITEMS)
+
+        started = time.perf_counter()
+        texts = adriver.run_sync(
+            adriver.gather(
+                *(adriver.child_text(i, *ProductsPage.ITEM_TITLE) for i in items)
+            )
+        )
+        elapsed = time.perf_counter() - started
+        adriver.close()
+
+        assert texts == [name for name, _ in PRODUCTS]
+        assert server.stats.max_in_flight == 2
+        assert elapsed < len(items) * LATENCY
+
+    def test_facade_is_shared_per_driver(self, driver):
+        assert AsyncDriver.for_driver(driver) is AsyncDriver.for_driver(driver)
+
+    def test_capture_state_saves_screenshot_and_source(self, driver, tmp_path):
+        screenshot, source = capture_state(driver, tmp_path, "state")
+
+        assert (tmp_path / "state.png").read_bytes().startswith(b"\x89PNG")
+        assert "PRODUCTS" in (tmp_path / "state.xml").read_text()
+        assert (screenshot, source) == (
+            str(tmp_path / "state.png"),
+            str(tmp_path / "state.xml"),
+        )
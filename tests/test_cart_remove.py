@@ -1,70 +1,42 @@
 import pytest
 import logging
 from appium.webdriver.common.appiumby import AppiumBy
-from pages.login_page import LoginPage
 from pages.products_page import ProductsPage
 from pages.cart_page import CartPage
 from utils.helpers import take_screenshot
 
 logger = logging.getLogger(__name__)
 
+ADD_TO_CART = (AppiumBy.XPATH, '//android.widget.TextView[@text="ADD TO CART"]')
+
 
 @pytest.mark.android
 @pytest.mark.smoke
+@pytest.mark.usefixtures("logged_in_driver")
 class TestCartRemove:
     screenshots_dir = None
 
     def test_remove_all_items_from_cart(self, driver):
         logger.info("Test: Remove all items from cart")
 
-        login_page = LoginPage(driver)
-        login_page.is_displayed(login_page.LOGIN_BUTTON, timeout=10)
-
-        logger.info("  - Login with standard_user...")
-        login_page.scroll_to_standard_user()
-        login_page.select_standard_user()
-        login_page.scroll_to_accessibility_id("test-LOGIN")
-        login_page.click_login()
-        login_page.wait_for_products_page()
-        logger.info("  [OK] Logged in")
-
         products_page = ProductsPage(driver)
         logger.info("  - Adding products to cart...")
         products_added = 0
 
-        while True:
-            add_to_cart_buttons = driver.find_elements(
-                AppiumBy.XPATH, '//android.widget.TextView[@text="ADD TO CART"]'
-            )
-
-            if not add_to_cart_buttons:
-                driver.swipe(
-                    start_x=500, start_y=700, end_x=500, end_y=300, duration=500
-                )
-                add_to_cart_buttons = driver.find_elements(
-                    AppiumBy.XPATH, '//android.widget.TextView[@text="ADD TO CART"]'
-                )
-                if not add_to_cart_buttons:
-                    break
-
-            for i in range(len(add_to_cart_buttons)):
+        for snapshot in products_page.scroll_list():
+            visible_buttons = len(snapshot.find_elements(*ADD_TO_CART))
+            for _ in range(visible_buttons):
                 try:
-                    buttons = driver.find_elements(
-                        AppiumBy.XPATH, '//android.widget.TextView[@text="ADD TO CART"]'
+                    driver.find_element(*ADD_TO_CART).click()
+                    products_added += 1
+                    take_screenshot(
+                        driver,
+                        self.screenshots_dir,
+                        f"01_product_{products_added}_added",
                     )
-                    if i < len(buttons):
-                        buttons[i].click()
-                        products_added += 1
-                        take_screenshot(
-                            driver,
-                            self.screenshots_dir,
-                            f"01_product_{products_added}_added",
-                        )
                 except Exception as e:
                     logger.warning(f"Could not click button: {e}")
-                    continue
-
-            driver.swipe(start_x=500, start_y=700, end_x=500, end_y=300, duration=500)
+            products_page.invalidate_snapshot()
 
         logger.info(f"  [OK] Added {products_added} products to cart")
         take_screenshot(driver, self.screenshots_dir, "01_all_products_added")
@@ -0,0 +1,87 @@
+import csv
+import json
+
+import pytest
+from appium.options.android import UiAutomator2Options
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import NoSuchElementException
+
+from utils import command_stats, http_client
+from utils.command_stats import CommandHistogram
+from utils.fake_appium import FakeAppiumServer
+
+
+def _options():
+    options = UiAutomator2Options()
+    options.app_package = "com.swaglabsmobileapp"
+    return options
+
+
+@pytest.fixture
+def driver(request):
+    with FakeAppiumServer(latencies={"page_source": 0.02}) as server:
+        driver = http_client.create_driver(server.url, _options())
+        command_stats.start_test(request.node.nodeid)
+        yield driver
+        command_stats.end_test()
+        driver.quit()
+
+
+def _rows(request):
+    return {
+        (row["command"], row["strategy"]): row
+        for row in command_stats.per_test()
+        if row["test"] == request.node.nodeid
+    }
+
+
+@pytest.mark.unit
+class TestCommandHistogram:
+    def test_percentiles_from_buckets(self):
+        histogram = CommandHistogram()
+        for latency in [3] * 90 + [150] * 10:
+            histogram.add(latency, 0, 0, 0, False)
+
+        assert histogram.percentile(0.5) == 5
+        assert histogram.percentile(0.95) == 150
+        assert histogram.as_dict()["histogram"]["200"] == 10
+
+    def test_open_bucket_reports_max(self):
+        histogram = CommandHistogram()
+        histogram.add(12000, 0, 0, 0, False)
+
+        assert histogram.percentile(0.95) == 12000
+
+
+@pytest.mark.unit
+class TestCommandStats:
+    def test_records_commands_of_test(self, driver, request):
+        driver.page_source
+        driver.find_elements(AppiumBy.ACCESSIBILITY_ID, "test-Item")
+
+        rows = _rows(request)
+        source = rows[("getPageSource", None)]
+        assert source["count"] == 1
+        assert source["total_ms"] >= 20
+        assert source["bytes_received"] > 1000
+        find = rows[("findElements", "accessibility id")]
+        assert find["bytes_sent"] > 0
+
+    def test_counts_http_errors(self, driver, request):
+        with pytest.raises(NoSuchElementException):
+            driver.find_element(AppiumBy.ACCESSIBILITY_ID, "missing")
+
+        assert _rows(request)[("findElement", "accessibility id")]["errors"] == 1
+
+    def test_export(self, driver, request, tmp_path):
+        driver.page_source
+
+        json_path, csv_path = command_stats.export(tmp_path)
+
+        exported = json.loads(json_path.read_text())
+        assert any(row["test"] == request.node.nodeid for row in exported["tests"])
+        assert exported["summary"][0]["total_ms"] >= exported["summary"][-1]["total_ms"]
+        with open(csv_path, newline="") as csv_file:
+            header = next(csv.reader(csv_file))
+        assert header[:3] == ["test", "command", "strategy"]
+        assert "histogram" not in header
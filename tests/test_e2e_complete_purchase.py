@@ -6,6 +6,7 @@ from pages.products_page import ProductsPage
 from pages.cart_page import CartPage
 from pages.checkout_page import CheckoutPage
 from pages.checkout_overview_page import CheckoutOverviewPage
+from utils import tracing
 from utils.helpers import take_screenshot
 
 logger = logging.getLogger(__name__)
@@ -33,6 +34,7 @@ class TestCompletePurchaseFlow:
 
         try:
             logger.info("\n[STEP 1] Login with standard_user autofill")
+            tracing.step("Login with standard_user autofill")
             login_page = LoginPage(driver)
 
             logger.info("  - Waiting for LOGIN button to appear...")
@@ -40,16 +42,18 @@ class TestCompletePurchaseFlow:
             take_screenshot(driver, self.screenshots_dir, "01_application_opened")
             logger.info("  [OK] Application opened")
 
-            logger.info("  - Scrolling to standard_user button...")
-            login_page.scroll_to_standard_user()
-            logger.info("  [OK] Scrolled to standard_user button")
+            logger.info("  - Locating standard_user and LOGIN buttons...")
+            targets = login_page.scroll_search(
+                texts=[login_page.STANDARD_USER_TEXT], accessibility_ids=["test-LOGIN"]
+            )
+            logger.info("  [OK] Located standard_user button")
 
             logger.info("  - Clicking standard_user to auto-fill credentials...")
-            login_page.select_standard_user()
+            login_page.select_standard_user(targets)
             logger.info("  [OK] Clicked standard_user")
 
             logger.info("  - Scrolling to LOGIN button...")
-            login_page.scroll_to_accessibility_id("test-LOGIN")
+            login_page.scroll_to_target(targets, "test-LOGIN")
 
             logger.info("  - Verifying username auto-fill...")
             username = login_page.get_username_value()
@@ -69,6 +73,7 @@ class TestCompletePurchaseFlow:
             logger.info("  [OK] PRODUCTS page loaded - login confirmed")
 
             logger.info("\n[STEP 2] Add random product to cart")
+            tracing.step("Add random product to cart")
             products_page = ProductsPage(driver)
 
             logger.info("  - Selecting and adding random product...")
@@ -77,6 +82,7 @@ class TestCompletePurchaseFlow:
             take_screenshot(driver, self.screenshots_dir, "04_product_added")
 
             logger.info("\n[STEP 3] Open cart and verify product")
+            tracing.step("Open cart and verify product")
             logger.info("  - Opening cart...")
             cart_icon = products_page.find_element(
                 (AppiumBy.ACCESSIBILITY_ID, "test-Cart")
@@ -98,6 +104,7 @@ class TestCompletePurchaseFlow:
             take_screenshot(driver, self.screenshots_dir, "06_checkout_button_clicked")
 
             logger.info("\n[STEP 4] Fill checkout information")
+            tracing.step("Fill checkout information")
             checkout_page = CheckoutPage(driver)
 
             logger.info("  - Filling checkout form...")
@@ -114,6 +121,7 @@ class TestCompletePurchaseFlow:
             logger.info("  [OK] Data accepted")
 
             logger.info("\n[STEP 5] Verify checkout overview page")
+            tracing.step("Verify checkout overview page")
             checkout_overview_page = CheckoutOverviewPage(driver)
             checkout_overview_page.verify_checkout_overview_page()
             logger.info("  [OK] On checkout overview page")
@@ -137,6 +145,7 @@ class TestCompletePurchaseFlow:
             take_screenshot(driver, self.screenshots_dir, "09_purchase_complete")
 
             logger.info("\n[STEP 6] Return to products page")
+            tracing.step("Return to products page")
             logger.info("  - Clicking BACK HOME...")
             checkout_overview_page.click_back_home()
             logger.info("  [OK] BACK HOME clicked")
@@ -157,5 +166,5 @@ class TestCompletePurchaseFlow:
         except Exception as e:
             logger.error(f"\n[ERROR] Test failed with exception: {str(e)}")
             logger.error(f"[ERROR] Exception type: {type(e).__name__}")
-            take_screenshot(driver, self.screenshots_dir, "99_failure")
+            take_screenshot(driver, self.screenshots_dir, "99_failure", keep=True)
             raise
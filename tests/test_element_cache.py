@@ -0,0 +1,96 @@
+from pathlib import Path
+
+import pytest
+from appium.options.android import UiAutomator2Options
+
+from pages.cart_page import CartPage
+from pages.checkout_page import CheckoutPage
+from pages.products_page import ProductsPage
+from utils import http_client
+from utils.fake_appium import FakeAppiumServer
+
+PAGE_SOURCES = Path(__file__).parent / "fixtures" / "page_sources"
+
+CHECKOUT_SCREEN = """<hierarchy class="hierarchy" width="1080" height="2220">
+  <android.widget.EditText class="android.widget.EditText" text="First Name"
+    content-desc="test-First Name" bounds="[40,500][1040,620]" displayed="true" />
+  <android.widget.EditText class="android.widget.EditText" text="Last Name"
+    content-desc="test-Last Name" bounds="[40,660][1040,780]" displayed="true" />
+  <android.view.ViewGroup class="android.view.ViewGroup" text=""
+    content-desc="test-CONTINUE" bounds="[40,900][1040,1020]" displayed="true" />
+</hierarchy>"""
+
+
+def _options():
+    options = UiAutomator2Options()
+    options.app_package = "com.swaglabsmobileapp"
+    return options
+
+
+@pytest.fixture
+def cart_server():
+    with FakeAppiumServer(page_source=(PAGE_SOURCES / "cart.xml").read_text()) as s:
+        yield s
+
+
+@pytest.fixture
+def driver(cart_server):
+    driver = http_client.create_driver(cart_server.url, _options())
+    yield driver
+    driver.quit()
+
+
+@pytest.mark.unit
+class TestElementCache:
+    def test_reuses_located_element(self, cart_server, driver):
+        page = CartPage(driver)
+
+        for _ in range(3):
+            page.find_element(page.CHECKOUT_BUTTON)
+            page.get_text(page.FIRST_ITEM)
+
+        assert cart_server.stats.commands["find_element"] == 2
+        assert (page.element_cache.hits, page.element_cache.misses) == (4, 2)
+
+    def test_stale_element_is_located_again(self, cart_server, driver):
+        page = CartPage(driver)
+        page.find_element(page.REMOVE_BUTTON)
+
+        cart_server.set_page_source((PAGE_SOURCES / "cart.xml").read_text())
+        page.click(page.REMOVE_BUTTON, navigates=False)
+
+        assert page.element_cache.stale == 1
+        assert cart_server.stats.commands["find_element"] == 2
+        events = cart_server.sessions[driver.session_id].app_events
+        assert events == [("click", "test-REMOVE")]
+
+    def test_navigation_clears_cache(self, cart_server, driver):
+        page = CartPage(driver)
+
+        page.click(page.CHECKOUT_BUTTON)
+        page.find_element(page.CHECKOUT_BUTTON)
+
+        assert page.element_cache.misses == 2
+        assert page.element_cache.hits == 0
+
+    def test_send_keys_reuses_input(self):
+        with FakeAppiumServer(page_source=CHECKOUT_SCREEN) as server:
+            driver = http_client.create_driver(server.url, _options())
+            page = CheckoutPage(driver)
+
+            page.send_keys(page.FIRST_NAME_INPUT, "Jo")
+            page.send_keys(page.FIRST_NAME_INPUT, "John")
+            text = page.get_text(page.FIRST_NAME_INPUT)
+            driver.quit()
+
+        assert text == "John"
+        assert server.stats.commands["find_element"] == 1
+
+    def test_disabled_by_default(self, cart_server, driver):
+        page = ProductsPage(driver)
+
+        page.find_element(CartPage.CHECKOUT_BUTTON)
+        page.find_element(CartPage.CHECKOUT_BUTTON)
+
+        assert page.element_cache is None
+        assert cart_server.stats.commands["find_element"] == 2
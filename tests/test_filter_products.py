@@ -1,7 +1,5 @@
 import pytest
 import logging
-from appium.webdriver.common.appiumby import AppiumBy
-from pages.login_page import LoginPage
 from pages.products_page import ProductsPage
 from utils.helpers import take_screenshot
 
@@ -10,64 +8,10 @@ logger = logging.getLogger(__name__)
 
 @pytest.mark.android
 @pytest.mark.smoke
+@pytest.mark.usefixtures("logged_in_driver")
 class TestFilterProducts:
     screenshots_dir = None
 
-    def _login(self, driver):
-        login_page = LoginPage(driver)
-        login_page.is_displayed(login_page.LOGIN_BUTTON, timeout=10)
-
-        logger.info("  - Login with standard_user...")
-        login_page.scroll_to_standard_user()
-        login_page.select_standard_user()
-        login_page.scroll_to_accessibility_id("test-LOGIN")
-        login_page.click_login()
-        login_page.wait_for_products_page()
-        logger.info("  [OK] Logged in")
-
-    def _collect_products(self, driver, max_iterations=5):
-        products = []
-        iteration = 0
-
-        while iteration < max_iterations:
-            iteration += 1
-            add_to_cart_buttons = driver.find_elements(
-                AppiumBy.XPATH, '//android.widget.TextView[@text="ADD TO CART"]'
-            )
-
-            if not add_to_cart_buttons:
-                logger.info("  [OK] No more products found")
-                break
-
-            items = driver.find_elements(
-                AppiumBy.XPATH, '//android.view.ViewGroup[@content-desc="test-Item"]'
-            )
-            for item in items:
-                try:
-                    name_element = item.find_element(
-                        AppiumBy.XPATH,
-                        './/android.widget.TextView[@content-desc="test-Item title"]',
-                    )
-                    price_element = item.find_element(
-                        AppiumBy.XPATH,
-                        './/android.widget.TextView[@content-desc="test-Price"]',
-                    )
-
-                    name = name_element.text
-                    price = price_element.text
-
-                    if not any(p["name"] == name for p in products):
-                        products.append({"name": name, "price": price})
-                        logger.info(f"  - Product {len(products)}: {name} - {price}")
-                except Exception as e:
-                    logger.debug(f"Could not get product details: {e}")
-
-            logger.info("  - Swiping down for more products...")
-            driver.swipe(start_x=500, start_y=700, end_x=500, end_y=300, duration=500)
-
-        logger.info(f"  [OK] Retrieved {len(products)} products total")
-        return products
-
     def _extract_price(self, price_str):
         return float(price_str.replace("$", "").strip())
 
@@ -92,8 +36,6 @@ class TestFilterProducts:
     def test_filter_products(self, driver, filter_name, sort_key, reverse):
         logger.info(f"Test: Filter products by {filter_name}")
 
-        self._login(driver)
-
         products_page = ProductsPage(driver)
         logger.info("  - Opening filters...")
         products_page.open_filters()
@@ -103,7 +45,8 @@ class TestFilterProducts:
         products_page.select_filter(filter_name)
         take_screenshot(driver, self.screenshots_dir, "02_filter_selected")
 
-        products = self._collect_products(driver)
+        products = products_page.get_all_products()
+        logger.info(f"  [OK] Retrieved {len(products)} products total")
 
         logger.info(f"  - Verifying products are sorted by {filter_name}...")
         sorted_products = sorted(products, key=sort_key, reverse=reverse)
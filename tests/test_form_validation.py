@@ -36,15 +36,19 @@ class TestLoginFormValidation:
         login_page = LoginPage(driver)
         login_page.is_displayed(login_page.LOGIN_BUTTON, timeout=10)
 
+        targets = login_page.scroll_search(
+            accessibility_ids=["test-Username", "test-LOGIN"]
+        )
+
         logger.info("  - Scrolling to username field...")
-        login_page.scroll_to_accessibility_id("test-Username")
+        login_page.scroll_to_target(targets, "test-Username")
 
         logger.info("  - Filling username field...")
         login_page.send_keys(login_page.USERNAME_INPUT, "standard_user")
         logger.info("  [OK] Username filled")
 
         logger.info("  - Scrolling to LOGIN button...")
-        login_page.scroll_to_accessibility_id("test-LOGIN")
+        login_page.scroll_to_target(targets, "test-LOGIN")
         take_screenshot(driver, self.screenshots_dir, "01_filled_username")
 
         logger.info("  - Clicking LOGIN with empty password...")
@@ -61,8 +65,12 @@ class TestLoginFormValidation:
         login_page = LoginPage(driver)
         login_page.is_displayed(login_page.LOGIN_BUTTON, timeout=10)
 
+        targets = login_page.scroll_search(
+            accessibility_ids=["test-Password", "test-LOGIN"]
+        )
+
         logger.info("  - Scrolling to password field...")
-        login_page.scroll_to_accessibility_id("test-Password")
+        login_page.scroll_to_target(targets, "test-Password")
 
         logger.info("  - Filling password field...")
         login_page.send_keys(login_page.PASSWORD_INPUT, "password123")
@@ -70,7 +78,7 @@ class TestLoginFormValidation:
         take_screenshot(driver, self.screenshots_dir, "01_filled_password")
 
         logger.info("  - Scrolling to LOGIN button...")
-        login_page.scroll_to_accessibility_id("test-LOGIN")
+        login_page.scroll_to_target(targets, "test-LOGIN")
 
         logger.info("  - Clicking LOGIN with empty username...")
         login_page.click_login()
@@ -83,23 +91,13 @@ class TestLoginFormValidation:
 
 @pytest.mark.android
 @pytest.mark.smoke
+@pytest.mark.usefixtures("logged_in_driver")
 class TestCheckoutFormValidation:
     screenshots_dir = None
 
     def test_checkout_all_fields_empty(self, driver):
         logger.info("Test: All checkout fields empty")
 
-        login_page = LoginPage(driver)
-        login_page.is_displayed(login_page.LOGIN_BUTTON, timeout=10)
-
-        logger.info("  - Login with standard_user...")
-        login_page.scroll_to_standard_user()
-        login_page.select_standard_user()
-        login_page.scroll_to_accessibility_id("test-LOGIN")
-        login_page.click_login()
-        login_page.wait_for_products_page()
-        logger.info("  [OK] Logged in")
-
         products_page = ProductsPage(driver)
         logger.info("  - Adding random product to cart...")
         products_page.add_random_product_to_cart()
@@ -129,16 +127,6 @@ class TestCheckoutFormValidation:
     def test_checkout_empty_first_name(self, driver):
         logger.info("Test: Empty first name, filled last name and zip code")
 
-        login_page = LoginPage(driver)
-        login_page.is_displayed(login_page.LOGIN_BUTTON, timeout=10)
-
-        logger.info("  - Login with standard_user...")
-        login_page.scroll_to_standard_user()
-        login_page.select_standard_user()
-        login_page.scroll_to_accessibility_id("test-LOGIN")
-        login_page.click_login()
-        login_page.wait_for_products_page()
-
         products_page = ProductsPage(driver)
         logger.info("  - Adding random product to cart...")
         products_page.add_random_product_to_cart()
@@ -173,16 +161,6 @@ class TestCheckoutFormValidation:
     def test_checkout_empty_last_name(self, driver):
         logger.info("Test: Filled first name and zip code, empty last name")
 
-        login_page = LoginPage(driver)
-        login_page.is_displayed(login_page.LOGIN_BUTTON, timeout=10)
-
-        logger.info("  - Login with standard_user...")
-        login_page.scroll_to_standard_user()
-        login_page.select_standard_user()
-        login_page.scroll_to_accessibility_id("test-LOGIN")
-        login_page.click_login()
-        login_page.wait_for_products_page()
-
         products_page = ProductsPage(driver)
         logger.info("  - Adding random product to cart...")
         products_page.add_random_product_to_cart()
@@ -217,16 +195,6 @@ class TestCheckoutFormValidation:
     def test_checkout_empty_zip_code(self, driver):
         logger.info("Test: Filled first name and last name, empty zip code")
 
-        login_page = LoginPage(driver)
-        login_page.is_displayed(login_page.LOGIN_BUTTON, timeout=10)
-
-        logger.info("  - Login with standard_user...")
-        login_page.scroll_to_standard_user()
-        login_page.select_standard_user()
-        login_page.scroll_to_accessibility_id("test-LOGIN")
-        login_page.click_login()
-        login_page.wait_for_products_page()
-
         products_page = ProductsPage(driver)
         logger.info("  - Adding random product to cart...")
         products_page.add_random_product_to_cart()
@@ -0,0 +1,110 @@
+from pathlib import Path
+
+import pytest
+from appium.options.android import UiAutomator2Options
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import NoSuchElementException
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+
+from pages.cart_page import CartPage
+from utils import http_client
+from utils.fake_appium import FakeAppiumServer, in_process_driver
+from utils.http_client import ResetRetry
+
+PAGE_SOURCES = Path(__file__).parent / "fixtures" / "page_sources"
+
+
+def _options():
+    options = UiAutomator2Options()
+    options.app_package = "com.swaglabsmobileapp"
+    return options
+
+
+@pytest.fixture
+def server():
+    http_client.close_all()
+    with FakeAppiumServer() as fake_server:
+        yield fake_server
+    http_client.close_all()
+
+
+@pytest.mark.unit
+class TestSharedConnectionPool:
+    def test_sessions_share_connections(self, server):
+        before = http_client.connection_stats()
+
+        for _ in range(3):
+            driver = http_client.create_driver(server.url, _options())
+            for _ in range(5):
+                driver.query_app_state("com.swaglabsmobileapp")
+            driver.quit()
+
+        stats = http_client.connection_stats()
+        assert server.stats.connections == 1
+        assert stats["new"] - before["new"] == 1
+        assert stats["reused"] - before["reused"] == 20
+
+    def test_without_keep_alive_every_request_connects(self, server):
+        driver = http_client.create_driver(server.url, _options(), keep_alive=False)
+        for _ in range(5):
+            driver.query_app_state("com.swaglabsmobileapp")
+        driver.quit()
+
+        assert server.stats.connections == 7
+
+    def test_counters_survive_close_all(self, server):
+        driver = http_client.create_driver(server.url, _options())
+        driver.quit()
+        before_close = http_client.connection_stats()
+
+        http_client.close_all()
+
+        assert http_client.connection_stats() == before_close
+
+
+@pytest.mark.unit
+class TestResetRetry:
+    def test_retries_connection_reset_for_post(self):
+        retry = ResetRetry(total=2, read=2, allowed_methods=None)
+
+        retry = retry.increment("POST", "/session/1/element", error=ProtocolError())
+
+        assert retry.read == 1
+
+    def test_never_retries_read_timeout(self):
+        retry = ResetRetry(total=2, read=2, allowed_methods=None)
+
+        with pytest.raises(ReadTimeoutError):
+            retry.increment(
+                "POST",
+                "/session/1/element",
+                error=ReadTimeoutError(None, "/session/1/element", "timed out"),
+            )
+
+
+@pytest.mark.unit
+class TestInProcessConnection:
+    def test_commands_skip_http(self):
+        server = FakeAppiumServer()
+        driver = in_process_driver(server, _options())
+
+        driver.find_elements(AppiumBy.ACCESSIBILITY_ID, "test-Item")
+        with pytest.raises(NoSuchElementException):
+            driver.find_element(AppiumBy.ACCESSIBILITY_ID, "missing")
+        driver.quit()
+
+        assert server.stats.connections == 0
+        assert server.stats.commands["find_elements"] == 1
+        assert driver.command_executor.server_seconds > 0
+
+    def test_remove_click_drops_cart_item(self):
+        server = FakeAppiumServer(page_source=(PAGE_SOURCES / "cart.xml").read_text())
+        driver = in_process_driver(server, _options())
+        page = CartPage(driver)
+
+        name = page.get_first_item_name()
+        page.remove_first_item()
+
+        assert not page.item_exists(name)
+        assert len(page.get_items()) == 1
+        driver.quit()
@@ -0,0 +1,83 @@
+import base64
+import io
+import json
+
+import pytest
+from PIL import Image, ImageDraw
+
+from utils.image_hash import ScreenshotDeduplicator, dhash, resolve
+from utils.screenshot_writer import ScreenshotWriter
+
+
+def _screen(rows, marker=False, compress_level=6):
+    """Render a list screen with a number of rows as PNG bytes."""
+    image = Image.new("RGB", (360, 640), "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, 360, 60), fill="#e2231a")
+    for row in range(rows):
+        top = 80 + row * 110
+        draw.rectangle((20, top, 120, top + 90), fill="#444444")
+        draw.rectangle((140, top + 20, 320, top + 40), fill="#888888")
+    if marker:
+        draw.point((200, 600), fill="black")
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG", compress_level=compress_level)
+    return buffer.getvalue()
+
+
+@pytest.mark.unit
+class TestDhash:
+    def test_ignores_encoding(self):
+        assert (dhash(_screen(3, compress_level=1)) == dhash(_screen(3))).all()
+
+    def test_changes_with_layout(self):
+        changed = (dhash(_screen(3)) != dhash(_screen(2))).mean()
+
+        assert changed > 1 - ScreenshotDeduplicator().threshold
+
+
+@pytest.mark.unit
+class TestScreenshotDeduplicator:
+    def test_near_duplicate_refers_to_kept_screenshot(self, tmp_path):
+        dedup = ScreenshotDeduplicator()
+
+        assert dedup.check(_screen(3), tmp_path / "01.png") is None
+        assert dedup.check(_screen(3, marker=True), tmp_path / "02.png") == (
+            tmp_path / "01.png"
+        )
+        manifest = json.loads((tmp_path / "duplicates.json").read_text())
+        assert manifest["02.png"]["same_as"] == "01.png"
+
+    def test_changed_screen_is_kept(self, tmp_path):
+        dedup = ScreenshotDeduplicator()
+        dedup.check(_screen(3), tmp_path / "01.png")
+
+        assert dedup.check(_screen(2), tmp_path / "02.png") is None
+        assert dedup.check(_screen(2), tmp_path / "03.png") == tmp_path / "02.png"
+
+    def test_directories_are_separate(self, tmp_path):
+        dedup = ScreenshotDeduplicator()
+        dedup.check(_screen(3), tmp_path / "a" / "01.png")
+
+        assert dedup.check(_screen(3), tmp_path / "b" / "01.png") is None
+
+    def test_writer_skips_duplicates(self, tmp_path):
+        writer = ScreenshotWriter(dedup=ScreenshotDeduplicator())
+        for name, rows in (("01", 3), ("02", 3), ("03", 1)):
+            payload = base64.b64encode(_screen(rows)).decode("ascii")
+            writer.submit(payload, tmp_path / f"{name}.png")
+        writer.close()
+
+        assert sorted(p.name for p in tmp_path.glob("*.png")) == ["01.png", "03.png"]
+        assert resolve(tmp_path / "02.png") == tmp_path / "01.png"
+        assert writer.stats["duplicates"] == 1
+        assert writer.stats["bytes_saved"] == len(_screen(3))
+
+    def test_writer_keeps_undecodable_screenshot(self, tmp_path):
+        truncated = _screen(3)[:100]
+        writer = ScreenshotWriter(dedup=ScreenshotDeduplicator())
+        writer.submit(base64.b64encode(truncated).decode("ascii"), tmp_path / "01.png")
+        writer.close()
+
+        assert (tmp_path / "01.png").read_bytes() == truncated
+        assert writer.stats["errors"] == 0
@@ -0,0 +1,73 @@
+from pathlib import Path
+
+import pytest
+from appium.options.android import UiAutomator2Options
+from appium.webdriver.common.appiumby import AppiumBy
+
+from pages.cart_page import CartPage
+from pages.products_page import ProductsPage
+from utils import http_client
+from utils.fake_appium import FakeAppiumServer
+from utils.locator_profiler import (
+    FIND_COSTS,
+    LocatorProfiler,
+    collect_locators,
+    load_sources,
+    propose,
+)
+
+PAGE_SOURCES = Path(__file__).parent / "fixtures" / "page_sources"
+
+
+@pytest.fixture(scope="module")
+def sources():
+    return load_sources([PAGE_SOURCES])
+
+
+@pytest.mark.unit
+class TestLocatorProfiler:
+    def test_collects_page_object_locators(self):
+        locators = collect_locators()
+
+        assert locators[CartPage.FIRST_ITEM] == ["CartPage.FIRST_ITEM"]
+        assert "ProductsPage.PRODUCT_ITEMS" in locators[ProductsPage.PRODUCT_ITEMS]
+        assert all(len(locator) == 2 for locator in locators)
+
+    def test_proposes_equivalent_locators_only(self, sources):
+        first_item, _ = propose(CartPage.FIRST_ITEM, sources)
+        price, _ = propose(ProductsPage.ITEM_PRICE, sources)
+
+        assert (
+            AppiumBy.ANDROID_UIAUTOMATOR,
+            'new UiSelector().description("test-Item").instance(0)',
+        ) in first_item
+        assert (AppiumBy.ACCESSIBILITY_ID, "test-Item") not in first_item
+        # test-Price is a ViewGroup on the cart screen, a TextView on products
+        assert (AppiumBy.ACCESSIBILITY_ID, "test-Price") not in price
+        assert price
+
+    def test_ranks_slow_xpath_first(self, sources):
+        locators = {
+            CartPage.CHECKOUT_BUTTON: ["CartPage.CHECKOUT_BUTTON"],
+            ProductsPage.PRODUCT_ITEMS: ["ProductsPage.PRODUCT_ITEMS"],
+        }
+        profiler = LocatorProfiler(locators, sources, repeat=3)
+        # Wider gaps than FIND_COSTS, so HTTP jitter can't reorder strategies
+        find_costs = {
+            **FIND_COSTS,
+            AppiumBy.ANDROID_UIAUTOMATOR: 0.0002,
+            AppiumBy.ACCESSIBILITY_ID: 0.00002,
+        }
+
+        with FakeAppiumServer(find_costs=find_costs) as server:
+            driver = http_client.create_driver(server.url, UiAutomator2Options())
+            report = profiler.run(
+                driver,
+                screens=lambda xml: server.set_page_source(xml, driver.session_id),
+            )
+            driver.quit()
+
+        assert report[0]["names"] == ["ProductsPage.PRODUCT_ITEMS"]
+        assert report[0]["best"]["strategy"] == AppiumBy.ACCESSIBILITY_ID
+        assert report[0]["saving_ms"] > 0
+        assert report[1]["best"] is None
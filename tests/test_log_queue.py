@@ -0,0 +1,118 @@
+import gzip
+import logging
+import threading
+
+import pytest
+
+from config import settings
+from utils import log_queue
+
+logger = logging.getLogger("tests.log_queue")
+
+
+class _Rendered:
+    """Log argument remembering the thread it was formatted on."""
+
+    def __init__(self):
+        self.threads = []
+
+    def __str__(self):
+        self.threads.append(threading.current_thread().name)
+        return "rendered"
+
+
+@pytest.fixture
+def configure(tmp_path):
+    def configure(**options):
+        log_queue.configure(tmp_path / "main.log", **options)
+        return tmp_path / "main.log"
+
+    yield configure
+    log_queue.end_test()
+    log_queue.configure(
+        settings.RESULTS_DIR / "logs" / "appium.log", use_queue=settings.LOG_QUEUE
+    )
+
+
+@pytest.mark.unit
+class TestLogQueue:
+    def test_formats_on_listener_thread(self, configure):
+        main_log = configure()
+        argument = _Rendered()
+
+        logger.info("value: %s", argument)
+        log_queue.flush()
+
+        assert argument.threads and argument.threads != ["MainThread"]
+        assert "value: rendered" in main_log.read_text()
+
+    def test_routes_records_to_test_file(self, configure, tmp_path):
+        main_log = configure()
+        log_queue.start_test(tmp_path / "first" / "test.log")
+        logger.info("in first")
+        log_queue.start_test(tmp_path / "second" / "test.log")
+        logger.info("in second")
+        log_queue.end_test()
+        logger.info("between tests")
+        log_queue.flush()
+
+        assert "in first" in (tmp_path / "first" / "test.log").read_text()
+        second = (tmp_path / "second" / "test.log").read_text()
+        assert "in second" in second
+        assert "between tests" not in second
+        assert "between tests" in main_log.read_text()
+
+    def test_rotated_files_are_compressed(self, configure, monkeypatch):
+        monkeypatch.setattr(settings, "LOG_MAX_BYTES", 500)
+        main_log = configure()
+
+        for i in range(20):
+            logger.info("line %d %s", i, "x" * 40)
+        log_queue.flush()
+
+        rotated = main_log.with_name("main.log.1.gz")
+        assert b"line" in gzip.decompress(rotated.read_bytes())
+
+    def test_synchronous_mode(self, configure, tmp_path):
+        main_log = configure(use_queue=False)
+        log_queue.start_test(tmp_path / "test.log")
+
+        logger.info("written at once")
+
+        assert "written at once" in main_log.read_text()
+        assert "written at once" in (tmp_path / "test.log").read_text()
+
+    def test_routed_work_logs_to_submitting_test(self, configure, tmp_path):
+        configure()
+        log_queue.start_test(tmp_path / "first" / "test.log")
+        test_log = log_queue.current_test()
+        log_queue.start_test(tmp_path / "second" / "test.log")
+
+        def work():
+            with log_queue.routed_to(test_log):
+                logger.info("queued in first")
+
+        worker = threading.Thread(target=work)
+        worker.start()
+        worker.join()
+        log_queue.flush()
+
+        assert "queued in first" in (tmp_path / "first" / "test.log").read_text()
+        assert not (tmp_path / "second" / "test.log").exists()
+
+    def test_unrouted_thread_stays_out_of_test_files(self, configure, tmp_path):
+        main_log = configure()
+        log_queue.start_test(tmp_path / "test.log")
+
+        def prewarm():
+            log_queue.route_thread(None)
+            logger.info("warming a session")
+
+        worker = threading.Thread(target=prewarm)
+        worker.start()
+        worker.join()
+        logger.info("in test")
+        log_queue.flush()
+
+        assert "warming a session" not in (tmp_path / "test.log").read_text()
+        assert "warming a session" in main_log.read_text()
@@ -0,0 +1,121 @@
+import pytest
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import NoSuchElementException
+
+from pages.login_page import LoginPage
+from utils.product_catalog import ProductCatalog
+
+STANDARD_USER = (AppiumBy.ANDROID_UIAUTOMATOR, 'new UiSelector().text("standard_user")')
+LOGIN_SOURCE = """<hierarchy class="hierarchy" width="1080" height="2220">
+  <android.widget.EditText class="android.widget.EditText" text=""
+    content-desc="test-Username" bounds="[40,500][1040,620]" displayed="true" />
+  <android.view.ViewGroup class="android.view.ViewGroup" text=""
+    content-desc="test-LOGIN" bounds="[40,900][1040,1020]" displayed="true" />
+  <android.widget.TextView class="android.widget.TextView" text="standard_user"
+    content-desc="" bounds="[40,1600][1040,1680]" displayed="true" />
+</hierarchy>"""
+
+
+class _Element:
+    def __init__(self, driver, locator):
+        self.driver = driver
+        self.locator = locator
+        self.text = "standard_user"
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        self.driver.clicks.append(self.locator)
+        if self.locator == LoginPage.LOGIN_BUTTON:
+            self.driver.screen = "products"
+
+
+class StubDriver:
+    """Minimal driver answering locators according to the current screen."""
+
+    SCREENS = {
+        "login": [LoginPage.LOGIN_BUTTON, LoginPage.USERNAME_INPUT, STANDARD_USER],
+        "products": [LoginPage.PRODUCTS_TITLE],
+        "products_with_cart": [LoginPage.PRODUCTS_TITLE, LoginPage.CART_BADGE],
+        "cart": [],
+    }
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.clicks = []
+        self.app_events = []
+        self.capabilities = {"appPackage": "com.swaglabsmobileapp"}
+
+    def _visible(self, locator):
+        if locator[0] == "-android uiautomator" and "scrollIntoView" in locator[1]:
+            return self.screen == "login"
+        return tuple(locator) in self.SCREENS[self.screen]
+
+    @property
+    def page_source(self):
+        if self.screen == "login":
+            return LOGIN_SOURCE
+        return '<hierarchy class="hierarchy" width="1080" height="2220" />'
+
+    def find_elements(self, by, value):
+        return [_Element(self, (by, value))] if self._visible((by, value)) else []
+
+    def find_element(self, by, value):
+        if not self._visible((by, value)):
+            raise NoSuchElementException(value)
+        return _Element(self, (by, value))
+
+    def get_window_size(self):
+        return {"width": 1080, "height": 2220}
+
+    def swipe(self, **kwargs):
+        self.app_events.append("swipe")
+
+    def terminate_app(self, app_id):
+        self.app_events.append("terminate")
+
+    def activate_app(self, app_id):
+        self.app_events.append("activate")
+        self.screen = "login"
+
+
+@pytest.mark.unit
+class TestEnsureLoggedIn:
+    def test_skips_login_on_products_page(self):
+        driver = StubDriver("products")
+
+        assert LoginPage(driver).ensure_logged_in() is False
+        assert driver.clicks == []
+        assert driver.app_events == ["swipe"]  # back to the top
+
+    def test_relaunches_when_list_sorted(self):
+        driver = StubDriver("products")
+        ProductCatalog.sort_changed(driver, "Price (low to high)")
+
+        assert LoginPage(driver).ensure_logged_in() is True
+        assert driver.app_events == ["terminate", "activate"]
+        assert ProductCatalog.current_sort(driver) is None
+
+    def test_logs_in_from_login_page(self):
+        driver = StubDriver("login")
+
+        assert LoginPage(driver).ensure_logged_in() is True
+        assert driver.screen == "products"
+        assert driver.app_events == []
+
+    def test_relaunches_when_cart_not_empty(self):
+        driver = StubDriver("products_with_cart")
+
+        assert LoginPage(driver).ensure_logged_in() is True
+        assert driver.app_events == ["terminate", "activate"]
+        assert driver.screen == "products"
+
+    def test_relaunches_from_other_screen(self):
+        driver = StubDriver("cart")
+
+        assert LoginPage(driver).ensure_logged_in() is True
+        assert driver.app_events == ["terminate", "activate"]
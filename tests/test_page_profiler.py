@@ -0,0 +1,85 @@
+import pytest
+from appium.options.android import UiAutomator2Options
+
+from pages.base_page import BasePage
+from pages.products_page import ProductsPage
+from utils import http_client, page_profiler
+from utils.fake_appium import FakeAppiumServer
+
+
+class ProfiledPage(BasePage):
+    def read_title(self):
+        return self.driver.page_source[:10]
+
+    def read_twice(self):
+        return [self.read_title(), self.read_title()]
+
+    def read_length(self):
+        return len(self.driver.page_source)
+
+    def items(self):
+        yield from range(3)
+
+
+def _options():
+    options = UiAutomator2Options()
+    options.app_package = "com.swaglabsmobileapp"
+    return options
+
+
+@pytest.fixture
+def driver():
+    with FakeAppiumServer() as server:
+        driver = http_client.create_driver(server.url, _options())
+        yield driver
+        driver.quit()
+
+
+@pytest.fixture
+def profiling():
+    # Rows of these fake pages must not end up in the run's summary
+    was_enabled = page_profiler.is_enabled()
+    page_profiler.reset()
+    page_profiler.enable()
+    yield
+    if not was_enabled:
+        page_profiler.disable()
+    page_profiler.reset()
+
+
+def _row(method):
+    return next(row for row in page_profiler.report() if row["method"] == method)
+
+
+@pytest.mark.unit
+class TestPageProfiler:
+    def test_counts_calls_and_driver_commands(self, driver, profiling):
+        ProfiledPage(driver).read_twice()
+
+        assert _row("ProfiledPage.read_title")["calls"] == 2
+        assert _row("ProfiledPage.read_title")["driver_calls_per_call"] == 1
+        assert _row("ProfiledPage.read_twice")["driver_calls_per_call"] == 2
+
+    def test_inherited_page_methods_are_profiled(self, driver, profiling):
+        ProductsPage(driver).get_all_products()
+
+        assert _row("ProductsPage.get_all_products")["driver_calls"] > 0
+        assert _row("BasePage.snapshot")["calls"] > 0
+
+    def test_report_sorted_by_total_time(self, driver, profiling):
+        ProductsPage(driver).get_all_products()
+        totals = [row["total_s"] for row in page_profiler.report()]
+
+        assert totals == sorted(totals, reverse=True)
+
+    def test_generators_are_not_wrapped(self):
+        assert not hasattr(ProfiledPage.items, "__wrapped__")
+
+    def test_disabled_records_nothing(self, driver):
+        if page_profiler.is_enabled():
+            pytest.skip("profiling enabled for the whole run")
+        ProfiledPage(driver).read_length()
+
+        assert all(
+            r["method"] != "ProfiledPage.read_length" for r in page_profiler.report()
+        )
@@ -0,0 +1,154 @@
+from pathlib import Path
+
+import pytest
+from appium.options.android import UiAutomator2Options
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import InvalidSelectorException, NoSuchElementException
+
+from pages.cart_page import CartPage
+from pages.products_page import ProductsPage
+from utils import http_client
+from utils.fake_appium import PRODUCTS, FakeAppiumServer, products_screen
+from utils.page_source import PageSnapshot, ui_selector_to_xpath
+
+PAGE_SOURCES = Path(__file__).parent / "fixtures" / "page_sources"
+
+
+def _source(name):
+    return (PAGE_SOURCES / f"{name}.xml").read_text()
+
+
+def _options():
+    options = UiAutomator2Options()
+    options.app_package = "com.swaglabsmobileapp"
+    return options
+
+
+@pytest.fixture
+def products_top():
+    return PageSnapshot.from_file(PAGE_SOURCES / "products_top.xml")
+
+
+@pytest.mark.unit
+class TestPageSnapshot:
+    def test_xpath_and_child_lookups(self, products_top):
+        items = products_top.find_elements(*ProductsPage.PRODUCT_ITEMS)
+
+        names = [item.find_element(*ProductsPage.ITEM_TITLE).text for item in items]
+
+        assert names == [name for name, _ in PRODUCTS[:4]]
+
+    def test_accessibility_id_and_attributes(self, products_top):
+        cart = products_top.find_element(AppiumBy.ACCESSIBILITY_ID, "test-Cart")
+
+        assert cart.get_attribute("contentDescription") == "test-Cart"
+        assert cart.get_attribute("clickable") == "true"
+        assert cart.rect == {"x": 880, "y": 100, "width": 200, "height": 160}
+
+    def test_ui_selector(self, products_top):
+        title = products_top.find_element(*ProductsPage.PRODUCTS_TITLE)
+        target = products_top.find_element(
+            AppiumBy.ANDROID_UIAUTOMATOR,
+            "new UiScrollable(new UiSelector().scrollable(true))"
+            '.scrollIntoView(new UiSelector().description("test-Price"))',
+        )
+
+        assert title.text == "PRODUCTS"
+        assert target.text == "$29.99"
+
+    def test_ui_selector_quotes(self):
+        xpath = ui_selector_to_xpath('new UiSelector().textContains("it\'s")')
+
+        assert xpath == './/*[contains(@text, "it\'s")]'
+
+    @pytest.mark.parametrize("method", ["index(2)", "clickable(true)", "enabled(true)"])
+    def test_unsupported_ui_selector_method_raises(self, method):
+        with pytest.raises(InvalidSelectorException, match=method.split("(")[0]):
+            ui_selector_to_xpath(f'new UiSelector().text("ADD TO CART").{method}')
+
+    def test_missing_element_raises(self, products_top):
+        with pytest.raises(NoSuchElementException):
+            products_top.find_element(AppiumBy.ACCESSIBILITY_ID, "test-CHECKOUT")
+
+
+@pytest.mark.unit
+class TestSnapshotMode:
+    def test_product_list_read_with_one_request_per_screen(self):
+        screens = [_source("products_top"), _source("products_bottom")]
+        with FakeAppiumServer(page_source=screens) as server:
+            driver = http_client.create_driver(server.url, _options())
+
+            products = ProductsPage(driver).get_all_products()
+            driver.quit()
+
+        assert products == [{"name": n, "price": p} for n, p in PRODUCTS]
+        commands = server.stats.commands
+        assert commands["page_source"] == 4  # top check, then one per screen
+        assert commands["find_child_element"] == 0
+        assert commands["element_text"] == 0
+
+    def test_actions_invalidate_snapshot(self):
+        with FakeAppiumServer(page_source=_source("cart")) as server:
+            driver = http_client.create_driver(server.url, _options())
+            page = CartPage(driver)
+
+            first = page.snapshot()
+            assert page.snapshot() is first
+            assert page.get_first_item_name() == "Sauce Labs Backpack"
+            page.click_checkout()
+            assert page.snapshot() is not first
+            driver.quit()
+
+        assert server.stats.commands["page_source"] == 2
+
+
+@pytest.mark.unit
+class TestBatchedReads:
+    @pytest.mark.parametrize("count", [3, 30])
+    def test_call_count_independent_of_list_length(self, count):
+        products = [(f"Product {i}", f"${i}.99") for i in range(count)]
+        with FakeAppiumServer(page_source=products_screen(products)) as server:
+            driver = http_client.create_driver(server.url, _options())
+            page = ProductsPage(driver)
+
+            records = page.read_records(
+                page.PRODUCT_ITEMS,
+                {"name": page.ITEM_TITLE, "price": page.ITEM_PRICE, "bounds": "bounds"},
+            )
+            driver.quit()
+
+        assert [(r["name"], r["price"]) for r in records] == products
+        assert records[1]["bounds"] == {"x": 0, "y": 820, "width": 1080, "height": 420}
+        commands = server.stats.commands
+        assert commands["page_source"] == 1
+        assert commands["find_elements"] == 0
+        assert commands["element_text"] == 0
+
+    def test_cart_rows(self):
+        with FakeAppiumServer(page_source=_source("cart")) as server:
+            driver = http_client.create_driver(server.url, _options())
+            page = CartPage(driver)
+
+            items = page.get_items()
+            first_name = page.get_first_item_name()
+            descriptions = page.read_records(page.CART_ITEMS, {"desc": "content-desc"})
+            driver.quit()
+
+        assert items == [
+            {"name": "Sauce Labs Backpack", "price": "$29.99"},
+            {"name": "Sauce Labs Bike Light", "price": "$9.99"},
+        ]
+        assert first_name == "Sauce Labs Backpack"
+        assert descriptions == [{"desc": "test-Item"}, {"desc": "test-Item"}]
+        assert server.stats.commands["page_source"] == 1
+
+    def test_item_exists_matches_exact_text(self):
+        with FakeAppiumServer(page_source=_source("cart")) as server:
+            driver = http_client.create_driver(server.url, _options())
+            page = CartPage(driver)
+
+            assert page.item_exists("Sauce Labs Bike Light")
+            assert not page.item_exists("Sauce Labs Onesie")
+            driver.quit()
+
+        assert server.stats.commands["page_source"] == 2
@@ -0,0 +1,114 @@
+import pytest
+from appium.options.android import UiAutomator2Options
+
+from pages.products_page import ProductsPage
+from utils import http_client
+from utils.fake_appium import PRODUCTS, FakeAppiumServer, products_screen
+from utils.product_catalog import ProductCatalog
+
+FILTER_SCREEN = """<hierarchy class="hierarchy" width="1080" height="2220">
+  <android.widget.TextView class="android.widget.TextView"
+    text="Price (low to high)" content-desc="" bounds="[40,900][1040,1000]"
+    displayed="true" />
+</hierarchy>"""
+
+
+def _options():
+    options = UiAutomator2Options()
+    options.app_package = "com.swaglabsmobileapp"
+    return options
+
+
+@pytest.fixture
+def server():
+    screens = [products_screen(PRODUCTS[:4]), products_screen(PRODUCTS[2:])]
+    with FakeAppiumServer(page_source=screens) as fake_server:
+        yield fake_server
+
+
+@pytest.fixture
+def driver(server):
+    driver = http_client.create_driver(server.url, _options())
+    yield driver
+    driver.quit()
+
+
+@pytest.mark.unit
+class TestProductCatalog:
+    def test_built_once_per_session(self, server, driver):
+        first = ProductsPage(driver).get_all_products()
+        commands = dict(server.stats.commands)
+
+        second = ProductsPage(driver).get_all_products()
+
+        assert first == second == [{"name": n, "price": p} for n, p in PRODUCTS]
+        assert dict(server.stats.commands) == commands
+        catalog = ProductCatalog.for_driver(driver)
+        assert catalog.get(PRODUCTS[5][0]) == {
+            "name": PRODUCTS[5][0],
+            "price": PRODUCTS[5][1],
+            "screen": 1,
+        }
+
+    def test_unknown_product_fails_without_scrolling(self, server, driver):
+        page = ProductsPage(driver)
+        page.catalog()
+        commands = dict(server.stats.commands)
+
+        with pytest.raises(Exception, match="not in the product list"):
+            page.add_product_to_cart_by_name("Sauce Labs Jumpsuit")
+        assert dict(server.stats.commands) == commands
+
+    def test_visible_product_added_without_scrolling(self, server, driver):
+        page = ProductsPage(driver)
+        name, price = PRODUCTS[4]
+        page.catalog()
+
+        assert page.add_product_to_cart_by_name(name) == {"name": name, "price": price}
+        events = server.sessions[driver.session_id].app_events
+        assert events[-1] == ("click", "ADD TO CART")
+        assert server.stats.commands["find_element"] == 1
+
+    def test_product_off_screen_reached_from_catalog(self, server, driver):
+        page = ProductsPage(driver)
+        page.catalog()  # leaves the list at its end
+        name, price = PRODUCTS[0]
+        server.set_page_source(
+            [products_screen(PRODUCTS[:4]), products_screen(PRODUCTS[2:])],
+            driver.session_id,
+        )
+        server.sessions[driver.session_id].scroll(1)
+        scrolls = server.stats.commands["perform_actions"]
+
+        assert page.add_product_to_cart_by_name(name) == {"name": name, "price": price}
+        assert server.stats.commands["find_element"] == 1  # the click, no UiScrollable
+        assert server.stats.commands["perform_actions"] - scrolls == 2  # up, at top
+
+    def test_screens_counted_from_top(self, server, driver):
+        server.sessions[driver.session_id].scroll(1)
+
+        catalog = ProductsPage(driver).catalog()
+
+        assert catalog.get(PRODUCTS[0][0])["screen"] == 0
+
+    def test_random_product_drawn_from_catalog(self, driver):
+        page = ProductsPage(driver)
+        ProductCatalog([{"name": "Sauce Labs Onesie", "price": "$7.99"}]).attach(driver)
+
+        assert {page.get_random_product() for _ in range(10)} == {"onesie"}
+
+    def test_sort_change_rebuilds_order(self, server, driver):
+        page = ProductsPage(driver)
+        page.catalog()
+        by_price = sorted(PRODUCTS, key=lambda p: float(p[1][1:]))
+
+        server.set_page_source(FILTER_SCREEN, driver.session_id)
+        page.select_filter("Price (low to high)")
+        server.set_page_source(
+            [products_screen(by_price[:4]), products_screen(by_price[2:])],
+            driver.session_id,
+        )
+
+        assert not ProductCatalog.for_driver(driver).is_ordered_for(driver)
+        assert page.get_all_products() == [{"name": n, "price": p} for n, p in by_price]
+        assert ProductCatalog.for_driver(driver).sort_order == "Price (low to high)"
@@ -0,0 +1,112 @@
+import json
+
+import pytest
+
+from config.devices import Device, load_devices
+from utils.fake_appium import FakeAppiumServer
+from utils.scheduler import DeviceScheduler, junit_key, partition
+
+WORKER_TESTS = """
+import os
+import time
+
+import pytest
+from appium import webdriver
+from appium.options.android import UiAutomator2Options
+
+
+@pytest.mark.parametrize("index", range(6))
+def test_device_work(index):
+    options = UiAutomator2Options()
+    options.udid = os.environ["UDID"]
+    driver = webdriver.Remote(os.environ["APPIUM_SERVER"], options=options)
+    time.sleep(0.1)
+    driver.quit()
+"""
+
+
+@pytest.mark.unit
+class TestDeviceRegistry:
+    def test_loads_devices_from_file(self, tmp_path):
+        registry = tmp_path / "devices.json"
+        registry.write_text(
+            json.dumps(
+                [
+                    {
+                        "udid": "a",
+                        "appium_server": "http://h:4723",
+                        "system_port": 8200,
+                    },
+                    {
+                        "udid": "b",
+                        "appium_server": "http://h:4724",
+                        "system_port": 8201,
+                    },
+                ]
+            )
+        )
+
+        devices = load_devices(registry)
+
+        assert [d.name for d in devices] == ["a", "b"]
+        assert devices[1].env()["SYSTEM_PORT"] == "8201"
+
+    def test_rejects_shared_system_port_on_same_host(self, tmp_path):
+        registry = tmp_path / "devices.json"
+        registry.write_text(
+            json.dumps(
+                [
+                    {
+                        "udid": "a",
+                        "appium_server": "http://h:4723",
+                        "system_port": 8200,
+                    },
+                    {
+                        "udid": "b",
+                        "appium_server": "http://h:4724",
+                        "system_port": 8200,
+                    },
+                ]
+            )
+        )
+
+        with pytest.raises(ValueError, match="systemPort"):
+            load_devices(registry)
+
+
+@pytest.mark.unit
+class TestDeviceScheduler:
+    def test_partition_balances_known_durations(self):
+        nodeids = [f"tests/test_a.py::test_{i}" for i in range(4)]
+        durations = {
+            junit_key(nodeid): seconds
+            for nodeid, seconds in zip(nodeids, [8.0, 5.0, 4.0, 1.0])
+        }
+
+        shards = partition(nodeids, 2, durations)
+
+        assert shards == [[nodeids[0], nodeids[3]], [nodeids[1], nodeids[2]]]
+
+    def test_runs_shards_in_parallel_on_each_device(self, tmp_path):
+        (tmp_path / "test_worker.py").write_text(WORKER_TESTS)
+        servers = [FakeAppiumServer().start() for _ in range(2)]
+        try:
+            devices = [
+                Device(f"device-{i}", server.url, 8200 + i)
+                for i, server in enumerate(servers)
+            ]
+            scheduler = DeviceScheduler(devices, tmp_path / "results", cwd=tmp_path)
+
+            summary = scheduler.run([str(tmp_path)])
+        finally:
+            for server in servers:
+                server.stop()
+
+        assert {name: r["returncode"] for name, r in summary.items()} == {
+            "device-0": 0,
+            "device-1": 0,
+        }
+        assert [server.stats.session_creates for server in servers] == [3, 3]
+        for device in devices:
+            assert (scheduler.device_dir(device) / "junit.xml").exists()
+        assert len(json.loads(scheduler.durations_file.read_text())) == 6
@@ -0,0 +1,77 @@
+import pytest
+from appium.options.android import UiAutomator2Options
+
+from config import settings
+from utils import http_client, screenshot_buffer, screenshot_writer
+from utils.fake_appium import SCREENSHOT_PNG, FakeAppiumServer
+from utils.helpers import take_screenshot
+from utils.screenshot_buffer import ScreenshotBuffer
+
+
+def _options():
+    options = UiAutomator2Options()
+    options.app_package = "com.swaglabsmobileapp"
+    return options
+
+
+@pytest.fixture
+def driver(monkeypatch):
+    monkeypatch.setattr(settings, "SCREENSHOT_MODE", "on_failure")
+    with FakeAppiumServer() as server:
+        driver = http_client.create_driver(server.url, _options())
+        yield driver
+        driver.quit()
+    screenshot_buffer.finish_test(False)
+    screenshot_writer.shutdown()
+
+
+@pytest.mark.unit
+class TestScreenshotBuffer:
+    def test_drops_oldest_over_count(self):
+        buffer = ScreenshotBuffer(max_count=2)
+        for name in ("a", "b", "c"):
+            buffer.add("x" * 10, name)
+
+        assert [path for _, path in buffer.drain()] == ["b", "c"]
+        assert buffer.evicted == 1
+
+    def test_drops_oldest_over_bytes(self):
+        buffer = ScreenshotBuffer(max_bytes=25)
+        for name in ("a", "b", "c"):
+            buffer.add("x" * 10, name)
+
+        assert len(buffer) == 2
+        assert buffer.size == 20
+
+    def test_keeps_newest_even_if_too_large(self):
+        buffer = ScreenshotBuffer(max_bytes=5)
+        buffer.add("x" * 10, "a")
+
+        assert len(buffer) == 1
+
+
+@pytest.mark.unit
+class TestOnFailureMode:
+    def test_passed_test_writes_nothing(self, driver, tmp_path):
+        take_screenshot(driver, tmp_path, "01_step")
+        take_screenshot(driver, tmp_path, "02_step")
+
+        assert screenshot_buffer.finish_test(False) == 0
+        screenshot_writer.flush()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_failed_test_writes_buffer(self, driver, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "SCREENSHOT_DEDUP", False)
+        take_screenshot(driver, tmp_path, "01_step")
+        take_screenshot(driver, tmp_path, "02_step")
+
+        assert screenshot_buffer.finish_test(True) == 2
+        screenshot_writer.flush()
+        assert (tmp_path / "02_step.png").read_bytes() == SCREENSHOT_PNG
+
+    def test_kept_screenshot_is_written_at_once(self, driver, tmp_path):
+        take_screenshot(driver, tmp_path, "99_failure", keep=True)
+        screenshot_writer.flush()
+
+        assert (tmp_path / "99_failure.png").exists()
+        assert len(screenshot_buffer.get_buffer()) == 0
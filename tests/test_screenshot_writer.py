@@ -0,0 +1,110 @@
+import base64
+import threading
+import time
+
+import pytest
+from appium.options.android import UiAutomator2Options
+
+from config import settings
+from utils import http_client, screenshot_writer
+from utils.fake_appium import SCREENSHOT_PNG, FakeAppiumServer
+from utils.helpers import take_screenshot
+from utils.screenshot_writer import ScreenshotWriter
+
+PAYLOAD = base64.b64encode(SCREENSHOT_PNG).decode("ascii")
+
+
+def _options():
+    options = UiAutomator2Options()
+    options.app_package = "com.swaglabsmobileapp"
+    return options
+
+
+@pytest.fixture
+def driver():
+    with FakeAppiumServer() as server:
+        driver = http_client.create_driver(server.url, _options())
+        yield driver
+        driver.quit()
+    screenshot_writer.shutdown()
+
+
+@pytest.mark.unit
+class TestScreenshotWriter:
+    def test_writes_decoded_payload(self, tmp_path):
+        writer = ScreenshotWriter()
+        writer.submit(PAYLOAD, tmp_path / "shot.png")
+        writer.flush()
+        writer.close()
+
+        assert (tmp_path / "shot.png").read_bytes() == SCREENSHOT_PNG
+        assert writer.stats["written"] == 1
+
+    def test_transform_runs_on_worker(self, tmp_path):
+        threads = []
+
+        def transform(png):
+            threads.append(threading.current_thread())
+            return png[::-1]
+
+        writer = ScreenshotWriter(transform=transform)
+        writer.submit(PAYLOAD, tmp_path / "shot.png")
+        writer.close()
+
+        assert (tmp_path / "shot.png").read_bytes() == SCREENSHOT_PNG[::-1]
+        assert threads and threads[0] is not threading.current_thread()
+
+    def test_full_queue_blocks_submit(self, tmp_path):
+        release = threading.Event()
+        writer = ScreenshotWriter(
+            max_queue=1, transform=lambda png: release.wait() and png
+        )
+        writer.submit(PAYLOAD, tmp_path / "1.png")  # taken by the worker
+        writer.submit(PAYLOAD, tmp_path / "2.png")  # fills the queue
+
+        threading.Timer(0.1, release.set).start()
+        started = time.perf_counter()
+        writer.submit(PAYLOAD, tmp_path / "3.png")
+        blocked = time.perf_counter() - started
+        writer.close()
+
+        assert blocked >= 0.05
+        assert writer.stats["blocked_seconds"] >= 0.05
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["1.png", "2.png", "3.png"]
+
+    def test_write_errors_are_counted(self, tmp_path):
+        writer = ScreenshotWriter()
+        writer.submit(PAYLOAD, tmp_path / "missing" / "shot.png")
+        writer.submit(PAYLOAD, tmp_path / "shot.png")
+        writer.close()
+
+        assert writer.stats["errors"] == 1
+        assert writer.stats["written"] == 1
+
+
+@pytest.mark.unit
+class TestTakeScreenshot:
+    def test_file_is_complete_after_flush(self, driver, tmp_path):
+        written = screenshot_writer.screenshot_stats()["written"]
+        path = take_screenshot(driver, tmp_path, "state")
+        screenshot_writer.flush()
+
+        assert path == str(tmp_path / "state.png")
+        assert (tmp_path / "state.png").read_bytes() == SCREENSHOT_PNG
+        assert screenshot_writer.screenshot_stats()["written"] == written + 1
+
+    def test_stats_survive_shutdown(self, driver, tmp_path):
+        written = screenshot_writer.screenshot_stats()["written"]
+        take_screenshot(driver, tmp_path, "state")
+        screenshot_writer.shutdown()
+
+        assert screenshot_writer.screenshot_stats()["written"] == written + 1
+
+    def test_synchronous_fallback(self, driver, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "SCREENSHOT_ASYNC", False)
+        written = screenshot_writer.screenshot_stats()["written"]
+
+        take_screenshot(driver, tmp_path, "state")
+
+        assert (tmp_path / "state.png").read_bytes() == SCREENSHOT_PNG
+        assert screenshot_writer.screenshot_stats()["written"] == written
@@ -0,0 +1,196 @@
+from pathlib import Path
+
+import pytest
+from appium.options.android import UiAutomator2Options
+from lxml import etree
+
+from pages.login_page import LoginPage
+from pages.products_page import ProductsPage
+from utils import http_client, scrolling
+from utils.fake_appium import (
+    LOGIN_ROWS,
+    PRODUCTS,
+    FakeAppiumServer,
+    list_screens,
+    products_screen,
+)
+from utils.page_source import PageSnapshot
+
+PAGE_SOURCES = Path(__file__).parent / "fixtures" / "page_sources"
+
+
+def _options():
+    options = UiAutomator2Options()
+    options.app_package = "com.swaglabsmobileapp"
+    return options
+
+
+def _screens():
+    return [
+        (PAGE_SOURCES / f"{name}.xml").read_text()
+        for name in ("products_top", "products_bottom")
+    ]
+
+
+def _without_buttons(page_source):
+    root = etree.fromstring(page_source.encode("utf-8"))
+    for node in root.xpath('//*[@content-desc="test-ADD TO CART"]'):
+        node.getparent().remove(node)
+    return etree.tostring(root, encoding="unicode")
+
+
+@pytest.mark.unit
+class TestScrollGeometry:
+    def test_swipe_from_scrollable_container(self):
+        snapshot = PageSnapshot.from_file(PAGE_SOURCES / "products_top.xml")
+
+        area = scrolling.scroll_area(snapshot)
+
+        assert area == (0, 420, 1080, 2220)
+        assert scrolling.swipe_vector(area, 0.7) == (540, 2040, 540, 780)
+
+    def test_swipe_scales_with_screen_size(self):
+        small = PageSnapshot(products_screen(width=720, height=1280))
+
+        start_x, start_y, _, end_y = scrolling.swipe_vector(
+            scrolling.scroll_area(small), 0.7
+        )
+
+        assert (start_x, start_y, end_y) == (360, 1192, 576)
+
+    def test_window_size_without_scrollable_node(self):
+        snapshot = PageSnapshot(
+            '<hierarchy class="hierarchy" width="1080" height="2220" />'
+        )
+
+        assert scrolling.scroll_area(snapshot) == (0, 0, 1080, 2220)
+        assert scrolling.swipe_vector((0, 0, 1080, 2220), 0.95)[3] == 222
+
+    def test_fingerprint_tracks_list_content(self):
+        top, bottom = (PageSnapshot(source) for source in _screens())
+
+        assert scrolling.fingerprint(top) == scrolling.fingerprint(
+            PageSnapshot(_screens()[0])
+        )
+        assert scrolling.fingerprint(top) != scrolling.fingerprint(bottom)
+
+
+@pytest.mark.unit
+class TestScrollList:
+    def test_stops_at_end_of_list(self):
+        stats_before = scrolling.scroll_stats()
+        with FakeAppiumServer(page_source=_screens()) as server:
+            driver = http_client.create_driver(server.url, _options())
+
+            products = ProductsPage(driver).get_all_products()
+            events = server.sessions[driver.session_id].app_events
+            driver.quit()
+
+        assert products == [{"name": n, "price": p} for n, p in PRODUCTS]
+        assert events.count(("actions", 1)) == 3  # up to the top, then down twice
+        stats = scrolling.scroll_stats()
+        assert stats["traversals"] == stats_before["traversals"] + 1
+        assert stats["ends_reached"] == stats_before["ends_reached"] + 1
+
+    def test_max_swipes_limits_traversal(self):
+        screens = [products_screen([product]) for product in PRODUCTS]
+        with FakeAppiumServer(page_source=screens) as server:
+            driver = http_client.create_driver(server.url, _options())
+
+            visited = list(ProductsPage(driver).scroll_list(max_swipes=2))
+            driver.quit()
+
+        assert len(visited) == 3
+        assert scrolling.scroll_stats()["max_swipes"] >= 2
+
+    def test_add_product_scrolls_until_button_is_visible(self):
+        name, price = PRODUCTS[4]
+        screens = [
+            _without_buttons(products_screen(PRODUCTS[3:5])),
+            products_screen(PRODUCTS[4:]),
+        ]
+        with FakeAppiumServer(page_source=screens) as server:
+            driver = http_client.create_driver(server.url, _options())
+
+            product = ProductsPage(driver).add_product_to_cart_by_name(name)
+            events = server.sessions[driver.session_id].app_events
+            driver.quit()
+
+        assert product == {"name": name, "price": price}
+        assert events == [("actions", 1), ("click", "ADD TO CART")]
+
+
+@pytest.fixture
+def login_server():
+    with FakeAppiumServer(page_source=list_screens(LOGIN_ROWS, 3)) as server:
+        yield server
+
+
+@pytest.fixture
+def login_driver(login_server):
+    driver = http_client.create_driver(login_server.url, _options())
+    yield driver
+    driver.quit()
+
+
+def _swipes(server, driver):
+    events = server.sessions[driver.session_id].app_events
+    return sum(1 for event in events if event[0] in ("actions", "scroll"))
+
+
+@pytest.mark.unit
+class TestScrollSearch:
+    def test_locates_targets_in_one_traversal(self, login_server, login_driver):
+        search = LoginPage(login_driver).scroll_search(
+            texts=["standard_user"], accessibility_ids=["test-LOGIN"]
+        )
+
+        assert search.positions["test-LOGIN"]["screen"] == 0
+        assert search.positions["standard_user"]["screen"] == 1
+        assert search.missing == []
+        assert search.screen == 1
+        assert _swipes(login_server, login_driver) == 1
+
+    def test_returns_to_target_with_relative_swipes(self, login_server, login_driver):
+        page = LoginPage(login_driver)
+        search = page.scroll_search(
+            texts=["standard_user"], accessibility_ids=["test-Username"]
+        )
+
+        element = page.scroll_to_target(search, "test-Username")
+
+        assert element.get_attribute("content-desc") == "test-Username"
+        assert login_server.sessions[login_driver.session_id].screen_index == 0
+        assert _swipes(login_server, login_driver) == 2
+
+    def test_missing_target_falls_back_to_ui_scrollable(
+        self, login_server, login_driver
+    ):
+        page = LoginPage(login_driver)
+        search = page.scroll_search(texts=["secret_sauce"], max_swipes=1)
+        assert search.missing == ["secret_sauce"]
+
+        assert page.scroll_to_target(search, "secret_sauce").text == "secret_sauce"
+        events = login_server.sessions[login_driver.session_id].app_events
+        assert ("scroll", 1) in events
+        assert search.screen is None
+
+    def test_login_flow_needs_fewer_swipes(self, login_server, login_driver):
+        page = LoginPage(login_driver)
+        page.scroll_to_standard_user()
+        page.select_standard_user()
+        page.scroll_to_accessibility_id("test-LOGIN")
+        per_target = _swipes(login_server, login_driver)
+
+        login_server.set_page_source(
+            list_screens(LOGIN_ROWS, 3), login_driver.session_id
+        )
+        before = _swipes(login_server, login_driver)
+        page = LoginPage(login_driver)
+        search = page.scroll_search(
+            texts=["standard_user"], accessibility_ids=["test-LOGIN"]
+        )
+        page.select_standard_user(search)
+        page.scroll_to_target(search, "test-LOGIN")
+
+        assert _swipes(login_server, login_driver) - before < per_target
@@ -0,0 +1,76 @@
+import time
+
+import pytest
+from appium import webdriver
+from appium.options.android import UiAutomator2Options
+
+from utils.fake_appium import FakeAppiumServer
+from utils.session_factory import PrewarmedSessionFactory
+
+SESSION_STARTUP = 0.4
+
+
+def _options():
+    options = UiAutomator2Options()
+    options.udid = "emulator-5554"
+    options.app_package = "com.swaglabsmobileapp"
+    return options
+
+
+@pytest.fixture
+def server():
+    with FakeAppiumServer(latencies={"new_session": SESSION_STARTUP}) as fake_server:
+        yield fake_server
+
+
+@pytest.mark.unit
+class TestPrewarmedSessionFactory:
+    def _timed_get(self, factory):
+        started = time.perf_counter()
+        driver = factory.get(_options())
+        return driver, time.perf_counter() - started
+
+    def test_next_session_is_ready_while_test_runs(self, server):
+        factory = PrewarmedSessionFactory(
+            lambda options: webdriver.Remote(server.url, options=options),
+            lookahead=1,
+        )
+
+        first, first_wait = self._timed_get(factory)
+        time.sleep(SESSION_STARTUP + 0.2)
+        first.quit()
+        second, second_wait = self._timed_get(factory)
+        second.quit()
+        factory.shutdown()
+
+        assert first_wait >= SESSION_STARTUP
+        assert second_wait < 0.05
+        assert factory.served_warm == 1
+
+    def test_primed_factory_serves_first_request_warm(self, server):
+        factory = PrewarmedSessionFactory(
+            lambda options: webdriver.Remote(server.url, options=options),
+            lookahead=2,
+        )
+
+        factory.prime(_options())
+        time.sleep(SESSION_STARTUP + 0.2)
+        driver, wait = self._timed_get(factory)
+        driver.quit()
+        factory.shutdown()
+
+        assert wait < 0.05
+
+    def test_shutdown_quits_unused_warm_sessions(self, server):
+        factory = PrewarmedSessionFactory(
+            lambda options: webdriver.Remote(server.url, options=options),
+            lookahead=2,
+        )
+
+        driver = factory.get(_options())
+        driver.quit()
+        factory.shutdown()
+
+        assert server.stats.session_creates == 3
+        assert server.stats.session_deletes == 3
+        assert not server.sessions
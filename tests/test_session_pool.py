@@ -0,0 +1,121 @@
+import pytest
+from appium.options.android import UiAutomator2Options
+
+from utils.fake_appium import FakeAppiumServer
+from utils.session_pool import SessionPool, capabilities_key
+
+
+def _options(udid="emulator-5554", package="com.swaglabsmobileapp"):
+    options = UiAutomator2Options()
+    options.udid = udid
+    options.app_package = package
+    options.app_activity = f"{package}.MainActivity"
+    return options
+
+
+@pytest.fixture
+def server():
+    with FakeAppiumServer() as fake_server:
+        yield fake_server
+
+
+@pytest.mark.unit
+class TestSessionPool:
+    def test_reuses_session_for_same_capabilities(self, server):
+        pool = SessionPool(server.url)
+
+        for _ in range(4):
+            driver = pool.acquire(_options())
+            pool.release(driver)
+        pool.close()
+
+        assert server.stats.session_creates == 1
+        assert server.stats.session_deletes == 1
+        assert pool.created == 1
+        assert pool.reused == 3
+
+    def test_relaunches_app_on_reuse(self, server):
+        pool = SessionPool(server.url)
+
+        driver = pool.acquire(_options())
+        pool.release(driver)
+        driver = pool.acquire(_options())
+
+        events = server.sessions[driver.session_id].app_events
+        assert events == [
+            ("terminateApp", "com.swaglabsmobileapp"),
+            ("activateApp", "com.swaglabsmobileapp"),
+        ]
+        pool.release(driver, discard=True)
+
+    def test_on_reset_called_after_app_reset(self, server):
+        resets = []
+        pool = SessionPool(server.url, on_reset=resets.append)
+
+        driver = pool.acquire(_options())
+        pool.release(driver)
+        pool.release(pool.acquire(_options(), reset="none"))
+        driver = pool.acquire(_options())
+
+        assert resets == [driver]
+        pool.release(driver, discard=True)
+
+    def test_clear_strategy_clears_app_data(self, server):
+        pool = SessionPool(server.url, reset="clear")
+
+        driver = pool.acquire(_options())
+        pool.release(driver)
+        driver = pool.acquire(_options())
+
+        events = server.sessions[driver.session_id].app_events
+        assert [name for name, _ in events] == ["clearApp", "activateApp"]
+        pool.release(driver, discard=True)
+
+    def test_separate_sessions_per_capability_set(self, server):
+        pool = SessionPool(server.url)
+
+        first = pool.acquire(_options(udid="device-a"))
+        pool.release(first)
+        second = pool.acquire(_options(udid="device-b"))
+        pool.release(second)
+        pool.close()
+
+        assert server.stats.session_creates == 2
+        assert capabilities_key(_options("device-a")) != capabilities_key(
+            _options("device-b")
+        )
+
+    def test_replaces_dead_session(self, server):
+        pool = SessionPool(server.url)
+
+        driver = pool.acquire(_options())
+        pool.release(driver)
+        server.kill_session(driver.session_id)
+        replacement = pool.acquire(_options())
+        pool.release(replacement)
+        pool.close()
+
+        assert replacement.session_id != driver.session_id
+        assert server.stats.session_creates == 2
+
+    def test_reuse_disabled_quits_every_session(self, server):
+        pool = SessionPool(server.url, reuse=False)
+
+        for _ in range(3):
+            pool.release(pool.acquire(_options()))
+
+        assert server.stats.session_creates == 3
+        assert server.stats.session_deletes == 3
+
+    def test_no_reset_keeps_app_running_unless_dirty(self, server):
+        pool = SessionPool(server.url)
+
+        driver = pool.acquire(_options())
+        pool.release(driver)
+        driver = pool.acquire(_options(), reset="none")
+        pool.release(driver, dirty=True)
+        driver = pool.acquire(_options(), reset="none")
+
+        events = server.sessions[driver.session_id].app_events
+        assert [name for name, _ in events] == ["terminateApp", "activateApp"]
+        pool.release(driver, discard=True)
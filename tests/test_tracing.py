@@ -0,0 +1,109 @@
+import json
+
+import pytest
+from appium.options.android import UiAutomator2Options
+from appium.webdriver.common.appiumby import AppiumBy
+
+from pages.products_page import ProductsPage
+from utils import http_client, tracing
+from utils.fake_appium import FakeAppiumServer
+
+
+def _options():
+    options = UiAutomator2Options()
+    options.app_package = "com.swaglabsmobileapp"
+    return options
+
+
+@pytest.fixture
+def driver():
+    with FakeAppiumServer() as server:
+        driver = http_client.create_driver(server.url, _options())
+        yield driver
+        driver.quit()
+
+
+@pytest.fixture
+def recorder():
+    yield tracing.start("worker (device-a)")
+    tracing.stop()
+
+
+def _spans(trace, category):
+    return [e for e in trace["traceEvents"] if e.get("cat") == category]
+
+
+def _within(inner, outer):
+    return (
+        inner["tid"] == outer["tid"]
+        and outer["ts"] <= inner["ts"]
+        and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    )
+
+
+@pytest.mark.unit
+class TestTracing:
+    def test_disabled_records_nothing(self):
+        assert tracing.span("anything") is tracing.span("else")
+        assert ProductsPage.get_all_products.__wrapped__
+
+    def test_spans_nest_test_step_page_command(self, driver, recorder, tmp_path):
+        with tracing.span("test_products", "test"):
+            tracing.step("Read products")
+            ProductsPage(driver).get_all_products()
+            tracing.end_step()
+        trace = json.loads(recorder.export(tmp_path / "trace.json").read_text())
+
+        test = _spans(trace, "test")[0]
+        step = _spans(trace, "step")[0]
+        page = next(
+            e for e in _spans(trace, "page") if e["name"] == "ProductsPage.catalog"
+        )
+        command = next(
+            e for e in _spans(trace, "command") if e["name"] == "getPageSource"
+        )
+        assert _within(step, test)
+        assert _within(page, step)
+        assert _within(command, page)
+
+    def test_command_records_locator(self, driver, recorder):
+        driver.find_elements(AppiumBy.ACCESSIBILITY_ID, "test-Item")
+
+        command = recorder.events[-1]
+        assert command["name"] == "findElements"
+        assert command["args"] == {"using": "accessibility id", "value": "test-Item"}
+
+    def test_send_keys_text_is_not_recorded(self, driver, recorder):
+        driver.find_element(AppiumBy.ACCESSIBILITY_ID, "test-Cart").send_keys("secret")
+
+        command = recorder.events[-1]
+        assert command["name"] == "sendKeysToElement"
+        assert "value" not in command.get("args", {})
+
+    def test_metadata_names_tracks(self, recorder):
+        with tracing.span("work"):
+            pass
+        metadata = [e for e in recorder.trace_events() if e["ph"] == "M"]
+
+        assert {"name": "worker (device-a)"} in [e["args"] for e in metadata]
+        assert any(e["name"] == "thread_name" for e in metadata)
+
+    def test_failed_span_is_marked(self, recorder):
+        with pytest.raises(ValueError):
+            with tracing.span("failing"):
+                raise ValueError("boom")
+
+        assert recorder.events[0]["args"] == {"error": "ValueError"}
+
+    def test_merge_keeps_process_tracks(self, tmp_path):
+        paths = []
+        for name in ("device-a", "device-b"):
+            recorder = tracing.TraceRecorder(name)
+            recorder.pid = hash(name) % 1000
+            with recorder.span("test", "test"):
+                pass
+            paths.append(recorder.export(tmp_path / f"{name}.json"))
+
+        merged = json.loads(tracing.merge(paths, tmp_path / "all.json").read_text())
+
+        assert len({e["pid"] for e in merged["traceEvents"]}) == 2
@@ -0,0 +1,149 @@
+import threading
+import time
+
+import pytest
+from appium.options.android import UiAutomator2Options
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+
+from pages.checkout_page import CheckoutPage
+from utils import http_client, waits
+from utils.fake_appium import FakeAppiumServer, products_screen
+from utils.waits import AdaptiveWait, PollSchedule
+
+EMPTY_SCREEN = '<hierarchy class="hierarchy" width="1080" height="2220" />'
+CART = (AppiumBy.ACCESSIBILITY_ID, "test-Cart")
+
+
+def _checkout_screen(error=None, displayed="true"):
+    error_node = (
+        f'<android.view.ViewGroup class="android.view.ViewGroup" text="" '
+        f'content-desc="test-Error message" bounds="[40,300][1040,400]" '
+        f'displayed="{displayed}"><android.widget.TextView '
+        f'class="android.widget.TextView" text="{error}" content-desc="" '
+        f'bounds="[60,320][1000,380]" displayed="{displayed}" />'
+        f"</android.view.ViewGroup>"
+        if error
+        else ""
+    )
+    return f"""<hierarchy class="hierarchy" width="1080" height="2220">
+  {error_node}
+  <android.view.ViewGroup class="android.view.ViewGroup" text=""
+    content-desc="test-CONTINUE" bounds="[40,900][1040,1020]" displayed="true" />
+</hierarchy>"""
+
+
+@pytest.fixture
+def server():
+    with FakeAppiumServer(page_source=EMPTY_SCREEN) as fake_server:
+        yield fake_server
+
+
+@pytest.fixture
+def driver(server):
+    driver = http_client.create_driver(server.url, UiAutomator2Options())
+    yield driver
+    driver.quit()
+
+
+def _show_products_later(server, session_id, delay):
+    timer = threading.Timer(
+        delay, server.set_page_source, (products_screen(), session_id)
+    )
+    timer.start()
+    return timer
+
+
+@pytest.mark.unit
+class TestPollSchedule:
+    def test_fast_first_then_exponential_backoff(self):
+        intervals = PollSchedule(first=0.05, factor=2, maximum=0.3).intervals()
+
+        assert [next(intervals) for _ in range(5)] == [0.05, 0.1, 0.2, 0.3, 0.3]
+
+
+@pytest.mark.unit
+class TestAdaptiveWait:
+    def test_learned_latency_reduces_polls(self, server, driver):
+        wait = AdaptiveWait(driver, timeout=5, schedule=PollSchedule(0.02, 1.5, 1))
+        key = object()
+        polls = []
+
+        for _ in range(2):
+            server.set_page_source(EMPTY_SCREEN, driver.session_id)
+            before = server.stats.commands["find_element"]
+            _show_products_later(server, driver.session_id, 0.4)
+            wait.until(EC.presence_of_element_located(CART), key=key)
+            polls.append(server.stats.commands["find_element"] - before)
+
+        assert waits.learned_latency(key) >= 0.3
+        assert polls[1] < polls[0]
+        assert polls[1] <= 3
+
+    def test_budget_is_shared_between_waits(self, driver):
+        wait = AdaptiveWait(driver, timeout=20)
+
+        with waits.budget(0.3) as test_budget:
+            started = time.monotonic()
+            with pytest.raises(TimeoutException):
+                wait.until(EC.presence_of_element_located(CART))
+            with pytest.raises(TimeoutException, match="budget"):
+                wait.until(EC.presence_of_element_located(CART))
+            elapsed = time.monotonic() - started
+
+        assert elapsed < 1
+        assert test_budget.remaining == 0
+
+    def test_records_polls_and_time_to_satisfy(self, server, driver):
+        waits_before = waits.wait_stats()["waits"]
+        _show_products_later(server, driver.session_id, 0.1)
+
+        AdaptiveWait(driver, timeout=5).until(EC.presence_of_element_located(CART))
+
+        stats = waits.wait_stats()
+        assert stats["waits"] == waits_before + 1
+        assert stats["polls_per_wait"] >= 1
+        assert stats["time_to_satisfy"]["p95"] > 0
+
+
+@pytest.mark.unit
+class TestAbsenceChecks:
+    def test_settled_by_one_read_after_leaving_screen(self, server, driver):
+        server.set_page_source(products_screen(), driver.session_id)
+
+        started = time.monotonic()
+        CheckoutPage(driver).verify_no_error_after_continue()
+
+        assert time.monotonic() - started < 0.3
+        assert server.stats.commands["page_source"] == 1
+        assert server.stats.commands["find_element"] == 0
+
+    def test_visible_element_is_reported_at_once(self, server, driver):
+        server.set_page_source(_checkout_screen("Error: First Name is required"))
+        page = CheckoutPage(driver)
+
+        with pytest.raises(AssertionError, match="Validation error"):
+            page.verify_no_error_after_continue()
+        assert server.stats.commands["page_source"] == 1
+
+    def test_hidden_element_counts_as_absent(self, server, driver):
+        server.set_page_source(_checkout_screen("Error", displayed="false"))
+
+        assert CheckoutPage(driver).is_absent(CheckoutPage.ERROR_MESSAGE)
+
+    def test_stability_window_catches_late_element(self, server, driver):
+        server.set_page_source(_checkout_screen())
+        page = CheckoutPage(driver)
+        timer = threading.Timer(
+            0.1, server.set_page_source, (_checkout_screen("Error"), driver.session_id)
+        )
+        timer.start()
+
+        absent = page.is_absent(
+            page.ERROR_MESSAGE, stable_for=0.3, screen_marker=page.CONTINUE_BUTTON
+        )
+        timer.join()
+
+        assert not absent
+        assert server.stats.commands["page_source"] == 2
@@ -0,0 +1,264 @@
+"""
+APK fingerprint cache.
+
+Remembers which build (by content hash) was last installed on each device so
+that sessions only push the APK when the build changed. Otherwise the app
+data is cleared or the app is simply relaunched, depending on the requested
+reset.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+INSTALL = "install"
+CLEAR_DATA = "clear_data"
+RELAUNCH = "relaunch"
+
+
+def fingerprint(apk_path, chunk_size=1024 * 1024):
+    """Compute SHA-256 of the APK contents.
+
+    Args:
+        apk_path: Path to the APK file.
+        chunk_size: Read size in bytes. Defaults to 1 MiB.
+
+    Returns:
+        Hex digest string.
+    """
+    digest = hashlib.sha256()
+    with open(apk_path, "rb") as apk:
+        while chunk := apk.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_apk_metadata(apk_path):
+    """Read package name and version from the APK with aapt, when available.
+
+    Args:
+        apk_path: Path to the APK file.
+
+    Returns:
+        Dict with 'package', 'version_code' and 'version_name' keys, empty
+        if no aapt binary is on PATH or it fails.
+    """
+    aapt = shutil.which("aapt") or shutil.which("aapt2")
+    if not aapt:
+        return {}
+    try:
+        output = subprocess.run(
+            [aapt, "dump", "badging", str(apk_path)],
+            capture_output=True,
+            text=True,
+            timeout=60,
+        ).stdout
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"aapt failed for {apk_path}: {e}")
+        return {}
+
+    match = re.search(
+        r"package: name='([^']+)' versionCode='([^']*)' versionName='([^']*)'", output
+    )
+    if not match:
+        return {}
+    return dict(zip(("package", "version_code", "version_name"), match.groups()))
+
+
+class InstallDecision:
+    """Outcome of ApkCache.decide() for one device and build."""
+
+    def __init__(self, action, udid, apk_path, sha256, metadata, reason):
+        self.action = action
+        self.udid = udid
+        self.apk_path = str(apk_path)
+        self.sha256 = sha256
+        self.metadata = metadata
+        self.reason = reason
+        self.confirmed = False
+
+    @property
+    def package(self):
+        return self.metadata.get("package")
+
+    def __repr__(self):
+        return f"InstallDecision({self.action!r}, udid={self.udid!r}, {self.reason})"
+
+
+class ApkCache:
+    """Per-device cache of installed APK fingerprints and metadata.
+
+    Every device has its own JSON file next to cache_file (apk_cache.json
+    becomes apk_cache.<udid>.json), so scheduler workers, one per device,
+    never overwrite each other's records. A file has three sections: 'files'
+    (path, size and mtime -> sha256, to avoid re-hashing unchanged files),
+    'apks' (sha256 -> parsed metadata) and 'devices' (udid -> sha256 of the
+    installed build).
+    """
+
+    def __init__(self, cache_file):
+        self.cache_file = Path(cache_file)
+        self._lock = threading.Lock()
+
+    def device_file(self, udid):
+        """Get the cache file of a device."""
+        name = re.sub(r"[^\w.-]", "_", udid or "default")
+        return self.cache_file.with_name(
+            f"{self.cache_file.stem}.{name}{self.cache_file.suffix}"
+        )
+
+    def _load(self, udid):
+        cache_file = self.device_file(udid)
+        if cache_file.exists():
+            try:
+                return json.loads(cache_file.read_text())
+            except ValueError:
+                logger.warning(f"Ignoring corrupted APK cache {cache_file}")
+        return {"files": {}, "apks": {}, "devices": {}}
+
+    def _save(self, udid, data):
+        cache_file = self.device_file(udid)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(f".{cache_file.name}.{os.getpid()}")
+        tmp_file.write_text(json.dumps(data, indent=2, sort_keys=True))
+        os.replace(tmp_file, cache_file)
+
+    def _fingerprint(self, data, apk_path):
+        stat = apk_path.stat()
+        key = str(apk_path.resolve())
+        entry = data["files"].get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            return entry["sha256"]
+        sha256 = fingerprint(apk_path)
+        data["files"][key] = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "sha256": sha256,
+        }
+        return sha256
+
+    def decide(self, udid, apk_path, package=None, full_reset=False, clear_data=False):
+        """Decide how to bring the build onto the device.
+
+        Args:
+            udid: Device UDID. None means the auto-detected single device.
+            apk_path: Path to the APK under test.
+            package: Fallback package name if APK metadata can't be read.
+            full_reset: Requested full reset. On an identical build this
+                becomes a data clear instead of a reinstall.
+            clear_data: Clear app data even without a full reset.
+
+        Returns:
+            InstallDecision with action INSTALL, CLEAR_DATA or RELAUNCH.
+        """
+        apk_path = Path(apk_path)
+        udid = udid or "default"
+        with self._lock:
+            data = self._load(udid)
+            sha256 = self._fingerprint(data, apk_path)
+            if sha256 not in data["apks"]:
+                data["apks"][sha256] = read_apk_metadata(apk_path)
+            self._save(udid, data)
+
+        metadata = dict(data["apks"][sha256])
+        if package and not metadata.get("package"):
+            metadata["package"] = package
+        installed = data["devices"].get(udid, {})
+
+        if installed.get("sha256") != sha256:
+            action = INSTALL
+            reason = (
+                "no build recorded for device"
+                if not installed
+                else f"build changed from {installed['sha256'][:12]}"
+            )
+        elif full_reset or clear_data:
+            action = CLEAR_DATA
+            reason = "same build installed, clearing app data"
+        else:
+            action = RELAUNCH
+            reason = "same build installed"
+
+        decision = InstallDecision(action, udid, apk_path, sha256, metadata, reason)
+        logger.info(
+            f"APK cache [{udid}]: {action} {apk_path.name} "
+            f"({metadata.get('version_name', 'unknown version')}, {sha256[:12]}) - {reason}"
+        )
+        return decision
+
+    @staticmethod
+    def apply(options, decision, full_reset=False):
+        """Configure session capabilities for the decision.
+
+        Without an install the app capability is removed, so Appium neither
+        checks nor pushes the APK.
+
+        Args:
+            options: UiAutomator2Options to update.
+            decision: InstallDecision from decide().
+            full_reset: Full reset requested for fresh installs.
+        """
+        if decision.action == INSTALL:
+            options.app = decision.apk_path
+            options.full_reset = full_reset
+        else:
+            options.set_capability("app", None)
+            options.full_reset = False
+            options.no_reset = decision.action == RELAUNCH
+        if decision.package:
+            options.app_package = decision.package
+
+    def confirm(self, device, decision):
+        """Check the decision against the device once a session is running.
+
+        Records the installed build, and installs it when the device lost
+        the app behind the cache's back.
+
+        Args:
+            device: Object with is_app_installed/install_app/activate_app,
+                e.g. an Appium WebDriver.
+            decision: InstallDecision from decide().
+        """
+        if decision.confirmed:
+            return
+        installed = decision.action == INSTALL
+        if not installed and decision.package:
+            if not device.is_app_installed(decision.package):
+                logger.info(
+                    f"APK cache [{decision.udid}]: app missing on device, installing"
+                )
+                device.install_app(decision.apk_path)
+                device.activate_app(decision.package)
+                installed = True
+        if installed:
+            self.record_install(decision)
+        decision.confirmed = True
+
+    def record_install(self, decision):
+        """Store the build of the decision as installed on its device."""
+        with self._lock:
+            data = self._load(decision.udid)
+            data["devices"][decision.udid] = {
+                "sha256": decision.sha256,
+                "package": decision.package,
+                "version_name": decision.metadata.get("version_name"),
+                "installed_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            self._save(decision.udid, data)
+
+    def forget(self, udid):
+        """Drop the record for a device, forcing an install next time."""
+        udid = udid or "default"
+        with self._lock:
+            data = self._load(udid)
+            data["devices"].pop(udid, None)
+            self._save(udid, data)
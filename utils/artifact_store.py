@@ -0,0 +1,313 @@
+"""
+Content-addressed artifact store.
+
+Screenshots, page sources and logs are stored once per distinct content under
+objects/<first two hex digits>/<sha256>, gzip-compressed when that makes them
+noticeably smaller (PNGs usually stay raw, XML and logs shrink a lot). Every
+test process gets its own run directory, runs/<RUN_ID>/index.jsonl, which
+maps the path an artifact was saved under to its object.
+
+Objects are written to a temporary file and renamed into place, so
+concurrent writers (threads, xdist workers, parallel CI jobs sharing the
+directory) never see partial objects, and two writers storing the same
+content end up with the same file. evict() removes runs past the age or size
+limits and then every object no remaining run refers to.
+"""
+
+import gzip
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime
+from hashlib import sha256
+from pathlib import Path
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+RUN_ID = f"{datetime.now():%Y%m%d_%H%M%S_%f}_{os.getpid()}"
+
+# Compressed objects must be at least this much smaller to be kept compressed
+MIN_COMPRESSION_GAIN = 0.05
+
+# Objects younger than this are never swept, a concurrent writer may be about
+# to index them
+SWEEP_GRACE_SECONDS = 3600
+
+_default = None
+_default_lock = threading.Lock()
+
+
+class ArtifactStore:
+    """Deduplicated, compressed artifacts with a per-run index."""
+
+    def __init__(self, root, base=None, run_id=RUN_ID, compress_level=6):
+        """Initialize ArtifactStore.
+
+        Args:
+            root: Directory holding objects/ and runs/.
+            base: Directory artifact paths are recorded relative to (e.g.
+                the results directory); paths outside it keep their name.
+            run_id: Name of this process' run directory.
+            compress_level: gzip level, 0 stores everything uncompressed.
+        """
+        self.root = Path(root)
+        self.base = Path(base) if base else None
+        self.run_id = run_id
+        self.compress_level = compress_level
+        self.objects_dir = self.root / "objects"
+        self.run_dir = self.root / "runs" / run_id
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        self.stats = {
+            "artifacts": 0,
+            "bytes_in": 0,
+            "bytes_written": 0,
+            "saved_by_dedup": 0,
+            "saved_by_compression": 0,
+        }
+        self._lock = threading.Lock()
+
+    def put(self, data, path, kind=None):
+        """Store an artifact.
+
+        Args:
+            data: Content as bytes or str (stored UTF-8 encoded).
+            path: Path the artifact would have been saved under.
+            kind: Optional type recorded in the index, e.g. 'screenshot'.
+
+        Returns:
+            Hex sha256 digest of the content.
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        digest = sha256(data).hexdigest()
+        existing = self._object_path(digest)
+        if existing is not None:
+            # Refresh mtime so a concurrent evict() doesn't sweep it
+            try:
+                os.utime(existing)
+            except FileNotFoundError:
+                # Swept by another worker's evict() meanwhile, store it again
+                existing = None
+        if existing is not None:
+            written, compressed = 0, existing.suffix == ".gz"
+        else:
+            written, compressed = self._write_object(digest, data)
+
+        entry = {
+            "path": self._logical_path(path),
+            "digest": digest,
+            "size": len(data),
+            "compressed": compressed,
+            "kind": kind,
+            "time": time.time(),
+        }
+        with self._lock:
+            # Recreated if the run directory was removed, e.g. by hand
+            self.run_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.run_dir / "index.jsonl", "a", encoding="utf-8") as index:
+                index.write(json.dumps(entry) + "\n")
+            self.stats["artifacts"] += 1
+            self.stats["bytes_in"] += len(data)
+            self.stats["bytes_written"] += written
+            if existing is not None:
+                self.stats["saved_by_dedup"] += len(data)
+            else:
+                self.stats["saved_by_compression"] += len(data) - written
+        return digest
+
+    def get(self, digest):
+        """Read the content of an object.
+
+        Raises:
+            KeyError: If the store has no object with that digest.
+        """
+        path = self._object_path(digest)
+        if path is None:
+            raise KeyError(digest)
+        data = path.read_bytes()
+        return gzip.decompress(data) if path.suffix == ".gz" else data
+
+    def index(self, run_id=None):
+        """Read the index of a run.
+
+        Args:
+            run_id: Run to read, this process' run by default.
+
+        Returns:
+            Dict mapping artifact path to its latest index entry. Lines that
+            can't be parsed (e.g. cut off by a killed writer) are skipped.
+        """
+        index_path = self.root / "runs" / (run_id or self.run_id) / "index.jsonl"
+        try:
+            lines = index_path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return {}
+        entries = {}
+        for number, line in enumerate(lines, 1):
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+                entries[entry["path"]] = entry
+            except (ValueError, KeyError, TypeError):
+                logger.warning(f"Skipping unreadable line {number} of {index_path}")
+        return entries
+
+    def read(self, path, run_id=None):
+        """Read an artifact by the path it was saved under.
+
+        Raises:
+            KeyError: If the run has no artifact with that path.
+        """
+        return self.get(self.index(run_id)[self._logical_path(path)]["digest"])
+
+    def evict(self, max_bytes=None, max_age_days=None, grace=SWEEP_GRACE_SECONDS):
+        """Apply the retention policy.
+
+        Runs older than max_age_days are removed, then the oldest runs until
+        the objects take at most max_bytes. This process' run and runs
+        written to within the grace period (other workers still running) are
+        always kept. Objects no remaining run refers to are deleted.
+
+        Args:
+            max_bytes: Size limit of all objects, None for no limit.
+            max_age_days: Age limit of runs, None for no limit.
+            grace: Seconds an unreferenced object, or a run, is kept after
+                its last write.
+
+        Returns:
+            Dict with 'runs' and 'objects' removed and 'bytes' freed.
+        """
+        removed = {"runs": 0, "objects": 0, "bytes": 0}
+        active = time.time() - grace
+        runs = sorted(
+            (d for d in (self.root / "runs").iterdir() if d.name != self.run_id),
+            key=self._run_time,
+        )
+        runs = [run_dir for run_dir in runs if self._run_time(run_dir) <= active]
+        if max_age_days is not None:
+            cutoff = time.time() - max_age_days * 86400
+            while runs and self._run_time(runs[0]) < cutoff:
+                self._remove_run(runs.pop(0), removed)
+        self._sweep(removed, grace)
+        if max_bytes is not None:
+            while runs and self._objects_size() > max_bytes:
+                self._remove_run(runs.pop(0), removed)
+                self._sweep(removed, grace)
+        if removed["runs"] or removed["objects"]:
+            logger.info(
+                f"Artifact retention: removed {removed['runs']} runs, "
+                f"{removed['objects']} objects, {removed['bytes'] / 1024:.0f} KB"
+            )
+        return removed
+
+    def _write_object(self, digest, data):
+        stored, suffix = data, ""
+        if self.compress_level:
+            compressed = gzip.compress(data, compresslevel=self.compress_level)
+            if len(compressed) <= len(data) * (1 - MIN_COMPRESSION_GAIN):
+                stored, suffix = compressed, ".gz"
+        target = self.objects_dir / digest[:2] / f"{digest}{suffix}"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(stored)
+        os.replace(tmp, target)
+        return len(stored), bool(suffix)
+
+    def _object_path(self, digest):
+        for suffix in ("", ".gz"):
+            path = self.objects_dir / digest[:2] / f"{digest}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+    def _logical_path(self, path):
+        path = Path(path)
+        if self.base is not None:
+            try:
+                return path.relative_to(self.base).as_posix()
+            except ValueError:
+                pass
+        return path.as_posix() if not path.is_absolute() else path.name
+
+    @classmethod
+    def _run_time(cls, run_dir):
+        stat = cls._stat(run_dir / "index.jsonl") or cls._stat(run_dir)
+        # A run removed meanwhile sorts first, removing it again is harmless
+        return stat.st_mtime if stat is not None else 0.0
+
+    def _remove_run(self, run_dir, removed):
+        shutil.rmtree(run_dir, ignore_errors=True)
+        removed["runs"] += 1
+
+    def _sweep(self, removed, grace):
+        referenced = set()
+        for run_dir in (self.root / "runs").iterdir():
+            for entry in self.index(run_dir.name).values():
+                referenced.add(entry["digest"])
+        cutoff = time.time() - grace
+        for path in self.objects_dir.glob("*/*"):
+            digest = path.name.split(".")[0]
+            stat = self._stat(path)
+            if digest in referenced or stat is None or stat.st_mtime > cutoff:
+                continue
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                # Swept by another worker's evict() meanwhile
+                continue
+            removed["objects"] += 1
+            removed["bytes"] += stat.st_size
+
+    def _objects_size(self):
+        stats = (self._stat(path) for path in self.objects_dir.glob("*/*"))
+        return sum(stat.st_size for stat in stats if stat is not None)
+
+    @staticmethod
+    def _stat(path):
+        # Objects and temporary files may vanish between listing and stat()
+        try:
+            return path.stat()
+        except FileNotFoundError:
+            return None
+
+
+def get_store():
+    """Get the store shared by the test process, None if ARTIFACT_STORE is off."""
+    global _default
+    if not settings.ARTIFACT_STORE:
+        return None
+    with _default_lock:
+        if _default is None:
+            _default = ArtifactStore(
+                settings.ARTIFACT_DIR,
+                base=settings.RESULTS_DIR,
+                compress_level=settings.ARTIFACT_COMPRESS_LEVEL,
+            )
+        return _default
+
+
+def artifact_stats():
+    """Get the counters of the shared store.
+
+    Returns:
+        Dict with 'artifacts', 'bytes_in' (content size), 'bytes_written',
+        'saved_by_dedup' and 'saved_by_compression'.
+    """
+    store = _default
+    if store is None:
+        return {
+            "artifacts": 0,
+            "bytes_in": 0,
+            "bytes_written": 0,
+            "saved_by_dedup": 0,
+            "saved_by_compression": 0,
+        }
+    return dict(store.stats)
@@ -0,0 +1,140 @@
+"""
+Asyncio facade over the synchronous Appium driver.
+
+Every call runs the regular WebDriver/WebElement method on a per-session
+thread pool, so independent commands (element lookups, text reads, a
+screenshot and a page source dump) can be awaited together instead of paying
+one round trip after another. The pool size is the per-session concurrency
+limit.
+
+Appium queues commands of one session server-side, so what overlaps is the
+HTTP round trip and server overhead, not the device work itself. The gain
+grows with the latency between client and server (remote device farms).
+"""
+
+import asyncio
+import logging
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDriver:
+    """Awaitable wrapper for an Appium WebDriver.
+
+    Usage:
+        adriver = AsyncDriver.for_driver(driver)
+        name, price = adriver.run_sync(
+            adriver.gather(adriver.text(name_el), adriver.text(price_el))
+        )
+    """
+
+    def __init__(self, driver, max_concurrency=4):
+        """Initialize AsyncDriver.
+
+        Args:
+            driver: Appium WebDriver instance.
+            max_concurrency: Commands of this session in flight at once.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.driver = driver
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="async-driver"
+        )
+        weakref.finalize(self, self._executor.shutdown, wait=False)
+
+    @classmethod
+    def for_driver(cls, driver, max_concurrency=None):
+        """Get the facade of a driver, sharing its concurrency limit.
+
+        Args:
+            driver: Appium WebDriver instance.
+            max_concurrency: Limit used when the facade is created. Defaults
+                to settings.DRIVER_CONCURRENCY.
+
+        Returns:
+            AsyncDriver instance, the same one for every call with driver.
+        """
+        facade = getattr(driver, "_async_facade", None)
+        if facade is None:
+            if max_concurrency is None:
+                from config import settings
+
+                max_concurrency = settings.DRIVER_CONCURRENCY
+            facade = cls(driver, max_concurrency)
+            driver._async_facade = facade
+            logger.debug(
+                f"Async facade for session {driver.session_id}: "
+                f"{max_concurrency} concurrent commands"
+            )
+        return facade
+
+    async def call(self, func, *args, **kwargs):
+        """Run a blocking driver call in the session thread pool.
+
+        Args:
+            func: Callable, e.g. driver.find_element or element.get_attribute.
+            *args: Positional arguments for func.
+            **kwargs: Keyword arguments for func.
+
+        Returns:
+            Result of func.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+    async def gather(self, *calls, return_exceptions=False):
+        """Await several calls concurrently, results in argument order."""
+        return await asyncio.gather(*calls, return_exceptions=return_exceptions)
+
+    async def find_element(self, by, value, parent=None):
+        """Find an element in the screen or inside parent."""
+        return await self.call((parent or self.driver).find_element, by, value)
+
+    async def find_elements(self, by, value, parent=None):
+        """Find elements in the screen or inside parent."""
+        return await self.call((parent or self.driver).find_elements, by, value)
+
+    async def text(self, element):
+        """Get the text of an element."""
+        return await self.call(lambda: element.text)
+
+    async def get_attribute(self, element, name):
+        """Get an attribute of an element."""
+        return await self.call(element.get_attribute, name)
+
+    async def child_text(self, parent, by, value):
+        """Find an element inside parent and get its text."""
+        element = await self.find_element(by, value, parent=parent)
+        return await self.text(element)
+
+    async def page_source(self):
+        """Get the page source of the current screen."""
+        return await self.call(lambda: self.driver.page_source)
+
+    async def screenshot(self):
+        """Take a screenshot as PNG bytes."""
+        return await self.call(self.driver.get_screenshot_as_png)
+
+    def run_sync(self, coroutine):
+        """Run a coroutine to completion from synchronous code.
+
+        Args:
+            coroutine: Coroutine built from this facade's methods.
+
+        Returns:
+            Result of the coroutine.
+        """
+        return asyncio.run(coroutine)
+
+    def close(self):
+        """Stop the session thread pool."""
+        if getattr(self.driver, "_async_facade", None) is self:
+            del self.driver._async_facade
+        self._executor.shutdown(wait=True)
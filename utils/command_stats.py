@@ -0,0 +1,205 @@
+"""
+Per-command latency statistics of the WebDriver connection.
+
+PooledAppiumConnection reports every command it sends: command name,
+locator strategy (find commands), HTTP round trip time, request and response
+body sizes, urllib3 retries and HTTP errors. They are aggregated per test
+(see start_test()) and per (command, strategy) into fixed-bucket latency
+histograms, so memory stays constant however many commands a test sends.
+
+summary() ranks commands over the whole run, export() writes the per-test
+table as JSON and CSV.
+"""
+
+import csv
+import json
+import logging
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets in milliseconds, the last
+# bucket is open-ended
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+SESSION = "<session>"
+
+_lock = threading.Lock()
+_current_test = SESSION
+_tests = {}
+
+
+class CommandHistogram:
+    """Latencies and payload totals of one command in one test."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+        self.errors = 0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, latency_ms, sent, received, retries, error):
+        self.count += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+        self.bytes_sent += sent
+        self.bytes_received += received
+        self.retries += retries
+        self.errors += int(error)
+        for i, bound in enumerate(BUCKETS_MS):
+            if latency_ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+        self.bytes_sent += other.bytes_sent
+        self.bytes_received += other.bytes_received
+        self.retries += other.retries
+        self.errors += other.errors
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+    def percentile(self, fraction):
+        """Estimate a latency percentile as the upper bound of its bucket.
+
+        Args:
+            fraction: Percentile as a fraction, e.g. 0.95.
+
+        Returns:
+            Milliseconds; the maximum for the open-ended bucket.
+        """
+        rank = fraction * self.count
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return (
+                    min(BUCKETS_MS[i], self.max_ms)
+                    if i < len(BUCKETS_MS)
+                    else self.max_ms
+                )
+        return 0.0
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max_ms, 3),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "retries": self.retries,
+            "errors": self.errors,
+            "histogram": dict(zip([*map(str, BUCKETS_MS), "inf"], self.buckets)),
+        }
+
+
+def record(command, strategy, latency, sent=0, received=0, retries=0, error=False):
+    """Add one command to the running test's statistics.
+
+    Args:
+        command: WebDriver command name, e.g. 'findElement'.
+        strategy: Locator strategy of find commands, None otherwise.
+        latency: HTTP round trip time in seconds.
+        sent: Request body bytes.
+        received: Response body bytes.
+        retries: Retries urllib3 needed.
+        error: Whether the server answered with an HTTP error.
+    """
+    with _lock:
+        commands = _tests.setdefault(_current_test, {})
+        histogram = commands.get((command, strategy))
+        if histogram is None:
+            histogram = commands[(command, strategy)] = CommandHistogram()
+        histogram.add(latency * 1000, sent, received, retries, error)
+
+
+def start_test(name):
+    """Attribute commands sent from now on to a test."""
+    global _current_test
+    _current_test = name
+
+
+def end_test():
+    """Attribute commands to the session again (fixtures, teardown)."""
+    global _current_test
+    _current_test = SESSION
+
+
+def reset():
+    """Drop all recorded statistics."""
+    with _lock:
+        _tests.clear()
+
+
+def summary(limit=None):
+    """Aggregate all tests per (command, strategy), by total time.
+
+    Args:
+        limit: Return at most this many rows.
+
+    Returns:
+        List of dicts with 'command', 'strategy' and CommandHistogram fields.
+    """
+    totals = {}
+    with _lock:
+        for commands in _tests.values():
+            for key, histogram in commands.items():
+                totals.setdefault(key, CommandHistogram()).merge(histogram)
+    rows = [
+        {"command": command, "strategy": strategy, **histogram.as_dict()}
+        for (command, strategy), histogram in totals.items()
+    ]
+    rows.sort(key=lambda row: row["total_ms"], reverse=True)
+    return rows[:limit] if limit else rows
+
+
+def per_test():
+    """Get the statistics of every test.
+
+    Returns:
+        List of dicts with 'test', 'command', 'strategy' and CommandHistogram
+        fields.
+    """
+    with _lock:
+        return [
+            {"test": test, "command": command, "strategy": strategy, **h.as_dict()}
+            for test, commands in _tests.items()
+            for (command, strategy), h in commands.items()
+        ]
+
+
+def export(directory):
+    """Write the per-test statistics as commands.json and commands.csv.
+
+    Args:
+        directory: Output directory.
+
+    Returns:
+        Tuple of (JSON path, CSV path).
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    rows = per_test()
+    json_path = directory / "commands.json"
+    json_path.write_text(
+        json.dumps({"summary": summary(), "tests": rows}, indent=2), encoding="utf-8"
+    )
+    csv_path = directory / "commands.csv"
+    fields = [k for k in (rows[0] if rows else {}) if k != "histogram"]
+    with open(csv_path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    logger.info(f"Command statistics written to {json_path} and {csv_path}")
+    return json_path, csv_path
@@ -0,0 +1,74 @@
+"""
+Per-page cache of located elements.
+
+Remembers the WebElement (i.e. the element id on the Appium server) a
+locator resolved to, so repeated actions on the same locator skip the
+find round trip. Entries are dropped when an element goes stale and the
+whole cache is cleared by navigation-type actions.
+"""
+
+import logging
+import threading
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+_totals = Counter[str]()
+_totals_lock = threading.Lock()
+
+
+def cache_stats():
+    """Get hit, miss and stale counts summed over all element caches.
+
+    Returns:
+        Dict with 'hits', 'misses' and 'stale' keys.
+    """
+    with _totals_lock:
+        return {name: _totals[name] for name in ("hits", "misses", "stale")}
+
+
+class ElementCache:
+    """Locator to WebElement cache of one page object."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self._elements = {}
+
+    def _count(self, name):
+        setattr(self, name, getattr(self, name) + 1)
+        with _totals_lock:
+            _totals[name] += 1
+
+    def get(self, locator, resolve):
+        """Get the cached element for a locator, resolving it on a miss.
+
+        Args:
+            locator: Tuple of (AppiumBy, value).
+            resolve: Callable returning the WebElement for the locator.
+
+        Returns:
+            WebElement instance.
+        """
+        element = self._elements.get(locator)
+        if element is not None:
+            self._count("hits")
+            return element
+        element = resolve()
+        self._count("misses")
+        self._elements[locator] = element
+        return element
+
+    def discard_stale(self, locator):
+        """Forget an element that raised StaleElementReferenceException."""
+        self._elements.pop(locator, None)
+        self._count("stale")
+        logger.debug(f"Stale cached element for {locator}, re-resolving")
+
+    def invalidate(self):
+        """Forget all elements, e.g. after navigating to another screen."""
+        self._elements.clear()
+
+    def __len__(self):
+        return len(self._elements)
@@ -0,0 +1,740 @@
+"""
+Local stand-in for an Appium server.
+
+Speaks enough of the W3C WebDriver / Appium HTTP protocol for the framework
+code (session handling, app lifecycle, element lookups) to be exercised
+offline with the real Appium Python client, and counts what it receives so
+tests can assert on it. Elements are looked up in an UiAutomator2-style XML
+page source, by default the Swag Labs products screen from products_screen().
+"""
+
+import base64
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+from xml.sax.saxutils import quoteattr
+
+from appium import webdriver
+from appium.webdriver.client_config import AppiumClientConfig
+from lxml import etree
+from selenium.common.exceptions import InvalidSelectorException
+
+from utils import http_client
+from utils.page_source import SnapshotElement, find_nodes
+
+logger = logging.getLogger(__name__)
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+# 1x1 white PNG
+SCREENSHOT_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAIAAACQd1PeAAAADElEQVR4nGP4//8/AAX+Av4N70a4AAAAAElFTkSuQmCC"
+)
+
+PRODUCTS = [
+    ("Sauce Labs Backpack", "$29.99"),
+    ("Sauce Labs Bike Light", "$9.99"),
+    ("Sauce Labs Bolt T-Shirt", "$15.99"),
+    ("Sauce Labs Fleece Jacket", "$49.99"),
+    ("Sauce Labs Onesie", "$7.99"),
+    ("Test.allTheThings() T-Shirt (Red)", "$15.99"),
+]
+
+
+# Rows of the Swag Labs login screen, top to bottom
+LOGIN_ROWS = [
+    ("", "test-Username"),
+    ("", "test-Password"),
+    ("LOGIN", "test-LOGIN"),
+    ("The currently accepted usernames for this application are:", ""),
+    ("standard_user", "test-standard_user"),
+    ("locked_out_user", "test-locked_out_user"),
+    ("problem_user", "test-problem_user"),
+    ("Password for all users:", ""),
+    ("secret_sauce", ""),
+]
+
+
+def _screens(page_source):
+    return [page_source] if isinstance(page_source, str) else list(page_source)
+
+
+def _node(tag, bounds, text="", content_desc="", children="", scrollable=False):
+    (x1, y1), (x2, y2) = bounds
+    return (
+        f"<{tag} class={quoteattr(tag)} text={quoteattr(text)} "
+        f"content-desc={quoteattr(content_desc)} "
+        f'scrollable="{str(scrollable).lower()}" '
+        f'bounds="[{x1},{y1}][{x2},{y2}]" displayed="true">{children}</{tag}>'
+    )
+
+
+def products_screen(products=PRODUCTS, width=1080, height=2220, item_height=420):
+    """Build the page source of the Swag Labs PRODUCTS screen.
+
+    Args:
+        products: List of (name, price) tuples in list order.
+        width: Screen width in pixels.
+        height: Screen height in pixels.
+        item_height: Height of one product row in pixels.
+
+    Returns:
+        XML string in UiAutomator2 page source format.
+    """
+    group = "android.view.ViewGroup"
+    text_view = "android.widget.TextView"
+    items = []
+    for index, (name, price) in enumerate(products):
+        top = 400 + index * item_height
+        bottom = top + item_height
+        items.append(
+            _node(
+                group,
+                ((0, top), (width, bottom)),
+                content_desc="test-Item",
+                children=(
+                    _node(
+                        text_view,
+                        ((40, top + 20), (width - 40, top + 100)),
+                        text=name,
+                        content_desc="test-Item title",
+                    )
+                    + _node(
+                        text_view,
+                        ((40, top + 120), (400, top + 200)),
+                        text=price,
+                        content_desc="test-Price",
+                    )
+                    + _node(
+                        group,
+                        ((40, top + 240), (width - 40, top + 380)),
+                        content_desc="test-ADD TO CART",
+                        children=_node(
+                            text_view,
+                            ((60, top + 260), (width - 60, top + 360)),
+                            text="ADD TO CART",
+                        ),
+                    )
+                ),
+            )
+        )
+    header = _node(text_view, ((40, 250), (400, 330)), text="PRODUCTS") + _node(
+        group,
+        ((900, 80), (1040, 220)),
+        content_desc="test-Cart",
+    )
+    content = _node(
+        "android.widget.ScrollView",
+        ((0, 400), (width, height)),
+        content_desc="test-PRODUCTS",
+        children="".join(items),
+        scrollable=True,
+    )
+    return (
+        f'<hierarchy class="hierarchy" rotation="0" width="{width}" height="{height}">'
+        + _node(
+            "android.widget.FrameLayout",
+            ((0, 0), (width, height)),
+            children=header + content,
+        )
+        + "</hierarchy>"
+    )
+
+
+def list_screens(items, per_screen=4, width=1080, height=2220):
+    """Build the screens of a scrollable list, one per swipe.
+
+    Consecutive screens overlap by one row, like a swipe by most of the
+    list height does.
+
+    Args:
+        items: List of (text, content_desc) rows in list order.
+        per_screen: Rows visible at once.
+        width: Screen width in pixels.
+        height: Screen height in pixels.
+
+    Returns:
+        List of XML strings in UiAutomator2 page source format.
+    """
+    top = 200
+    row_height = (height - top) // per_screen
+    step = max(per_screen - 1, 1)
+    screens = []
+    for first in range(0, len(items) or 1, step):
+        rows = []
+        for index, (text, content_desc) in enumerate(items[first : first + per_screen]):
+            row_top = top + index * row_height
+            bounds = ((0, row_top), (width, row_top + row_height))
+            rows.append(
+                _node(
+                    "android.view.ViewGroup",
+                    bounds,
+                    content_desc=content_desc,
+                    children=_node("android.widget.TextView", bounds, text=text),
+                )
+            )
+        screens.append(
+            f'<hierarchy class="hierarchy" rotation="0" width="{width}" '
+            f'height="{height}">'
+            + _node(
+                "android.widget.ScrollView",
+                ((0, top), (width, height)),
+                children="".join(rows),
+                scrollable=True,
+            )
+            + "</hierarchy>"
+        )
+        if first + per_screen >= len(items):
+            break
+    return screens
+
+
+class FakeAppiumError(Exception):
+    """W3C error returned to the client by a command handler."""
+
+    def __init__(self, error, message, status=404):
+        super().__init__(message)
+        self.error = error
+        self.message = message
+        self.status = status
+
+
+class FakeSession:
+    """State of a single session on the fake server."""
+
+    def __init__(self, session_id, capabilities, screens):
+        self.session_id = session_id
+        self.capabilities = capabilities
+        self.app_events = []
+        self.elements = {}
+        self.load(screens)
+
+    def load(self, screens):
+        """Replace the screen(s), elements found before become stale."""
+        self.screens = list(screens)
+        self.screen_index = 0
+        self._show(self.screens[0])
+
+    def scroll(self, step=1):
+        """Move to the next (step 1) or previous (step -1) screen, if any.
+
+        Returns:
+            True if the screen changed, False at either end of the list.
+        """
+        index = min(max(self.screen_index + step, 0), len(self.screens) - 1)
+        if index == self.screen_index:
+            return False
+        self.screen_index = index
+        self._show(self.screens[index])
+        return True
+
+    def remove_item(self, node):
+        """Drop the cart item (test-Item) containing node from the screen."""
+        item = next(
+            (a for a in node.iterancestors() if a.get("content-desc") == "test-Item"),
+            None,
+        )
+        if item is None:
+            return
+        item.getparent().remove(item)
+        self.page_source = etree.tostring(self.root, encoding="unicode")
+        self.screens[self.screen_index] = self.page_source
+
+    def _show(self, page_source):
+        self.root = etree.fromstring(page_source.encode("utf-8"))
+        self.page_source = page_source
+
+
+class FakeAppiumStats:
+    """Counters collected by the fake server."""
+
+    def __init__(self):
+        self.session_creates = 0
+        self.session_deletes = 0
+        self.connections = 0
+        self.max_in_flight = 0
+        self.commands = Counter[str]()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def count(self, command):
+        with self._lock:
+            self.commands[command] += 1
+
+    def count_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    def enter(self):
+        with self._lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+
+    def leave(self):
+        with self._lock:
+            self._in_flight -= 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes, with Nagle enabled every
+    # keep-alive response would stall on the client's delayed ACK.
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.app.stats.count_connection()
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError:
+            body = {}
+
+        status, payload = self.server.app.handle(method, self.path, body)
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FakeAppiumServer:
+    """Threaded HTTP server emulating the parts of Appium the framework uses.
+
+    Usage:
+        with FakeAppiumServer() as server:
+            driver = webdriver.Remote(server.url, options=options)
+
+    Args:
+        host: Interface to bind. Defaults to loopback.
+        port: Port to bind, 0 picks a free one.
+        latency: Artificial delay in seconds added to every command.
+        latencies: Optional per-command delays overriding latency, keyed by
+            command name as counted in stats (e.g. 'new_session').
+        page_source: Screen new sessions start on, or a list of screens
+            moved through by swipes (W3C actions and UiScrollable).
+            Defaults to products_screen().
+        find_costs: Optional per-strategy lookup cost in seconds per node of
+            the screen hierarchy, keyed by W3C strategy (e.g. 'xpath'), to
+            model how lookups scale with the screen size on a device.
+        swipe_time: Seconds every swipe takes, W3C swipes as well as the
+            scrolls UiScrollable.scrollIntoView does on the device.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        latency=0.0,
+        latencies=None,
+        page_source=None,
+        find_costs=None,
+        swipe_time=0.0,
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.latencies = latencies or {}
+        self.find_costs = find_costs or {}
+        self.swipe_time = swipe_time
+        self.screens = _screens(page_source or products_screen())
+        self.stats = FakeAppiumStats()
+        self.sessions = {}
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+        self._routes = [
+            ("GET", r"/status", self._status),
+            ("POST", r"/session", self._new_session),
+            ("DELETE", r"/session/(?P<sid>[^/]+)", self._delete_session),
+            ("POST", r"/session/(?P<sid>[^/]+)/execute/sync", self._execute_script),
+            (
+                "POST",
+                r"/session/(?P<sid>[^/]+)/appium/device/(?P<action>terminate_app|activate_app)",
+                self._legacy_app_command,
+            ),
+            ("POST", r"/session/(?P<sid>[^/]+)/element", self._find_element),
+            ("POST", r"/session/(?P<sid>[^/]+)/elements", self._find_elements),
+            (
+                "POST",
+                r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/element",
+                self._find_child_element,
+            ),
+            (
+                "POST",
+                r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/elements",
+                self._find_child_elements,
+            ),
+            (
+                "GET",
+                r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/text",
+                self._element_text,
+            ),
+            (
+                "GET",
+                r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/attribute/(?P<name>[^/]+)",
+                self._element_attribute,
+            ),
+            (
+                "GET",
+                r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/displayed",
+                self._element_displayed,
+            ),
+            (
+                "GET",
+                r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/enabled",
+                self._element_enabled,
+            ),
+            (
+                "GET",
+                r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/rect",
+                self._element_rect,
+            ),
+            (
+                "POST",
+                r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/clear",
+                self._element_clear,
+            ),
+            (
+                "POST",
+                r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/value",
+                self._element_value,
+            ),
+            (
+                "POST",
+                r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/click",
+                self._element_click,
+            ),
+            ("POST", r"/session/(?P<sid>[^/]+)/actions", self._perform_actions),
+            ("GET", r"/session/(?P<sid>[^/]+)/source", self._page_source),
+            ("GET", r"/session/(?P<sid>[^/]+)/screenshot", self._screenshot),
+        ]
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.app = self
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            name="fake-appium",
+            daemon=True,
+        )
+        self._thread.start()
+        logger.debug(f"Fake Appium server listening on {self.url}")
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def kill_session(self, session_id):
+        """Drop a session server-side, as a crashed UiAutomator2 server would."""
+        with self._lock:
+            self.sessions.pop(session_id, None)
+
+    def set_page_source(self, page_source, session_id=None):
+        """Switch sessions to another screen, e.g. after a simulated scroll.
+
+        Args:
+            page_source: UiAutomator2-style XML of the new screen, or a list
+                of screens advanced by swipes.
+            session_id: Session to update. Defaults to all sessions and the
+                screen new sessions start on.
+        """
+        screens = _screens(page_source)
+        with self._lock:
+            if session_id is None:
+                self.screens = screens
+                sessions = list(self.sessions.values())
+            else:
+                sessions = [self.sessions[session_id]]
+            for session in sessions:
+                session.load(screens)
+
+    def handle(self, method, path, body):
+        """Route a request and return (HTTP status, JSON payload)."""
+        path = path.split("?", 1)[0].rstrip("/")
+        for route_method, pattern, handler in self._routes:
+            match = re.fullmatch(pattern, path)
+            if route_method == method and match:
+                command = handler.__name__.lstrip("_")
+                delay = self.latencies.get(command, self.latency)
+                self.stats.enter()
+                try:
+                    if delay:
+                        time.sleep(delay)
+                    self.stats.count(command)
+                    return 200, {"value": handler(body, **match.groupdict())}
+                except FakeAppiumError as e:
+                    return e.status, {
+                        "value": {
+                            "error": e.error,
+                            "message": e.message,
+                            "stacktrace": "",
+                        }
+                    }
+                finally:
+                    self.stats.leave()
+        return 404, {
+            "value": {
+                "error": "unknown command",
+                "message": f"{method} {path} is not supported by the fake server",
+                "stacktrace": "",
+            }
+        }
+
+    def _session(self, sid):
+        session = self.sessions.get(sid)
+        if session is None:
+            raise FakeAppiumError("invalid session id", f"Session {sid} not found")
+        return session
+
+    def _status(self, body):
+        return {"ready": True, "message": "fake appium"}
+
+    def _new_session(self, body):
+        capabilities = body.get("capabilities", {}).get("alwaysMatch", {})
+        with self._lock:
+            session = FakeSession(uuid.uuid4().hex, capabilities, self.screens)
+            self.sessions[session.session_id] = session
+            self.stats.session_creates += 1
+        return {"sessionId": session.session_id, "capabilities": capabilities}
+
+    def _delete_session(self, body, sid):
+        with self._lock:
+            self.sessions.pop(sid, None)
+            self.stats.session_deletes += 1
+        return None
+
+    def _execute_script(self, body, sid):
+        session = self._session(sid)
+        script = body.get("script", "")
+        args = (body.get("args") or [{}])[0]
+        if script in (
+            "mobile: terminateApp",
+            "mobile: activateApp",
+            "mobile: clearApp",
+        ):
+            session.app_events.append((script.split(": ")[1], args.get("appId")))
+            return True
+        if script == "mobile: queryAppState":
+            return 4
+        raise FakeAppiumError(
+            "unknown method exception", f"Unsupported script: {script}", status=404
+        )
+
+    def _legacy_app_command(self, body, sid, action):
+        session = self._session(sid)
+        name = "terminateApp" if action == "terminate_app" else "activateApp"
+        session.app_events.append((name, body.get("appId")))
+        return True
+
+    def _element(self, session, eid):
+        node = session.elements.get(eid)
+        if node is None:
+            raise FakeAppiumError("no such element", f"Element {eid} is unknown")
+        if node.getroottree().getroot() is not session.root:
+            raise FakeAppiumError(
+                "stale element reference", f"Element {eid} is no longer on screen"
+            )
+        return node
+
+    def _query(self, context, using, value):
+        try:
+            return find_nodes(context, using, value)
+        except InvalidSelectorException as e:
+            raise FakeAppiumError("invalid selector", e.msg, status=400) from e
+
+    def _reference(self, session, node):
+        eid = uuid.uuid4().hex
+        session.elements[eid] = node
+        return {ELEMENT_KEY: eid, "ELEMENT": eid}
+
+    def _find(self, body, sid, eid=None, single=True):
+        session = self._session(sid)
+        if eid is None and "scrollIntoView" in str(body.get("value")):
+            self._scroll_into_view(session, body.get("using"), body.get("value"))
+        context = self._element(session, eid) if eid else session.root
+        cost = self.find_costs.get(body.get("using"))
+        if cost:
+            time.sleep(cost * sum(1 for _ in session.root.iter()))
+        nodes = self._query(context, body.get("using"), body.get("value"))
+        if not single:
+            return [self._reference(session, node) for node in nodes]
+        if not nodes:
+            raise FakeAppiumError(
+                "no such element",
+                f"An element could not be located using {body.get('using')} "
+                f"'{body.get('value')}'",
+            )
+        return self._reference(session, nodes[0])
+
+    def _device_scroll(self, session, step):
+        time.sleep(self.swipe_time)
+        session.app_events.append(("scroll", step))
+        return session.scroll(step)
+
+    def _scroll_into_view(self, session, using, value):
+        # UiScrollable.scrollIntoView: scrollToBeginning, which swipes until
+        # nothing moves, then forward until the target shows up
+        if self._query(session.root, using, value):
+            return
+        while self._device_scroll(session, -1):
+            pass
+        while not self._query(session.root, using, value):
+            if not self._device_scroll(session, 1):
+                break
+
+    def _find_element(self, body, sid):
+        return self._find(body, sid)
+
+    def _find_elements(self, body, sid):
+        return self._find(body, sid, single=False)
+
+    def _find_child_element(self, body, sid, eid):
+        return self._find(body, sid, eid)
+
+    def _find_child_elements(self, body, sid, eid):
+        return self._find(body, sid, eid, single=False)
+
+    def _element_text(self, body, sid, eid):
+        return self._element(self._session(sid), eid).get("text", "")
+
+    def _element_attribute(self, body, sid, eid, name):
+        return SnapshotElement(self._element(self._session(sid), eid)).get_attribute(
+            name
+        )
+
+    def _element_displayed(self, body, sid, eid):
+        return self._element(self._session(sid), eid).get("displayed") == "true"
+
+    def _element_enabled(self, body, sid, eid):
+        return self._element(self._session(sid), eid).get("enabled", "true") == "true"
+
+    def _element_rect(self, body, sid, eid):
+        return SnapshotElement(self._element(self._session(sid), eid)).rect
+
+    def _element_clear(self, body, sid, eid):
+        self._element(self._session(sid), eid).set("text", "")
+        return None
+
+    def _element_value(self, body, sid, eid):
+        node = self._element(self._session(sid), eid)
+        node.set("text", node.get("text", "") + body.get("text", ""))
+        return None
+
+    def _element_click(self, body, sid, eid):
+        session = self._session(sid)
+        node = self._element(session, eid)
+        session.app_events.append(
+            ("click", node.get("content-desc") or node.get("text"))
+        )
+        if node.get("content-desc") == "test-REMOVE":
+            session.remove_item(node)
+        return None
+
+    def _perform_actions(self, body, sid):
+        session = self._session(sid)
+        session.app_events.append(("actions", len(body.get("actions", []))))
+        moves = [
+            action["y"]
+            for source in body.get("actions", [])
+            for action in source.get("actions", [])
+            if action.get("type") == "pointerMove" and "y" in action
+        ]
+        # Finger moving down scrolls back up the list
+        step = -1 if len(moves) > 1 and moves[-1] > moves[0] else 1
+        time.sleep(self.swipe_time)
+        session.scroll(step)
+        return None
+
+    def _page_source(self, body, sid):
+        return self._session(sid).page_source
+
+    def _screenshot(self, body, sid):
+        self._session(sid)
+        return base64.b64encode(SCREENSHOT_PNG).decode("ascii")
+
+
+class InProcessConnection(http_client.PooledAppiumConnection):
+    """Command executor handing requests straight to a FakeAppiumServer.
+
+    Commands go through the Appium client and PooledAppiumConnection.execute()
+    as usual, only the HTTP round trip is replaced by a call to
+    server.handle() on the calling thread; the server need not be started.
+    The CPU time the calling thread spends in the server (request handling
+    and response encoding) is summed in server_seconds, so it can be told
+    apart from the framework's own. The server's latency settings still apply.
+
+    Args:
+        server: FakeAppiumServer answering the commands.
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.server_seconds = 0.0
+        super().__init__(AppiumClientConfig(remote_server_addr="http://in-process"))
+
+    def _request(self, method, url, body=None):
+        started = time.thread_time()
+        try:
+            status, payload = self.server.handle(
+                method, urlparse(url).path, json.loads(body) if body else {}
+            )
+            data = json.dumps(payload)
+        finally:
+            self.server_seconds += time.thread_time() - started
+        if status >= 400:
+            return {"status": status, "value": data}
+        return json.loads(data)
+
+
+def in_process_driver(server, options):
+    """Start a session on a fake server without going through HTTP.
+
+    Args:
+        server: FakeAppiumServer, started or not.
+        options: AppiumOptions for the session.
+
+    Returns:
+        Appium WebDriver instance using an InProcessConnection.
+    """
+    return webdriver.Remote(
+        command_executor=InProcessConnection(server), options=options
+    )
@@ -1,16 +1,71 @@
-def take_screenshot(driver, screenshots_dir, name):
+from config import settings
+from utils import artifact_store, screenshot_buffer, screenshot_writer
+from utils.async_driver import AsyncDriver
+
+
+def take_screenshot(driver, screenshots_dir, name, keep=False):
     """Take and save screenshot with given name.
 
+    With settings.SCREENSHOT_ASYNC only the capture runs on the calling
+    thread; the file is written by the background screenshot writer and is
+    complete after screenshot_writer.flush() (done at driver teardown).
+    With SCREENSHOT_MODE=on_failure the screenshot is only buffered and
+    written if the test fails, see utils/screenshot_buffer.py.
+    With ARTIFACT_STORE enabled screenshots go into the artifact store on
+    every path.
+
     Args:
         driver: Appium WebDriver instance.
         screenshots_dir: Directory path to save screenshot.
         name: Screenshot name without extension.
+        keep: Write the screenshot whatever SCREENSHOT_MODE is.
 
     Returns:
         Full filepath to saved screenshot.
     """
     filename = f"{name}.png"
     filepath = screenshots_dir / filename
+    store = artifact_store.get_store()
 
-    driver.save_screenshot(str(filepath))
+    if settings.SCREENSHOT_MODE == "on_failure" and not keep:
+        screenshot_buffer.get_buffer().add(driver.get_screenshot_as_base64(), filepath)
+    elif settings.SCREENSHOT_ASYNC:
+        screenshot_writer.get_writer().submit(
+            driver.get_screenshot_as_base64(), filepath
+        )
+    elif store is not None:
+        store.put(driver.get_screenshot_as_png(), filepath, kind="screenshot")
+    else:
+        driver.save_screenshot(str(filepath))
     return str(filepath)
+
+
+def capture_state(driver, screenshots_dir, name):
+    """Save screenshot and page source of the current screen.
+
+    Both are requested concurrently through the async driver facade. With
+    ARTIFACT_STORE enabled they go into the artifact store instead.
+
+    Args:
+        driver: Appium WebDriver instance.
+        screenshots_dir: Directory path to save files to.
+        name: File name without extension.
+
+    Returns:
+        Tuple of (screenshot filepath, page source filepath).
+    """
+    adriver = AsyncDriver.for_driver(driver)
+    png, source = adriver.run_sync(
+        adriver.gather(adriver.screenshot(), adriver.page_source())
+    )
+
+    screenshot_path = screenshots_dir / f"{name}.png"
+    source_path = screenshots_dir / f"{name}.xml"
+    store = artifact_store.get_store()
+    if store is not None:
+        store.put(png, screenshot_path, kind="screenshot")
+        store.put(source, source_path, kind="page_source")
+    else:
+        screenshot_path.write_bytes(png)
+        source_path.write_text(source, encoding="utf-8")
+    return str(screenshot_path), str(source_path)
@@ -0,0 +1,233 @@
+"""
+Shared HTTP connection pool for the Appium client.
+
+By default every driver gets its own AppiumConnection and with it a private
+urllib3 pool holding a single keep-alive connection, so each new session
+opens new TCP connections and concurrent commands on one session fall back
+to throwaway connections. PooledAppiumConnection makes all drivers of the
+process (pooled sessions, pre-warm threads, async facade workers) share one
+pool per configuration. Worker processes of the device scheduler each have
+their own pool, sockets can't be shared across processes.
+"""
+
+import logging
+import threading
+import time
+
+import urllib3
+from appium import webdriver
+from appium.webdriver.appium_connection import AppiumConnection
+from appium.webdriver.client_config import AppiumClientConfig
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
+
+from config import settings
+from utils import command_stats, page_profiler, tracing
+
+logger = logging.getLogger(__name__)
+
+_managers = {}
+_managers_lock = threading.Lock()
+_closed_totals = {"new": 0, "requests": 0}
+_last_response = threading.local()
+
+
+class ResetRetry(Retry):
+    """Retry connection errors and resets, but never a timed out command.
+
+    A reset means the request never got a response from a dead keep-alive
+    socket, while a read timeout means the driver may still be executing the
+    command (retrying a click could click twice).
+    """
+
+    def increment(self, method=None, url=None, response=None, error=None, **kwargs):
+        if isinstance(error, ReadTimeoutError):
+            return Retry.increment(
+                self.new(read=False), method, url, response, error, **kwargs
+            )
+        return super().increment(method, url, response, error, **kwargs)
+
+
+class MeasuredPoolManager:
+    """Pool manager proxy noting body sizes and retries of each response.
+
+    The details are kept per thread for PooledAppiumConnection.execute(),
+    which runs on the thread that sent the request.
+    """
+
+    def __init__(self, manager):
+        self._manager = manager
+
+    def request(self, method, url, body=None, **kwargs):
+        response = self._manager.request(method, url, body=body, **kwargs)
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        retries = response.retries
+        _last_response.details = (
+            len(body or b""),
+            len(response.data),
+            len(retries.history) if retries is not None else 0,
+            response.status >= 400,
+        )
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self._manager, name)
+
+
+class PooledAppiumConnection(AppiumConnection):
+    """AppiumConnection drawing connections from a process-wide pool."""
+
+    def __init__(self, client_config, pool_size=4, retries=2):
+        """Initialize PooledAppiumConnection.
+
+        Args:
+            client_config: AppiumClientConfig with server address, keep-alive
+                and timeout (seconds or urllib3.Timeout).
+            pool_size: Connections kept open per Appium host.
+            retries: Retries on connection errors and resets, for any HTTP
+                method. Read timeouts are never retried.
+        """
+        self.pool_size = pool_size
+        self.retries = retries
+        super().__init__(client_config=client_config)
+        if settings.COMMAND_STATS and hasattr(self, "_conn"):
+            self._conn = MeasuredPoolManager(self._conn)
+
+    def _get_connection_manager(self):
+        if self._proxy_url or not self._client_config.keep_alive:
+            return super()._get_connection_manager()
+
+        key = (self.pool_size, self.retries, str(self._client_config.timeout))
+        with _managers_lock:
+            manager = _managers.get(key)
+            if manager is None:
+                manager = urllib3.PoolManager(
+                    maxsize=self.pool_size,
+                    timeout=self._client_config.timeout,
+                    retries=ResetRetry(
+                        total=self.retries,
+                        connect=self.retries,
+                        read=self.retries,
+                        status=0,
+                        allowed_methods=None,
+                        backoff_factor=0.1,
+                        raise_on_status=False,
+                    ),
+                )
+                _managers[key] = manager
+                logger.debug(f"Created shared HTTP pool {key}")
+        return manager
+
+    def execute(self, command, params):
+        """Send a command, recording its statistics and trace span."""
+        page_profiler.count_command()
+        strategy = params.get("using") if isinstance(params, dict) else None
+        _last_response.details = None
+        started = time.perf_counter()
+        try:
+            if not tracing.is_enabled():
+                return super().execute(command, params)
+            # Only the locator of find commands: other commands (send keys)
+            # carry typed text in 'value'
+            args = (
+                {"using": params["using"], "value": params.get("value")}
+                if strategy
+                else {}
+            )
+            with tracing.span(command, "command", **args):
+                return super().execute(command, params)
+        finally:
+            details = _last_response.details
+            if details is not None:
+                command_stats.record(
+                    command, strategy, time.perf_counter() - started, *details
+                )
+
+    def close(self):
+        """Keep shared connections open for other drivers, see close_all()."""
+        if not self._client_config.keep_alive or self._proxy_url:
+            super().close()
+
+
+def create_connection(
+    server_url,
+    pool_size=4,
+    keep_alive=True,
+    connect_timeout=10.0,
+    read_timeout=120.0,
+    retries=2,
+):
+    """Create a pooled command executor for an Appium server.
+
+    Args:
+        server_url: Appium server URL.
+        pool_size: Connections kept open per Appium host.
+        keep_alive: Reuse connections between requests.
+        connect_timeout: TCP connect timeout in seconds.
+        read_timeout: Response timeout in seconds.
+        retries: Retries on connection errors and resets.
+
+    Returns:
+        PooledAppiumConnection instance.
+    """
+    client_config = AppiumClientConfig(
+        remote_server_addr=server_url,
+        keep_alive=keep_alive,
+        timeout=urllib3.Timeout(connect=connect_timeout, read=read_timeout),
+    )
+    return PooledAppiumConnection(client_config, pool_size=pool_size, retries=retries)
+
+
+def create_driver(server_url, options, **pool_options):
+    """Start an Appium session using the shared connection pool.
+
+    Args:
+        server_url: Appium server URL.
+        options: AppiumOptions for the session.
+        **pool_options: Passed to create_connection().
+
+    Returns:
+        Appium WebDriver instance.
+    """
+    return webdriver.Remote(
+        command_executor=create_connection(server_url, **pool_options),
+        options=options,
+    )
+
+
+def connection_stats():
+    """Count connections opened and requests served by the shared pools.
+
+    Returns:
+        Dict with 'new' (connections opened), 'reused' (requests served on
+        an already open connection) and 'requests'.
+    """
+    with _managers_lock:
+        totals = _pool_totals(_managers.values())
+        opened = totals["new"] + _closed_totals["new"]
+        requests = totals["requests"] + _closed_totals["requests"]
+    return {"new": opened, "reused": max(requests - opened, 0), "requests": requests}
+
+
+def _pool_totals(managers):
+    totals = {"new": 0, "requests": 0}
+    for manager in managers:
+        for key in manager.pools.keys():
+            pool = manager.pools.get(key)
+            if pool is not None:
+                totals["new"] += pool.num_connections
+                totals["requests"] += pool.num_requests
+    return totals
+
+
+def close_all():
+    """Close every connection of the shared pools, keeping their counters."""
+    with _managers_lock:
+        managers = list(_managers.values())
+        totals = _pool_totals(managers)
+        _closed_totals["new"] += totals["new"]
+        _closed_totals["requests"] += totals["requests"]
+        _managers.clear()
+    for manager in managers:
+        manager.clear()
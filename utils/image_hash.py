@@ -0,0 +1,113 @@
+"""
+Perceptual hashing of screenshots.
+
+A difference hash (dHash): the screenshot is scaled down to a small grayscale
+grid and every bit tells whether a cell is brighter than its right neighbour.
+Screenshots showing the same screen give (nearly) equal hashes whatever the
+PNG encoding, while a changed layout, text or row count flips many bits.
+
+ScreenshotDeduplicator uses it to keep only one file of consecutive
+near-identical screenshots, see ScreenshotWriter.
+"""
+
+import io
+import json
+import logging
+from collections import deque
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+DUPLICATES_FILE = "duplicates.json"
+
+
+def dhash(png, size=16):
+    """Compute the difference hash of an image.
+
+    Args:
+        png: Encoded image bytes.
+        size: Grid height; the hash has size * size bits.
+
+    Returns:
+        Flat numpy bool array of size * size bits.
+    """
+    with Image.open(io.BytesIO(png)) as image:
+        grid = image.convert("L").resize((size + 1, size), Image.Resampling.BOX)
+    pixels = np.asarray(grid, dtype=np.int16)
+    return (pixels[:, 1:] > pixels[:, :-1]).ravel()
+
+
+class ScreenshotDeduplicator:
+    """Detects screenshots nearly identical to one kept shortly before."""
+
+    def __init__(self, threshold=0.99, history=4, hash_size=16):
+        """Initialize ScreenshotDeduplicator.
+
+        Args:
+            threshold: Minimum share of equal hash bits for a screenshot to
+                count as a duplicate.
+            history: Kept screenshots per directory to compare against.
+            hash_size: Grid height of the hashes, see dhash().
+        """
+        self.threshold = threshold
+        self.history = history
+        self.hash_size = hash_size
+        self._kept = {}
+
+    def check(self, png, path):
+        """Compare a screenshot with the ones kept in its directory.
+
+        A screenshot that is no duplicate is remembered as kept, so the
+        caller must write it to path.
+
+        Args:
+            png: PNG bytes of the screenshot.
+            path: Path the screenshot is meant to be saved under.
+
+        Returns:
+            Path of the kept screenshot it duplicates, or None.
+        """
+        hashes = dhash(png, self.hash_size)
+        kept = self._kept.setdefault(path.parent, deque(maxlen=self.history))
+        if kept:
+            scores = (
+                1.0
+                - np.count_nonzero(np.stack([h for h, _ in kept]) != hashes, axis=1)
+                / hashes.size
+            )
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold:
+                original = kept[best][1]
+                self._record_duplicate(path, original, float(scores[best]))
+                return original
+        kept.append((hashes, path))
+        return None
+
+    @staticmethod
+    def _record_duplicate(path, original, score):
+        manifest_path = path.parent / DUPLICATES_FILE
+        manifest = {}
+        if manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        manifest[path.name] = {"same_as": original.name, "similarity": round(score, 4)}
+        manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        logger.debug(f"Screenshot {path.name} duplicates {original.name} ({score:.3f})")
+
+
+def resolve(path):
+    """Get the file holding a screenshot, following the duplicates manifest.
+
+    Args:
+        path: Path a screenshot was saved under.
+
+    Returns:
+        The path itself, or that of the kept screenshot it duplicates.
+    """
+    manifest_path = path.parent / DUPLICATES_FILE
+    if path.exists() or not manifest_path.exists():
+        return path
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    entry = manifest.get(path.name)
+    return path.parent / entry["same_as"] if entry else path
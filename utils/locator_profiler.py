@@ -0,0 +1,355 @@
+"""
+Locator cost profiler and strategy optimizer.
+
+Measures the lookup latency of every locator declared on the page object
+classes (class attributes holding an (AppiumBy, value) tuple), proposes
+faster equivalent locators (accessibility id, resource id, UiSelector
+chains) and prints a report ranked by the time a replacement would save.
+
+A proposal is only made when it returns exactly the same elements as the
+original locator in every captured page source. Without --server the
+latencies come from the fake Appium server serving the captured page sources
+with a per-strategy cost model (XPath dumps the whole hierarchy on
+UiAutomator2, native lookups don't); with --server they are measured on a
+device, on whatever screen the app currently shows.
+
+Locators built at runtime inside page methods (f-string XPaths) are not
+covered.
+
+Usage:
+    python -m utils.locator_profiler
+    python -m utils.locator_profiler --sources results/page_sources --repeat 10
+    python -m utils.locator_profiler --server http://localhost:4723
+"""
+
+import argparse
+import importlib
+import inspect
+import json
+import logging
+import pkgutil
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from appium.options.android import UiAutomator2Options
+from appium.webdriver.common.appiumby import AppiumBy
+
+from config import settings
+from utils import http_client
+from utils.fake_appium import FakeAppiumServer
+from utils.page_source import PageSnapshot, find_nodes
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_SOURCES = BASE_DIR / "tests" / "fixtures" / "page_sources"
+
+STRATEGIES = (
+    AppiumBy.ACCESSIBILITY_ID,
+    AppiumBy.ID,
+    AppiumBy.ANDROID_UIAUTOMATOR,
+    AppiumBy.CLASS_NAME,
+    AppiumBy.XPATH,
+)
+
+# Alternatives must be at least this much faster to be suggested
+MIN_SAVING = 0.1
+
+# Seconds per node of the screen hierarchy, for the offline stand-in
+FIND_COSTS = {
+    AppiumBy.XPATH: 0.0004,
+    AppiumBy.ANDROID_UIAUTOMATOR: 0.00005,
+    AppiumBy.CLASS_NAME: 0.00005,
+    AppiumBy.ACCESSIBILITY_ID: 0.00002,
+    AppiumBy.ID: 0.00002,
+}
+
+
+def collect_locators(package="pages"):
+    """Collect locators declared as class attributes of page objects.
+
+    Args:
+        package: Package holding the page object modules.
+
+    Returns:
+        Dict mapping (strategy, value) locator to a list of names such as
+        'CartPage.FIRST_ITEM', in declaration order.
+    """
+    from pages.base_page import BasePage
+
+    package_dir = BASE_DIR / package
+    locators = {}
+    for module_info in sorted(pkgutil.iter_modules([str(package_dir)])):
+        module = importlib.import_module(f"{package}.{module_info.name}")
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__ or not issubclass(cls, BasePage):
+                continue
+            for attr, value in vars(cls).items():
+                if (
+                    isinstance(value, tuple)
+                    and len(value) == 2
+                    and value[0] in STRATEGIES
+                ):
+                    locators.setdefault(value, []).append(f"{cls.__name__}.{attr}")
+    return locators
+
+
+def load_sources(paths):
+    """Load captured page sources.
+
+    Args:
+        paths: Iterable of XML files or directories containing them.
+
+    Returns:
+        Dict mapping source name to XML string.
+    """
+    sources = {}
+    for path in map(Path, paths):
+        files = sorted(path.glob("*.xml")) if path.is_dir() else [path]
+        for file in files:
+            sources[file.stem] = file.read_text(encoding="utf-8")
+    return sources
+
+
+def _ui_string(value):
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _candidates(nodes):
+    """Build alternative locators from attributes shared by all nodes."""
+
+    def shared(attribute):
+        values = {node.get(attribute) or "" for node in nodes}
+        return values.pop() if len(values) == 1 else ""
+
+    description = shared("content-desc")
+    resource_id = shared("resource-id")
+    text = shared("text")
+    class_name = shared("class")
+
+    candidates = []
+    if description:
+        candidates.append((AppiumBy.ACCESSIBILITY_ID, description))
+    if resource_id:
+        candidates.append((AppiumBy.ID, resource_id))
+    selectors = []
+    if description:
+        selectors.append(f".description({_ui_string(description)})")
+        if class_name:
+            selectors.append(
+                f".className({_ui_string(class_name)})"
+                f".description({_ui_string(description)})"
+            )
+    if resource_id:
+        selectors.append(f".resourceId({_ui_string(resource_id)})")
+    if text:
+        selectors.append(f".text({_ui_string(text)})")
+        if class_name:
+            selectors.append(
+                f".className({_ui_string(class_name)}).text({_ui_string(text)})"
+            )
+    candidates.extend(
+        (AppiumBy.ANDROID_UIAUTOMATOR, f"new UiSelector(){selector}")
+        for selector in selectors
+    )
+    return candidates
+
+
+def propose(locator, sources):
+    """Find equivalent locators for one locator.
+
+    Args:
+        locator: Tuple of (AppiumBy, value).
+        sources: Dict of source name to XML string, see load_sources().
+
+    Returns:
+        Tuple of (list of verified alternative locators, number of sources
+        the original locator matched in).
+    """
+    roots = [PageSnapshot(xml).root for xml in sources.values()]
+    matches = [find_nodes(root, *locator) for root in roots]
+    matched = [(root, nodes) for root, nodes in zip(roots, matches) if nodes]
+    if not matched:
+        return [], 0
+
+    candidates = []
+    for candidate in _candidates([node for _, nodes in matched for node in nodes]):
+        candidates.append(candidate)
+        if len(matched[0][1]) == 1 and candidate[0] == AppiumBy.ANDROID_UIAUTOMATOR:
+            # Single element among several with the same attributes
+            all_nodes = find_nodes(matched[0][0], *candidate)
+            if matched[0][1][0] in all_nodes and len(all_nodes) > 1:
+                index = all_nodes.index(matched[0][1][0])
+                candidates.append((candidate[0], f"{candidate[1]}.instance({index})"))
+
+    verified = []
+    for candidate in dict.fromkeys(candidates):
+        if candidate == locator:
+            continue
+        if all(
+            find_nodes(root, *candidate) == nodes for root, nodes in zip(roots, matches)
+        ):
+            verified.append(candidate)
+    return verified, len(matched)
+
+
+def measure(driver, locator, repeat=5):
+    """Median latency of driver.find_elements for a locator, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        driver.find_elements(*locator)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+class LocatorProfiler:
+    """Measures locators and their verified alternatives on a driver."""
+
+    def __init__(self, locators, sources, repeat=5):
+        """Initialize LocatorProfiler.
+
+        Args:
+            locators: Dict from collect_locators().
+            sources: Dict from load_sources(), used to verify alternatives
+                (and served as screens by the offline stand-in).
+            repeat: Lookups per locator and screen.
+        """
+        self.locators = locators
+        self.sources = sources
+        self.repeat = repeat
+        self.proposals = {locator: propose(locator, sources) for locator in locators}
+
+    def run(self, driver, screens=None):
+        """Measure every locator and alternative.
+
+        Args:
+            driver: Appium WebDriver to look elements up with.
+            screens: Optional callable taking an XML page source and showing
+                it (offline stand-in). Without it the current screen is used.
+
+        Returns:
+            Report entries ranked by possible saving, then latency.
+        """
+        timings = {}
+        for source in self.sources.values() if screens else [None]:
+            if screens:
+                screens(source)
+            for locator, (alternatives, _) in self.proposals.items():
+                for candidate in (locator, *alternatives):
+                    timings.setdefault(candidate, []).append(
+                        measure(driver, candidate, self.repeat)
+                    )
+
+        report = []
+        for locator, names in self.locators.items():
+            alternatives, verified_in = self.proposals[locator]
+            ms = statistics.mean(timings[locator]) * 1000
+            options = sorted(
+                (
+                    {
+                        "strategy": by,
+                        "value": value,
+                        "ms": round(statistics.mean(timings[(by, value)]) * 1000, 3),
+                    }
+                    for by, value in alternatives
+                ),
+                key=lambda option: option["ms"],
+            )
+            best = (
+                options[0]
+                if options and options[0]["ms"] < ms * (1 - MIN_SAVING)
+                else None
+            )
+            report.append(
+                {
+                    "names": names,
+                    "strategy": locator[0],
+                    "value": locator[1],
+                    "ms": round(ms, 3),
+                    "verified_in": verified_in,
+                    "alternatives": options,
+                    "best": best,
+                    "saving_ms": round(ms - best["ms"], 3) if best else 0.0,
+                }
+            )
+        report.sort(key=lambda entry: (-entry["saving_ms"], -entry["ms"]))
+        return report
+
+
+def format_report(report):
+    """Render report entries as a text table."""
+    lines = [f"{'locator':<44}{'strategy':<22}{'ms':>8}  {'suggestion':<60}{'ms':>8}"]
+    for entry in report:
+        best = entry["best"]
+        suggestion = f"{best['strategy']}: {best['value']}" if best else "-"
+        if not entry["verified_in"]:
+            suggestion = "(not found in captured page sources)"
+        lines.append(
+            f"{', '.join(entry['names'])[:43]:<44}{entry['strategy']:<22}"
+            f"{entry['ms']:>8.2f}  {suggestion[:59]:<60}"
+            f"{best['ms'] if best else 0:>8.2f}"
+        )
+    return "\n".join(lines)
+
+
+def _device_options():
+    options = UiAutomator2Options()
+    options.no_reset = True
+    if settings.UDID:
+        options.udid = settings.UDID
+    if settings.APP_PACKAGE:
+        options.app_package = settings.APP_PACKAGE
+        options.app_activity = settings.APP_ACTIVITY
+    return options
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
+    parser = argparse.ArgumentParser(description="Profile page object locators")
+    parser.add_argument(
+        "--sources",
+        nargs="+",
+        default=[str(DEFAULT_SOURCES)],
+        help="Captured page source files or directories",
+    )
+    parser.add_argument(
+        "--server", help="Measure on a device through this Appium server"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--output", default=str(settings.RESULTS_DIR / "locator_report.json")
+    )
+    args = parser.parse_args(argv)
+
+    sources = load_sources(args.sources)
+    profiler = LocatorProfiler(collect_locators(), sources, repeat=args.repeat)
+    if args.server:
+        driver = http_client.create_driver(args.server, _device_options())
+        try:
+            report = profiler.run(driver)
+        finally:
+            driver.quit()
+    else:
+        with FakeAppiumServer(find_costs=FIND_COSTS) as server:
+            driver = http_client.create_driver(server.url, UiAutomator2Options())
+            report = profiler.run(
+                driver,
+                screens=lambda source: server.set_page_source(
+                    source, driver.session_id
+                ),
+            )
+            driver.quit()
+
+    print(format_report(report))
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    logger.info(f"Locator report written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
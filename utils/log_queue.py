@@ -0,0 +1,195 @@
+"""
+Non-blocking logging for the test process.
+
+Loggers only put records on an in-memory queue (QueueHandler); a listener
+thread formats them and does all I/O: the console, results/logs/appium.log
+(rotated at LOG_MAX_BYTES, rotated files gzip-compressed) and one file per
+test. Records are queued unformatted, so "%s"-style arguments are only
+rendered on the listener thread; f-strings are still formatted by the caller.
+
+The test a record belongs to is decided when it is logged, not when it is
+written, so records of one test end up in its file even though they are
+written later. start_test() sets the test for the whole process: records
+of any thread go to it, as one process runs one test at a time. Background
+threads whose work belongs elsewhere say so explicitly: work queued during
+one test and done later runs in routed_to() with the test of the caller
+(see current_test()), and threads working for no test (session prewarming)
+call route_thread(None).
+"""
+
+import contextlib
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+
+from config import settings
+
+FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_current_test = None
+_thread = threading.local()
+_listener = None
+_queue = None
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread."""
+
+    def prepare(self, record):
+        record.test_log = current_test()
+        return record
+
+
+class PerTestFileHandler(logging.Handler):
+    """Writes each record to the log file of the test it was logged in."""
+
+    def __init__(self):
+        super().__init__()
+        self._path = None
+        self._stream = None
+
+    def emit(self, record):
+        path = getattr(record, "test_log", None)
+        if path is None:
+            return
+        try:
+            if path != self._path:
+                self.close_file()
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self._stream = open(path, "a", encoding="utf-8")
+                self._path = path
+            self._stream.write(self.format(record) + "\n")
+            self._stream.flush()
+        except Exception:
+            self.handleError(record)
+
+    def close_file(self):
+        if self._stream is not None:
+            self._stream.close()
+        self._stream = self._path = None
+
+    def close(self):
+        self.close_file()
+        super().close()
+
+
+def _gzip_rotator(source, dest):
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def _file_handler(log_file):
+    handler = logging.handlers.RotatingFileHandler(
+        log_file,
+        maxBytes=settings.LOG_MAX_BYTES,
+        backupCount=settings.LOG_BACKUP_COUNT,
+        encoding="utf-8",
+    )
+    handler.namer = lambda name: f"{name}.gz"
+    handler.rotator = _gzip_rotator
+    return handler
+
+
+def configure(log_file, level=logging.INFO, use_queue=True, stream=None):
+    """Set up the root logger.
+
+    Args:
+        log_file: Main log file, rotated at settings.LOG_MAX_BYTES.
+        level: Root logger level.
+        use_queue: Hand records to a listener thread. Without it handlers
+            run on the logging thread, as with logging.basicConfig.
+        stream: Console stream, sys.stderr by default.
+    """
+    global _listener, _queue
+    shutdown()
+    handlers = [
+        _file_handler(log_file),
+        logging.StreamHandler(stream),
+        PerTestFileHandler(),
+    ]
+    formatter = logging.Formatter(FORMAT)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(level)
+    if use_queue:
+        _queue = queue.Queue()
+        _listener = logging.handlers.QueueListener(
+            _queue, *handlers, respect_handler_level=True
+        )
+        _listener.start()
+        root.addHandler(_DeferredQueueHandler(_queue))
+    else:
+        handlers[-1].addFilter(_tag_test)
+        for handler in handlers:
+            root.addHandler(handler)
+
+
+def _tag_test(record):
+    record.test_log = current_test()
+    return True
+
+
+def current_test():
+    """Get the test log file records of the calling thread go to, or None."""
+    if getattr(_thread, "routed", False):
+        return _thread.test_log
+    return _current_test
+
+
+def route_thread(log_path):
+    """Route records of the calling thread to log_path, whatever test runs.
+
+    Args:
+        log_path: Test log file, None to keep the thread's records out of
+            every test's file.
+    """
+    _thread.routed = True
+    _thread.test_log = log_path
+
+
+@contextlib.contextmanager
+def routed_to(log_path):
+    """Route records of the calling thread to log_path within the block."""
+    previous = (getattr(_thread, "routed", False), getattr(_thread, "test_log", None))
+    route_thread(log_path)
+    try:
+        yield
+    finally:
+        _thread.routed, _thread.test_log = previous
+
+
+def start_test(log_path):
+    """Route records logged from now on to a test's log file."""
+    global _current_test
+    _current_test = log_path
+
+
+def end_test():
+    """Stop routing records to the current test's log file."""
+    global _current_test
+    _current_test = None
+
+
+def flush():
+    """Wait until the listener has handled every queued record."""
+    if _queue is not None:
+        _queue.join()
+
+
+def shutdown():
+    """Handle the queued records and stop the listener thread."""
+    global _listener, _queue
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+    _listener = _queue = None
@@ -0,0 +1,147 @@
+"""
+Opt-in profiling of page object methods.
+
+BasePage wraps the public methods of every page class with profiled(). Once
+enable() is called (PAGE_PROFILE=true does it in tests/conftest.py) each call
+records its wall time and the number of WebDriver commands the calling
+thread sent meanwhile, counted by PooledAppiumConnection. Times and command
+counts are inclusive: a method calling other page methods includes them,
+commands sent by async driver worker threads are not counted.
+
+report() aggregates the calls per method across the run, by total time.
+"""
+
+import functools
+import inspect
+import json
+import logging
+import statistics
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_enabled = False
+_lock = threading.Lock()
+_calls = {}
+_commands = threading.local()
+
+
+def enable():
+    """Start profiling page object method calls."""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Stop profiling, keeping the calls recorded so far."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    """Check whether page object methods are being profiled."""
+    return _enabled
+
+
+def reset():
+    """Drop all recorded calls."""
+    with _lock:
+        _calls.clear()
+
+
+def count_command():
+    """Count a WebDriver command sent by the current thread."""
+    _commands.count = getattr(_commands, "count", 0) + 1
+
+
+def _command_count():
+    return getattr(_commands, "count", 0)
+
+
+def profiled(name, func):
+    """Wrap a function so its calls are profiled while profiling is on.
+
+    Generator functions are returned unwrapped, their time belongs to the
+    code iterating them.
+
+    Args:
+        name: Name in the report, e.g. 'ProductsPage.catalog'.
+        func: Function to wrap.
+
+    Returns:
+        Wrapped function.
+    """
+    if inspect.isgeneratorfunction(func):
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        commands = _command_count()
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            sent = _command_count() - commands
+            with _lock:
+                _calls.setdefault(name, []).append((elapsed, sent))
+
+    return wrapper
+
+
+def profile_methods(cls):
+    """Wrap the public methods a class defines with profiled()."""
+    for attr, value in list(vars(cls).items()):
+        if not attr.startswith("_") and inspect.isfunction(value):
+            setattr(cls, attr, profiled(f"{cls.__name__}.{attr}", value))
+    return cls
+
+
+def report(limit=None):
+    """Aggregate the recorded calls per method.
+
+    Args:
+        limit: Return at most this many rows.
+
+    Returns:
+        List of dicts with 'method', 'calls', 'total_s', 'mean_ms', 'p95_ms'
+        and 'driver_calls' (total and 'driver_calls_per_call'), by total
+        time.
+    """
+    with _lock:
+        calls = {name: list(records) for name, records in _calls.items()}
+    rows = []
+    for name, records in calls.items():
+        times = [elapsed for elapsed, _ in records]
+        commands = sum(sent for _, sent in records)
+        p95 = statistics.quantiles(times, n=20)[-1] if len(times) > 1 else times[0]
+        rows.append(
+            {
+                "method": name,
+                "calls": len(records),
+                "total_s": round(sum(times), 4),
+                "mean_ms": round(statistics.mean(times) * 1000, 2),
+                "p95_ms": round(p95 * 1000, 2),
+                "driver_calls": commands,
+                "driver_calls_per_call": round(commands / len(records), 2),
+            }
+        )
+    rows.sort(key=lambda row: row["total_s"], reverse=True)
+    return rows[:limit] if limit else rows
+
+
+def export(path):
+    """Write report() as JSON.
+
+    Returns:
+        Path of the written file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report(), indent=2), encoding="utf-8")
+    logger.info(f"Page object profile written to {path}")
+    return path
@@ -0,0 +1,268 @@
+"""
+Local queries against a page source snapshot.
+
+Fetching driver.page_source once and evaluating locators on the parsed XML
+replaces a find_element/.text round trip per element with a single request
+per screen. Snapshot elements are read-only, interactions still need a real
+WebElement located through the driver.
+"""
+
+import logging
+import re
+
+from appium.webdriver.common.appiumby import AppiumBy
+from lxml import etree
+from selenium.common.exceptions import InvalidSelectorException, NoSuchElementException
+
+logger = logging.getLogger(__name__)
+
+ATTRIBUTE_NAMES = {
+    "contentDescription": "content-desc",
+    "content-desc": "content-desc",
+    "resourceId": "resource-id",
+    "resource-id": "resource-id",
+    "className": "class",
+    "class": "class",
+    "longClickable": "long-clickable",
+}
+
+_UI_SELECTOR_ATTRIBUTES = {
+    "text": ("text", "="),
+    "textContains": ("text", "contains"),
+    "textStartsWith": ("text", "starts-with"),
+    "description": ("content-desc", "="),
+    "descriptionContains": ("content-desc", "contains"),
+    "descriptionStartsWith": ("content-desc", "starts-with"),
+    "resourceId": ("resource-id", "="),
+    "className": ("class", "="),
+}
+_UI_SELECTOR_CALL = re.compile(
+    r'\s*\.(\w+)\((?:"((?:[^"\\]|\\.)*)"|\s*(\d+)\s*|[^)]*)\)'
+)
+_BOUNDS = re.compile(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]")
+
+
+def _literal(value):
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    parts = value.split("'")
+    return "concat(" + ', "\'", '.join(f"'{part}'" for part in parts) + ")"
+
+
+def ui_selector_to_xpath(selector):
+    """Translate an UiSelector (or UiScrollable.scrollIntoView) to XPath.
+
+    Only the innermost UiSelector is used, i.e. the scrollIntoView() target,
+    and only attribute conditions (text, description, resourceId, className
+    and their Contains/StartsWith variants) plus instance() are supported.
+
+    Args:
+        selector: UiAutomator selector string.
+
+    Returns:
+        Relative XPath expression.
+
+    Raises:
+        InvalidSelectorException: If the selector has no supported condition
+            or calls any other UiSelector method, e.g. index() or
+            clickable(), which the XPath would silently leave out.
+    """
+    target = selector.rsplit("new UiSelector()", 1)[-1]
+    conditions = []
+    instance = None
+    position = 0
+    for call in _UI_SELECTOR_CALL.finditer(target):
+        if call.start() != position:
+            break
+        position = call.end()
+        method, string, number = call.group(1, 2, 3)
+        if method in _UI_SELECTOR_ATTRIBUTES and string is not None:
+            attribute, function = _UI_SELECTOR_ATTRIBUTES[method]
+            argument = _literal(string.replace('\\"', '"'))
+            if function == "=":
+                conditions.append(f"@{attribute}={argument}")
+            else:
+                conditions.append(f"{function}(@{attribute}, {argument})")
+        elif method == "instance" and number is not None:
+            instance = int(number)
+        else:
+            raise InvalidSelectorException(
+                f"Unsupported UiSelector method {method}() in {selector}"
+            )
+    if not conditions or target[position:].strip(" );"):
+        raise InvalidSelectorException(f"Unsupported UiSelector: {selector}")
+    xpath = f".//*[{' and '.join(conditions)}]"
+    if instance is not None:
+        xpath = f"({xpath})[{instance + 1}]"
+    return xpath
+
+
+def locator_to_xpath(by, value):
+    """Translate an Appium locator to an XPath expression for page sources.
+
+    Args:
+        by: AppiumBy strategy.
+        value: Locator value.
+
+    Returns:
+        XPath expression, relative unless the locator is an absolute XPath.
+
+    Raises:
+        InvalidSelectorException: If the strategy is not supported.
+    """
+    if by == AppiumBy.XPATH:
+        return value
+    if by == AppiumBy.ACCESSIBILITY_ID:
+        return f".//*[@content-desc={_literal(value)}]"
+    if by == AppiumBy.ID:
+        return f".//*[@resource-id={_literal(value)}]"
+    if by == AppiumBy.CLASS_NAME:
+        return f".//*[@class={_literal(value)}]"
+    if by == AppiumBy.ANDROID_UIAUTOMATOR:
+        return ui_selector_to_xpath(value)
+    raise InvalidSelectorException(f"Locator strategy '{by}' is not supported")
+
+
+def find_nodes(context, by, value):
+    """Evaluate a locator on an lxml element.
+
+    Args:
+        context: lxml element to search in (absolute XPaths search the
+            whole document, like on the device).
+        by: AppiumBy strategy.
+        value: Locator value.
+
+    Returns:
+        List of matching lxml elements in document order.
+    """
+    try:
+        nodes = context.xpath(locator_to_xpath(by, value))
+    except etree.XPathError as e:
+        raise InvalidSelectorException(f"Invalid XPath '{value}': {e}") from e
+    return [node for node in nodes if isinstance(node, etree._Element)]
+
+
+class SnapshotElement:
+    """Read-only element of a PageSnapshot, mirroring the WebElement API."""
+
+    def __init__(self, node):
+        self.node = node
+
+    @property
+    def text(self):
+        return self.node.get("text", "")
+
+    @property
+    def tag_name(self):
+        return self.node.get("class", self.node.tag)
+
+    @property
+    def rect(self):
+        """Element bounds as dict with x, y, width and height."""
+        match = _BOUNDS.fullmatch(self.node.get("bounds", ""))
+        if not match:
+            return {"x": 0, "y": 0, "width": 0, "height": 0}
+        x1, y1, x2, y2 = map(int, match.groups())
+        return {"x": x1, "y": y1, "width": x2 - x1, "height": y2 - y1}
+
+    def get_attribute(self, name):
+        """Get an attribute by Appium or page source name, None if missing."""
+        return self.node.get(ATTRIBUTE_NAMES.get(name, name))
+
+    def is_displayed(self):
+        return self.node.get("displayed", "true") == "true"
+
+    def find_element(self, by, value):
+        """Find the first matching element inside this one.
+
+        Raises:
+            NoSuchElementException: If nothing matches.
+        """
+        return _first(find_nodes(self.node, by, value), by, value)
+
+    def find_elements(self, by, value):
+        """Find matching elements inside this one."""
+        return [SnapshotElement(node) for node in find_nodes(self.node, by, value)]
+
+    def __eq__(self, other):
+        return isinstance(other, SnapshotElement) and self.node is other.node
+
+    def __hash__(self):
+        return hash(self.node)
+
+    def __repr__(self):
+        return f"SnapshotElement({self.tag_name}, text={self.text!r})"
+
+
+def _first(nodes, by, value):
+    if not nodes:
+        raise NoSuchElementException(
+            f"No element in page source matches {by} '{value}'"
+        )
+    return SnapshotElement(nodes[0])
+
+
+class PageSnapshot:
+    """Parsed page source answering locator queries locally."""
+
+    def __init__(self, page_source):
+        """Initialize PageSnapshot.
+
+        Args:
+            page_source: UiAutomator2 XML page source.
+        """
+        if isinstance(page_source, str):
+            page_source = page_source.encode("utf-8")
+        self.root = etree.fromstring(page_source)
+
+    @classmethod
+    def from_driver(cls, driver):
+        """Fetch and parse the page source of the current screen.
+
+        Args:
+            driver: Appium WebDriver instance.
+
+        Returns:
+            PageSnapshot instance.
+        """
+        snapshot = cls(driver.page_source)
+        logger.debug(f"Page source snapshot with {len(snapshot)} elements")
+        return snapshot
+
+    @classmethod
+    def from_file(cls, path):
+        """Parse a page source saved to a file."""
+        with open(path, "rb") as source:
+            return cls(source.read())
+
+    def find_element(self, by, value):
+        """Find the first matching element.
+
+        Args:
+            by: AppiumBy strategy.
+            value: Locator value.
+
+        Returns:
+            SnapshotElement instance.
+
+        Raises:
+            NoSuchElementException: If nothing matches.
+        """
+        return _first(find_nodes(self.root, by, value), by, value)
+
+    def find_elements(self, by, value):
+        """Find all matching elements.
+
+        Args:
+            by: AppiumBy strategy.
+            value: Locator value.
+
+        Returns:
+            List of SnapshotElement, empty if nothing matches.
+        """
+        return [SnapshotElement(node) for node in find_nodes(self.root, by, value)]
+
+    def __len__(self):
+        return sum(1 for _ in self.root.iter()) - 1
@@ -0,0 +1,81 @@
+"""
+Product catalog index of a session.
+
+Built from one traversal of the PRODUCTS list and kept on the driver, so
+later lookups of a product's price or the swipes needed to reach it don't
+search the list again. Names and prices stay valid for the whole session;
+screens only for the sort order the list was read in, which select_filter
+and app restarts change (see sort_changed()).
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ProductCatalog:
+    """Products of the PRODUCTS list in display order."""
+
+    def __init__(self, entries, sort_order=None):
+        """Initialize ProductCatalog.
+
+        Args:
+            entries: List of dicts with 'name', 'price' and 'screen' (swipes
+                from the top of the list until the product is seen), in
+                display order.
+            sort_order: Filter name the list was sorted by, None for the
+                app's default order.
+        """
+        self.entries = entries
+        self.sort_order = sort_order
+        self._by_name = {entry["name"]: entry for entry in entries}
+
+    @classmethod
+    def for_driver(cls, driver):
+        """Get the catalog built in a session, None if there is none yet."""
+        return getattr(driver, "_product_catalog", None)
+
+    @staticmethod
+    def current_sort(driver):
+        """Get the sort order the PRODUCTS list has in a session."""
+        return getattr(driver, "_product_sort", None)
+
+    @staticmethod
+    def sort_changed(driver, sort_order=None):
+        """Record a new sort order of the PRODUCTS list.
+
+        Args:
+            driver: Appium WebDriver instance.
+            sort_order: Selected filter name, None when the app (re)starts
+                with its default order.
+        """
+        driver._product_sort = sort_order
+
+    def attach(self, driver):
+        """Make this the catalog of a session."""
+        driver._product_catalog = self
+        logger.debug(
+            f"Product catalog of session {driver.session_id}: {len(self)} products"
+        )
+
+    def is_ordered_for(self, driver):
+        """Check screens still match the list shown in a session."""
+        return self.sort_order == self.current_sort(driver)
+
+    def get(self, name):
+        """Get the entry of a product, None if it isn't in the catalog."""
+        return self._by_name.get(name)
+
+    def products(self):
+        """Get names and prices in display order.
+
+        Returns:
+            List of dicts with 'name' and 'price' keys.
+        """
+        return [{"name": e["name"], "price": e["price"]} for e in self.entries]
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __len__(self):
+        return len(self.entries)
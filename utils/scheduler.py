@@ -0,0 +1,243 @@
+"""
+Multi-device parallel test scheduler.
+
+Collects pytest items once, splits them across the devices of the registry
+(config/devices.py) and runs one pytest worker process per device. Each
+worker is pointed at its device through environment variables and writes to
+its own results directory. Test durations from previous runs are used to
+balance the split.
+
+Usage:
+    python -m utils.scheduler tests/ -m smoke
+    DEVICES_FILE=devices.json python -m utils.scheduler tests/
+"""
+
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from config import settings
+from config.devices import load_devices
+from utils import tracing
+
+logger = logging.getLogger(__name__)
+
+
+def collect(pytest_args, cwd=None):
+    """Collect test node ids without running them.
+
+    Args:
+        pytest_args: Arguments selecting tests (paths, -m, -k, ...).
+        cwd: Working directory for pytest. Defaults to current directory.
+
+    Returns:
+        List of pytest node ids.
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "pytest",
+            "--collect-only",
+            "-q",
+            "-o",
+            "addopts=",
+            *pytest_args,
+        ],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode not in (0, 5):
+        raise RuntimeError(f"Test collection failed:\n{result.stdout}{result.stderr}")
+    return [line.strip() for line in result.stdout.splitlines() if "::" in line]
+
+
+def junit_key(nodeid):
+    """Map a pytest node id to the 'classname::name' key used in JUnit XML."""
+    path, *parts = nodeid.split("::")
+    module = path.removesuffix(".py").replace("/", ".")
+    return "::".join([".".join([module, *parts[:-1]]), parts[-1]])
+
+
+def partition(nodeids, device_count, durations=None):
+    """Split node ids into balanced shards, longest tests first.
+
+    Args:
+        nodeids: Node ids to distribute.
+        device_count: Number of shards.
+        durations: Optional mapping of junit_key -> seconds from earlier runs.
+            Unknown tests are assumed to take the mean known duration.
+
+    Returns:
+        List of node id lists, one per device, in collection order.
+    """
+    durations = durations or {}
+    known = [durations[junit_key(n)] for n in nodeids if junit_key(n) in durations]
+    default = sum(known) / len(known) if known else 1.0
+
+    def cost(nodeid):
+        return durations.get(junit_key(nodeid), default)
+
+    shards = [[] for _ in range(device_count)]
+    loads = [0.0] * device_count
+    order = {nodeid: index for index, nodeid in enumerate(nodeids)}
+    for nodeid in sorted(nodeids, key=cost, reverse=True):
+        target = loads.index(min(loads))
+        shards[target].append(nodeid)
+        loads[target] += cost(nodeid)
+    return [sorted(shard, key=order.get) for shard in shards]
+
+
+def read_junit_durations(junit_path):
+    """Read per-test durations from a JUnit XML report.
+
+    Returns:
+        Dict of junit_key -> seconds. Empty if the report does not exist.
+    """
+    if not Path(junit_path).exists():
+        return {}
+    durations = {}
+    for case in ET.parse(junit_path).iter("testcase"):
+        key = f"{case.get('classname')}::{case.get('name')}"
+        durations[key] = float(case.get("time", 0))
+    return durations
+
+
+class DeviceScheduler:
+    """Run collected tests in parallel, one worker process per device."""
+
+    def __init__(self, devices, results_dir=None, cwd=None):
+        """Initialize DeviceScheduler.
+
+        Args:
+            devices: List of config.devices.Device.
+            results_dir: Root results directory. Each device gets
+                <results_dir>/devices/<device name>. Defaults to
+                settings.RESULTS_DIR.
+            cwd: Working directory for pytest processes.
+        """
+        if not devices:
+            raise ValueError("Device registry is empty")
+        self.devices = devices
+        self.results_dir = Path(results_dir or settings.RESULTS_DIR)
+        self.cwd = cwd
+        self.durations_file = self.results_dir / "durations.json"
+
+    def device_dir(self, device):
+        return self.results_dir / "devices" / device.name
+
+    def _load_durations(self):
+        if self.durations_file.exists():
+            return json.loads(self.durations_file.read_text())
+        return {}
+
+    def _save_durations(self, durations):
+        self.durations_file.parent.mkdir(parents=True, exist_ok=True)
+        self.durations_file.write_text(json.dumps(durations, indent=2, sort_keys=True))
+
+    def run(self, pytest_args):
+        """Collect and run tests across all devices.
+
+        Args:
+            pytest_args: Arguments selecting tests, as passed to pytest.
+
+        Returns:
+            Dict of device name -> {'returncode', 'tests', 'elapsed'}.
+        """
+        nodeids = collect(pytest_args, cwd=self.cwd)
+        durations = self._load_durations()
+        shards = partition(nodeids, len(self.devices), durations)
+        logger.info(
+            f"Scheduling {len(nodeids)} tests on {len(self.devices)} devices: "
+            + ", ".join(f"{d.name}={len(s)}" for d, s in zip(self.devices, shards))
+        )
+
+        workers = []
+        run_started = time.time()
+        started = time.perf_counter()
+        for device, shard in zip(self.devices, shards):
+            if not shard:
+                continue
+            device_dir = self.device_dir(device)
+            device_dir.mkdir(parents=True, exist_ok=True)
+            env = {
+                **os.environ,
+                **device.env(),
+                "RESULTS_DIR": str(device_dir),
+            }
+            command = [
+                sys.executable,
+                "-m",
+                "pytest",
+                *shard,
+                "-p",
+                "no:cacheprovider",
+                f"--junitxml={device_dir / 'junit.xml'}",
+            ]
+            log_file = open(device_dir / "worker.log", "w")
+            process = subprocess.Popen(
+                command,
+                cwd=self.cwd,
+                env=env,
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+            )
+            workers.append((device, shard, process, log_file))
+
+        summary = {}
+        while workers:
+            for worker in list(workers):
+                device, shard, process, log_file = worker
+                if process.poll() is None:
+                    continue
+                workers.remove(worker)
+                log_file.close()
+                summary[device.name] = {
+                    "returncode": process.returncode,
+                    "tests": len(shard),
+                    "elapsed": time.perf_counter() - started,
+                }
+                durations.update(
+                    read_junit_durations(self.device_dir(device) / "junit.xml")
+                )
+                logger.info(
+                    f"Device {device.name}: {len(shard)} tests, "
+                    f"exit code {process.returncode}, "
+                    f"{summary[device.name]['elapsed']:.1f}s"
+                )
+            if workers:
+                time.sleep(0.1)
+
+        self._save_durations(durations)
+        if settings.TRACE:
+            self._merge_traces(run_started)
+        return summary
+
+    def _merge_traces(self, since):
+        """Combine the traces the workers of this run wrote into one file."""
+        traces = [
+            path
+            for device in self.devices
+            for path in self.device_dir(device).glob("*/trace.json")
+            if path.stat().st_mtime >= since
+        ]
+        if traces:
+            output = tracing.merge(traces, self.results_dir / "trace.json")
+            logger.info(f"Merged {len(traces)} device traces into {output}")
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
+    argv = sys.argv[1:] if argv is None else argv
+    summary = DeviceScheduler(load_devices()).run(argv)
+    return max((result["returncode"] for result in summary.values()), default=5)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
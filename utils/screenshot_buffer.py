@@ -0,0 +1,129 @@
+"""
+In-memory ring buffer of step screenshots.
+
+With SCREENSHOT_MODE=on_failure, take_screenshot() keeps step screenshots in
+memory instead of writing them. At teardown the driver fixture hands the
+buffer of a failed test (or one marked keep_screenshots) to the screenshot
+writer and drops it otherwise, so green runs write no screenshot files. The
+buffer holds at most SCREENSHOT_BUFFER_COUNT screenshots and
+SCREENSHOT_BUFFER_BYTES of payload; the oldest are dropped first, keeping
+the steps right before a failure.
+"""
+
+import logging
+import threading
+from collections import deque
+
+from config import settings
+from utils import screenshot_writer
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_buffer = None
+_stats = {"persisted": 0, "discarded": 0, "evicted": 0, "bytes_not_written": 0}
+
+
+class ScreenshotBuffer:
+    """Screenshots of one test, bounded by count and payload size."""
+
+    def __init__(self, max_count=20, max_bytes=50 * 1024 * 1024):
+        """Initialize ScreenshotBuffer.
+
+        Args:
+            max_count: Screenshots kept before the oldest is dropped.
+            max_bytes: Total base64 payload size kept before the oldest
+                screenshots are dropped.
+        """
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evicted = 0
+        self._items = deque()
+
+    def add(self, payload, path):
+        """Keep a screenshot, dropping the oldest ones over the limits.
+
+        Args:
+            payload: Base64 encoded PNG.
+            path: File path to write the screenshot to if it is persisted.
+        """
+        self._items.append((payload, path))
+        self.size += len(payload)
+        while len(self._items) > self.max_count or (
+            self.size > self.max_bytes and len(self._items) > 1
+        ):
+            dropped, _ = self._items.popleft()
+            self.size -= len(dropped)
+            self.evicted += 1
+
+    def drain(self):
+        """Remove and return the kept screenshots, oldest first.
+
+        Returns:
+            List of (payload, path) tuples.
+        """
+        items = list(self._items)
+        self._items.clear()
+        self.size = 0
+        return items
+
+    def __len__(self):
+        return len(self._items)
+
+
+def get_buffer():
+    """Get the buffer of the running test, creating it on first use."""
+    global _buffer
+    with _lock:
+        if _buffer is None:
+            _buffer = ScreenshotBuffer(
+                settings.SCREENSHOT_BUFFER_COUNT, settings.SCREENSHOT_BUFFER_BYTES
+            )
+        return _buffer
+
+
+def finish_test(persist):
+    """Write or drop the buffered screenshots of the test that just ended.
+
+    Args:
+        persist: Queue the screenshots to the screenshot writer (failed or
+            marked test) instead of dropping them.
+
+    Returns:
+        Number of screenshots queued for writing.
+    """
+    global _buffer
+    with _lock:
+        buffer, _buffer = _buffer, None
+    if buffer is None:
+        return 0
+    evicted = buffer.evicted
+    size = buffer.size
+    items = buffer.drain()
+    with _lock:
+        _stats["evicted"] += evicted
+        if persist:
+            _stats["persisted"] += len(items)
+        else:
+            _stats["discarded"] += len(items)
+            _stats["bytes_not_written"] += size
+    if persist and items:
+        writer = screenshot_writer.get_writer()
+        for payload, path in items:
+            writer.submit(payload, path)
+        logger.info(f"Persisting {len(items)} buffered screenshots")
+        return len(items)
+    return 0
+
+
+def buffer_stats():
+    """Get the counters of all tests so far.
+
+    Returns:
+        Dict with 'persisted', 'discarded' (dropped at the end of passed
+        tests), 'evicted' (dropped for the buffer limits) and
+        'bytes_not_written' (base64 payload of the discarded screenshots).
+    """
+    with _lock:
+        return dict(_stats)
@@ -0,0 +1,188 @@
+"""
+Background screenshot writer.
+
+Only the capture itself has to happen on the test thread, at the moment the
+screen is in the state to record. Base64 decoding, optional re-encoding and
+the file write are queued to a worker thread. The queue is bounded: when the
+worker falls behind, submit() blocks until there is room again, so memory use
+stays flat however many screenshots a test takes.
+
+Tests flush the writer at teardown (see tests/conftest.py), files are
+complete when flush() returns. With a deduplicator (SCREENSHOT_DEDUP, not
+used with the artifact store), screenshots nearly identical to one written
+shortly before in the same directory are not written; the directory's
+duplicates.json names the file to use instead.
+"""
+
+import base64
+import logging
+import queue
+import threading
+import time
+from pathlib import Path
+
+from config import settings
+from utils import artifact_store, log_queue
+from utils.image_hash import ScreenshotDeduplicator
+
+logger = logging.getLogger(__name__)
+
+STAT_KEYS = (
+    "written",
+    "duplicates",
+    "bytes_saved",
+    "errors",
+    "worker_seconds",
+    "blocked_seconds",
+)
+
+_default = None
+_default_lock = threading.Lock()
+_closed_totals = dict.fromkeys(STAT_KEYS, 0)
+
+
+class ScreenshotWriter:
+    """Bounded queue of screenshots written by one worker thread."""
+
+    def __init__(self, max_queue=8, transform=None, dedup=None, store=None):
+        """Initialize ScreenshotWriter.
+
+        Args:
+            max_queue: Screenshots waiting to be written before submit()
+                blocks.
+            transform: Optional callable taking PNG bytes and returning the
+                bytes to write (e.g. re-encoding), run on the worker.
+            dedup: Optional ScreenshotDeduplicator, run on the worker.
+            store: Optional ArtifactStore to put screenshots into instead of
+                writing them to their paths.
+        """
+        self.transform = transform
+        self.dedup = dedup
+        self.store = store
+        self.stats = dict.fromkeys(STAT_KEYS, 0)
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(
+            target=self._work, name="screenshot-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, payload, path):
+        """Queue a screenshot for writing.
+
+        Args:
+            payload: Base64 encoded PNG, as returned by
+                driver.get_screenshot_as_base64().
+            path: File path to write the screenshot to.
+        """
+        started = time.perf_counter()
+        self._queue.put((payload, Path(path), log_queue.current_test()))
+        blocked = time.perf_counter() - started
+        if blocked > 0.001:
+            self.stats["blocked_seconds"] += blocked
+            logger.debug(f"Screenshot queue full, waited {blocked:.3f}s")
+
+    def flush(self):
+        """Block until every queued screenshot is written."""
+        self._queue.join()
+
+    def close(self):
+        """Write the queued screenshots and stop the worker."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                payload, path, test_log = item
+                with log_queue.routed_to(test_log):
+                    self._write(payload, path)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, payload, path):
+        started = time.perf_counter()
+        try:
+            png = base64.b64decode(payload)
+            if self._is_duplicate(png, path):
+                self.stats["duplicates"] += 1
+                self.stats["bytes_saved"] += len(png)
+                return
+            if self.transform is not None:
+                png = self.transform(png)
+            if self.store is not None:
+                self.store.put(png, path, kind="screenshot")
+            else:
+                path.write_bytes(png)
+            self.stats["written"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Could not write screenshot {path}: {e}")
+        finally:
+            self.stats["worker_seconds"] += time.perf_counter() - started
+
+    def _is_duplicate(self, png, path):
+        # A screenshot that can't be hashed is still written, it may be
+        # the only evidence of a failure
+        if self.dedup is None:
+            return False
+        try:
+            return self.dedup.check(png, path) is not None
+        except Exception as e:
+            logger.debug(f"Could not hash screenshot {path}, writing it: {e}")
+            return False
+
+
+def get_writer():
+    """Get the writer shared by all tests, starting it on first use."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            store = artifact_store.get_store()
+            dedup = None
+            # duplicates.json can't point at kept files that only the store has
+            if settings.SCREENSHOT_DEDUP and store is None:
+                dedup = ScreenshotDeduplicator(settings.SCREENSHOT_DEDUP_THRESHOLD)
+            _default = ScreenshotWriter(
+                settings.SCREENSHOT_QUEUE_SIZE,
+                dedup=dedup,
+                store=store,
+            )
+        return _default
+
+
+def flush():
+    """Wait for the shared writer's queue to drain, if it was started."""
+    if _default is not None:
+        _default.flush()
+
+
+def shutdown():
+    """Write remaining screenshots and stop the shared writer, keeping its counters."""
+    global _default
+    with _default_lock:
+        writer, _default = _default, None
+    if writer is not None:
+        writer.close()
+        with _default_lock:
+            for key in STAT_KEYS:
+                _closed_totals[key] += writer.stats[key]
+
+
+def screenshot_stats():
+    """Get the counters of the shared writer, including stopped ones.
+
+    Returns:
+        Dict with 'written', 'duplicates' (not written, see
+        ScreenshotDeduplicator), 'bytes_saved' (PNG bytes of the duplicates),
+        'errors', 'worker_seconds' (decoding and I/O moved off the test
+        thread) and 'blocked_seconds' (test thread waiting on a full queue).
+    """
+    with _default_lock:
+        stats = dict(_closed_totals)
+        if _default is not None:
+            for key in STAT_KEYS:
+                stats[key] += _default.stats[key]
+    return stats
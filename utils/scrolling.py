@@ -0,0 +1,187 @@
+"""
+Scrolling geometry and end-of-list detection.
+
+Swipe vectors are derived from the bounds of the scrollable container in the
+page source (the window size when there is none), so the same code scrolls a
+near-full screen on any device. The end of a list is reached when a swipe
+leaves the container's content unchanged, detected by comparing hierarchy
+fingerprints of successive snapshots.
+
+Swipes per traversal are collected for scroll_stats().
+"""
+
+import hashlib
+import logging
+import statistics
+import threading
+
+from utils.page_source import SnapshotElement
+
+logger = logging.getLogger(__name__)
+
+# Fraction of the scroll area height kept clear at the top and bottom, so
+# swipes don't start on gesture areas or headers
+EDGE_MARGIN = 0.1
+
+_FINGERPRINT_ATTRIBUTES = ("class", "text", "content-desc", "resource-id", "bounds")
+
+_lock = threading.Lock()
+_traversals = []
+
+
+def _bounds(node):
+    rect = SnapshotElement(node).rect
+    return rect["x"], rect["y"], rect["x"] + rect["width"], rect["y"] + rect["height"]
+
+
+def scroll_container(snapshot):
+    """Find the largest scrollable node of a snapshot.
+
+    Args:
+        snapshot: PageSnapshot instance.
+
+    Returns:
+        lxml element, or None if nothing on the screen is scrollable.
+    """
+    best, best_area = None, 0
+    for node in snapshot.root.iter():
+        if node.get("scrollable") != "true":
+            continue
+        bounds = _bounds(node)
+        area = (bounds[2] - bounds[0]) * (bounds[3] - bounds[1])
+        if area > best_area:
+            best, best_area = node, area
+    return best
+
+
+def scroll_area(snapshot, window_size=None):
+    """Get the screen area a list scrolls in.
+
+    Args:
+        snapshot: PageSnapshot instance.
+        window_size: Dict with 'width' and 'height', used when the snapshot
+            has neither a scrollable node nor the hierarchy size.
+
+    Returns:
+        Tuple of (left, top, right, bottom) in pixels.
+
+    Raises:
+        ValueError: If the area can't be determined.
+    """
+    container = scroll_container(snapshot)
+    if container is not None:
+        return _bounds(container)
+    width = snapshot.root.get("width")
+    height = snapshot.root.get("height")
+    if width and height:
+        return 0, 0, int(width), int(height)
+    if window_size:
+        return 0, 0, window_size["width"], window_size["height"]
+    raise ValueError("Scroll area unknown: no scrollable node and no window size")
+
+
+def swipe_vector(area, fraction=0.7, reverse=False):
+    """Compute a swipe moving the content of an area up by a fraction of it.
+
+    Args:
+        area: Tuple of (left, top, right, bottom), see scroll_area().
+        fraction: Share of the area height to scroll by. Less than 1 - 2 *
+            EDGE_MARGIN, the rest stays visible as overlap so rows cut at
+            the bottom edge are seen whole after the swipe.
+        reverse: Swipe the other way, moving back up the list.
+
+    Returns:
+        Tuple of (start_x, start_y, end_x, end_y).
+    """
+    left, top, right, bottom = area
+    height = bottom - top
+    fraction = min(fraction, 1 - 2 * EDGE_MARGIN)
+    x = (left + right) // 2
+    start_y = bottom - int(height * EDGE_MARGIN)
+    end_y = start_y - int(height * fraction)
+    return (x, end_y, x, start_y) if reverse else (x, start_y, x, end_y)
+
+
+def fingerprint(snapshot):
+    """Hash the content of the scroll container (or whole screen).
+
+    Args:
+        snapshot: PageSnapshot instance.
+
+    Returns:
+        Hex digest, equal for two snapshots showing the same list position.
+    """
+    container = scroll_container(snapshot)
+    digest = hashlib.sha1()
+    for node in (container if container is not None else snapshot.root).iter():
+        for attribute in _FINGERPRINT_ATTRIBUTES:
+            digest.update(node.get(attribute, "").encode("utf-8"))
+            digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ScrollSearch:
+    """Targets located by one list traversal, see BasePage.scroll_search()."""
+
+    def __init__(self, locators):
+        """Initialize ScrollSearch.
+
+        Args:
+            locators: Dict mapping target (text or accessibility id) to its
+                (AppiumBy, value) locator.
+        """
+        self.locators = locators
+        self.positions = {}
+        # Screens the list is scrolled by since the search started, None
+        # once unknown
+        self.screen = 0
+
+    def record(self, snapshot, screen):
+        """Remember the targets visible in a snapshot.
+
+        Args:
+            snapshot: PageSnapshot of the screen.
+            screen: Swipes from the screen the search started on.
+        """
+        for target, locator in self.locators.items():
+            if target in self.positions:
+                continue
+            visible = [e for e in snapshot.find_elements(*locator) if e.is_displayed()]
+            if visible:
+                self.positions[target] = {"screen": screen, "rect": visible[0].rect}
+
+    @property
+    def missing(self):
+        """Targets not seen during the traversal."""
+        return [target for target in self.locators if target not in self.positions]
+
+    def __contains__(self, target):
+        return target in self.positions
+
+
+def record_traversal(swipes, reached_end):
+    """Record one list traversal for scroll_stats()."""
+    with _lock:
+        _traversals.append((swipes, reached_end))
+    logger.debug(
+        f"List traversal: {swipes} swipes, "
+        f"{'end reached' if reached_end else 'stopped early'}"
+    )
+
+
+def scroll_stats():
+    """Summarize all list traversals done so far in this process.
+
+    Returns:
+        Dict with 'traversals', 'swipes_per_traversal' (mean), 'max_swipes'
+        and 'ends_reached'.
+    """
+    with _lock:
+        traversals = list(_traversals)
+    swipes = [count for count, _ in traversals]
+    return {
+        "traversals": len(traversals),
+        "swipes_per_traversal": statistics.mean(swipes) if swipes else 0.0,
+        "max_swipes": max(swipes, default=0),
+        "ends_reached": sum(1 for _, reached_end in traversals if reached_end),
+    }
@@ -0,0 +1,132 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import log_queue
+from utils.session_pool import capabilities_key
+
+logger = logging.getLogger(__name__)
+
+
+class PrewarmedSessionFactory:
+    """Session factory that opens the next session(s) ahead of time.
+
+    Every time a session is handed out, replacements are started on a
+    background thread pool so that up to `lookahead` sessions per capability
+    set are being created while the current test runs. The next request is
+    then served from an already started session.
+
+    Requires an Appium setup that accepts concurrent sessions for the same
+    capabilities (emulator farm, grid, session override), since warm sessions
+    are open while the current one is in use.
+    """
+
+    def __init__(self, create_session, lookahead=1, max_workers=None):
+        """Initialize PrewarmedSessionFactory.
+
+        Args:
+            create_session: Callable taking options and returning a new driver.
+            lookahead: Number of sessions kept warming per capability set.
+            max_workers: Thread pool size. Defaults to lookahead.
+        """
+        if lookahead < 1:
+            raise ValueError("lookahead must be at least 1")
+        self.create_session = create_session
+        self.lookahead = lookahead
+        self.served_warm = 0
+        self.served_cold = 0
+        self.wait_time = 0.0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or lookahead,
+            thread_name_prefix="session-prewarm",
+            # Sessions are warmed for later tests, not the running one
+            initializer=log_queue.route_thread,
+            initargs=(None,),
+        )
+        self._warm = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _fill(self, key, options):
+        queue = self._warm.setdefault(key, deque())
+        while len(queue) < self.lookahead:
+            queue.append(self._executor.submit(self.create_session, options))
+
+    def prime(self, options):
+        """Start warming sessions for options before the first request.
+
+        Args:
+            options: AppiumOptions describing the session.
+        """
+        with self._lock:
+            if not self._closed:
+                self._fill(capabilities_key(options), options)
+
+    def get(self, options):
+        """Get a session, preferring one created in the background.
+
+        Args:
+            options: AppiumOptions describing the session.
+
+        Returns:
+            Appium WebDriver instance.
+        """
+        key = capabilities_key(options)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Session factory is shut down")
+            queue = self._warm.get(key)
+            future = queue.popleft() if queue else None
+            self._fill(key, options)
+
+        started = time.perf_counter()
+        ready = future is not None and future.done()
+        driver = None
+        if future is not None:
+            try:
+                driver = future.result()
+            except Exception as e:
+                logger.warning(f"Pre-warmed session failed, creating one now: {e}")
+        if driver is None:
+            driver = self.create_session(options)
+        waited = time.perf_counter() - started
+
+        with self._lock:
+            self.wait_time += waited
+            if ready:
+                self.served_warm += 1
+            else:
+                self.served_cold += 1
+        logger.info(f"Session {driver.session_id} ready after {waited:.2f}s wait")
+        return driver
+
+    def shutdown(self):
+        """Stop warming and quit sessions that were never handed out."""
+        with self._lock:
+            self._closed = True
+            futures = [future for queue in self._warm.values() for future in queue]
+            self._warm.clear()
+
+        unused = 0
+        for future in futures:
+            if future.cancel():
+                continue
+            try:
+                driver = future.result()
+            except Exception as e:
+                logger.debug(f"Pre-warmed session failed during shutdown: {e}")
+                continue
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.debug(f"Could not quit warm session {driver.session_id}: {e}")
+            unused += 1
+        self._executor.shutdown(wait=True)
+
+        served = self.served_warm + self.served_cold
+        logger.info(
+            f"Session prewarm: {self.served_warm}/{served} served warm, "
+            f"{self.wait_time:.2f}s total wait, {unused} unused sessions quit"
+        )
@@ -0,0 +1,187 @@
+import json
+import logging
+import threading
+
+from appium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+RESET_STRATEGIES = ("relaunch", "clear", "none")
+
+
+def capabilities_key(options):
+    """Build a stable pool key from an options object or capabilities dict.
+
+    Args:
+        options: AppiumOptions instance or plain capabilities dict.
+
+    Returns:
+        JSON string with sorted keys identifying the capability set.
+    """
+    caps = options.to_capabilities() if hasattr(options, "to_capabilities") else options
+    return json.dumps(caps, sort_keys=True, default=str)
+
+
+def app_id_from_options(options):
+    """Get application id (Android package or iOS bundle id) from capabilities.
+
+    Args:
+        options: AppiumOptions instance or plain capabilities dict.
+
+    Returns:
+        Application id string or None if capabilities do not define one.
+    """
+    caps = options.to_capabilities() if hasattr(options, "to_capabilities") else options
+    for name in ("appPackage", "bundleId"):
+        value = caps.get(f"appium:{name}") or caps.get(name)
+        if value:
+            return value
+    return None
+
+
+class SessionPool:
+    """Pool of live Appium sessions keyed by capability set.
+
+    Instead of quitting the session after every test, released sessions are
+    kept idle and handed out again to the next test asking for the same
+    capabilities. App state is reset on reuse (terminate/activate or clear
+    data), so only the first test per capability set pays for session
+    creation and app install.
+    """
+
+    def __init__(
+        self,
+        server_url,
+        reset="relaunch",
+        reuse=True,
+        session_factory=None,
+        on_reset=None,
+    ):
+        """Initialize SessionPool.
+
+        Args:
+            server_url: Appium server URL.
+            reset: Default app reset strategy applied when a session is
+                reused: 'relaunch', 'clear' or 'none'. Defaults to 'relaunch'.
+            reuse: Keep released sessions for reuse. When False every
+                acquire creates a session and release quits it.
+            session_factory: Optional callable taking options and returning
+                a new driver. Defaults to webdriver.Remote on server_url.
+            on_reset: Optional callable taking the driver, called after the
+                app was relaunched or cleared on reuse, e.g. to drop state
+                kept about the previous app run.
+        """
+        if reset not in RESET_STRATEGIES:
+            raise ValueError(
+                f"Unknown reset strategy '{reset}', expected one of {RESET_STRATEGIES}"
+            )
+        self.server_url = server_url
+        self.reset = reset
+        self.reuse = reuse
+        self.session_factory = session_factory or self._create_session
+        self.on_reset = on_reset
+        self.created = 0
+        self.reused = 0
+        self._idle = {}
+        self._keys = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    def _create_session(self, options):
+        return webdriver.Remote(self.server_url, options=options)
+
+    def acquire(self, options, reset=None):
+        """Get a live session for the given capabilities.
+
+        Args:
+            options: AppiumOptions describing the session.
+            reset: Reset strategy overriding the pool default for this call.
+
+        Returns:
+            Appium WebDriver instance.
+        """
+        key = capabilities_key(options)
+        app_id = app_id_from_options(options)
+        reset = reset or self.reset
+
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                driver = idle.pop() if idle else None
+            if driver is None:
+                break
+            with self._lock:
+                dirty = id(driver) in self._dirty
+                self._dirty.discard(id(driver))
+            effective_reset = self.reset if dirty and reset == "none" else reset
+            try:
+                self._reset_app(driver, app_id, effective_reset)
+            except WebDriverException as e:
+                logger.warning(f"Discarding dead session {driver.session_id}: {e}")
+                self._quit(driver)
+                continue
+            with self._lock:
+                self.reused += 1
+                self._keys[id(driver)] = key
+            logger.info(
+                f"Reusing session {driver.session_id} (reset: {effective_reset})"
+            )
+            return driver
+
+        driver = self.session_factory(options)
+        with self._lock:
+            self.created += 1
+            self._keys[id(driver)] = key
+        logger.info(f"Created session {driver.session_id}")
+        return driver
+
+    def release(self, driver, discard=False, dirty=False):
+        """Return a session to the pool.
+
+        Args:
+            driver: Driver previously obtained from acquire().
+            discard: Quit the session instead of keeping it idle.
+            dirty: App state is unknown (e.g. the test failed). The next
+                acquire applies the pool reset even if it asked for 'none'.
+        """
+        with self._lock:
+            key = self._keys.pop(id(driver), None)
+            keep = self.reuse and not discard and key is not None
+            if keep:
+                self._idle.setdefault(key, []).append(driver)
+                if dirty:
+                    self._dirty.add(id(driver))
+        if not keep:
+            self._quit(driver)
+
+    def close(self):
+        """Quit all idle sessions."""
+        with self._lock:
+            drivers = [d for idle in self._idle.values() for d in idle]
+            self._idle.clear()
+        for driver in drivers:
+            self._quit(driver)
+        logger.info(
+            f"Session pool closed: {self.created} created, {self.reused} reused"
+        )
+
+    def _reset_app(self, driver, app_id, reset):
+        if app_id is None:
+            return
+        if reset == "none":
+            driver.query_app_state(app_id)
+            return
+        if reset == "clear":
+            driver.execute_script("mobile: clearApp", {"appId": app_id})
+        else:
+            driver.terminate_app(app_id)
+        driver.activate_app(app_id)
+        if self.on_reset is not None:
+            self.on_reset(driver)
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except WebDriverException as e:
+            logger.debug(f"Could not quit session {driver.session_id}: {e}")
@@ -0,0 +1,256 @@
+"""
+Timeline tracing of tests in Chrome trace-event format.
+
+Records nested spans, test -> step -> page object method -> WebDriver
+command, and exports them as JSON that chrome://tracing and
+https://ui.perfetto.dev open directly. Each test process is one process
+track named after its worker and device, each thread (test thread, async
+driver workers) one thread track inside it. merge() combines the files of
+several workers into one timeline; timestamps are wall-clock based so they
+line up across processes.
+
+Nothing is recorded until start() is called (TRACE=true does it in
+tests/conftest.py). Until then span() returns a shared no-op context manager
+and traced methods make one extra function call.
+"""
+
+import contextlib
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_recorder = None
+_NOOP = contextlib.nullcontext()
+
+
+class TraceRecorder:
+    """Collects complete ('X') trace events of one process."""
+
+    def __init__(self, process_name):
+        """Initialize TraceRecorder.
+
+        Args:
+            process_name: Name of the process track, e.g. worker and device.
+        """
+        self.process_name = process_name
+        self.pid = os.getpid()
+        self.events = []
+        self._threads = {}
+        self._steps = {}
+        self._lock = threading.Lock()
+        self._wall_origin = time.time()
+        self._perf_origin = time.perf_counter()
+
+    def now(self):
+        """Get the current timestamp in microseconds."""
+        return (self._wall_origin + time.perf_counter() - self._perf_origin) * 1e6
+
+    def add(self, name, category, start, args=None):
+        """Record a span that started at start and ends now.
+
+        Args:
+            name: Span name.
+            category: Span category, e.g. 'test', 'step', 'page', 'command'.
+            start: Start timestamp from now().
+            args: Optional dict of attributes shown with the span.
+        """
+        end = self.now()
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start,
+            "dur": end - start,
+            "pid": self.pid,
+            "tid": thread.ident,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._threads[thread.ident] = thread.name
+            self.events.append(event)
+
+    @contextlib.contextmanager
+    def span(self, name, category, args=None):
+        """Record the block as a span, marking it when it raises."""
+        start = self.now()
+        try:
+            yield
+        except BaseException as e:
+            args = {**(args or {}), "error": type(e).__name__}
+            raise
+        finally:
+            self.add(name, category, start, args)
+
+    def step(self, name):
+        """End the current thread's open step and start a new one."""
+        self.end_step()
+        self._steps[threading.get_ident()] = (name, self.now())
+
+    def end_step(self):
+        """End the current thread's open step, if any."""
+        open_step = self._steps.pop(threading.get_ident(), None)
+        if open_step is not None:
+            self.add(open_step[0], "step", open_step[1])
+
+    def trace_events(self):
+        """Get the recorded events with process and thread name metadata."""
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self._threads)
+        metadata = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": self.pid,
+                "args": {"name": self.process_name},
+            }
+        ]
+        metadata += [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self.pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in threads.items()
+        ]
+        return metadata + events
+
+    def export(self, path):
+        """Write the trace as Chrome trace-event JSON.
+
+        Args:
+            path: Output file path.
+
+        Returns:
+            Path of the written file.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        trace = {"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}
+        path.write_text(json.dumps(trace), encoding="utf-8")
+        logger.info(f"Trace with {len(self.events)} spans written to {path}")
+        return path
+
+
+def start(process_name):
+    """Start recording spans in this process.
+
+    Returns:
+        The new TraceRecorder.
+    """
+    global _recorder
+    _recorder = TraceRecorder(process_name)
+    return _recorder
+
+
+def stop():
+    """Stop recording.
+
+    Returns:
+        The TraceRecorder that was recording, None if none was.
+    """
+    global _recorder
+    recorder, _recorder = _recorder, None
+    return recorder
+
+
+def is_enabled():
+    """Check whether spans are being recorded."""
+    return _recorder is not None
+
+
+def span(name, category="function", **args):
+    """Context manager recording a span while tracing is on.
+
+    Args:
+        name: Span name.
+        category: Span category.
+        **args: Attributes of the span.
+    """
+    recorder = _recorder
+    if recorder is None:
+        return _NOOP
+    return recorder.span(name, category, args)
+
+
+def step(name):
+    """Mark the start of a test step, ending the previous one.
+
+    Steps run until the next step() or end_step() on the same thread (the
+    test span ends the last one).
+    """
+    if _recorder is not None:
+        _recorder.step(name)
+
+
+def end_step():
+    """End the open step of the current thread."""
+    if _recorder is not None:
+        _recorder.end_step()
+
+
+def traced(name, func, category="page"):
+    """Wrap a function so its calls are recorded as spans while tracing is on.
+
+    Generator functions are returned unwrapped, a span would only cover
+    creating the generator.
+
+    Args:
+        name: Span name, e.g. 'ProductsPage.catalog'.
+        func: Function to wrap.
+        category: Span category.
+
+    Returns:
+        Wrapped function.
+    """
+    if inspect.isgeneratorfunction(func):
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        recorder = _recorder
+        if recorder is None:
+            return func(*args, **kwargs)
+        with recorder.span(name, category):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def trace_methods(cls):
+    """Wrap the public methods a class defines with traced()."""
+    for attr, value in list(vars(cls).items()):
+        if not attr.startswith("_") and inspect.isfunction(value):
+            setattr(cls, attr, traced(f"{cls.__name__}.{attr}", value))
+    return cls
+
+
+def merge(paths, output):
+    """Combine trace files of several processes into one timeline.
+
+    Args:
+        paths: Trace files written by TraceRecorder.export().
+        output: Path of the combined file.
+
+    Returns:
+        Path of the combined file.
+    """
+    events = []
+    for path in paths:
+        events += json.loads(Path(path).read_text(encoding="utf-8"))["traceEvents"]
+    output = Path(output)
+    output.write_text(
+        json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8"
+    )
+    return output
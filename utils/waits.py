@@ -0,0 +1,225 @@
+"""
+Adaptive wait engine.
+
+Drop-in replacement for WebDriverWait.until with three differences:
+
+- Poll schedule: the condition is checked immediately, then after short
+  intervals growing exponentially up to a cap, so fast elements are seen
+  almost at once and slow ones don't flood the server with requests.
+- Learned latency: the time each locator usually takes to appear is tracked,
+  the first poll after a failed immediate check is scheduled for then.
+- Wait budget: waits of one test share a total waiting time (budget()), a
+  test stuck on missing elements fails fast instead of timing out again and
+  again.
+
+Polls per wait and time to satisfy are collected for wait_stats().
+"""
+
+import logging
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
+
+_lock = threading.Lock()
+_records = []
+_latencies = {}
+_budget = threading.local()
+
+
+class PollSchedule:
+    """Fast-first exponential backoff between polls."""
+
+    def __init__(self, first=0.05, factor=2.0, maximum=1.0):
+        """Initialize PollSchedule.
+
+        Args:
+            first: First interval in seconds.
+            factor: Growth factor of consecutive intervals.
+            maximum: Longest interval in seconds.
+        """
+        self.first = first
+        self.factor = factor
+        self.maximum = maximum
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            settings.WAIT_POLL_FIRST, settings.WAIT_POLL_FACTOR, settings.WAIT_POLL_MAX
+        )
+
+    def intervals(self):
+        """Yield poll intervals in seconds, endlessly."""
+        interval = self.first
+        while True:
+            yield interval
+            interval = min(interval * self.factor, self.maximum)
+
+
+class WaitBudget:
+    """Total waiting time shared by the waits of one test."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.spent = 0.0
+
+    @property
+    def remaining(self):
+        return max(self.seconds - self.spent, 0.0)
+
+
+@contextmanager
+def budget(seconds):
+    """Share a waiting budget between all waits inside the block.
+
+    Args:
+        seconds: Total waiting time. 0 or None disables the budget.
+
+    Yields:
+        WaitBudget instance, or None when disabled.
+    """
+    previous = getattr(_budget, "current", None)
+    _budget.current = WaitBudget(seconds) if seconds else None
+    try:
+        yield _budget.current
+    finally:
+        _budget.current = previous
+
+
+def learned_latency(key):
+    """Usual time in seconds for a wait with this key to be satisfied."""
+    with _lock:
+        return _latencies.get(key)
+
+
+def _learn(key, elapsed, alpha=0.3):
+    with _lock:
+        previous = _latencies.get(key)
+        _latencies[key] = (
+            elapsed if previous is None else alpha * elapsed + (1 - alpha) * previous
+        )
+
+
+def wait_stats():
+    """Summarize all waits done so far in this process.
+
+    Returns:
+        Dict with 'waits', 'timeouts', 'polls_per_wait' (mean) and
+        'time_to_satisfy' (median and p95 seconds of satisfied waits).
+    """
+    with _lock:
+        records = list(_records)
+    satisfied = sorted(elapsed for _, elapsed, ok in records if ok)
+    return {
+        "waits": len(records),
+        "timeouts": sum(1 for _, _, ok in records if not ok),
+        "polls_per_wait": (
+            statistics.mean(polls for polls, _, _ in records) if records else 0.0
+        ),
+        "time_to_satisfy": {
+            "median": statistics.median(satisfied) if satisfied else 0.0,
+            "p95": satisfied[int(0.95 * (len(satisfied) - 1))] if satisfied else 0.0,
+        },
+    }
+
+
+class AdaptiveWait:
+    """Explicit wait with backoff polling, learned latency and a budget.
+
+    Usage:
+        wait = AdaptiveWait(driver, 20)
+        wait.until(EC.presence_of_element_located(locator), key=locator)
+    """
+
+    def __init__(self, driver, timeout=None, schedule=None):
+        """Initialize AdaptiveWait.
+
+        Args:
+            driver: Appium WebDriver instance.
+            timeout: Default timeout in seconds. Defaults to
+                settings.WAIT_TIMEOUT.
+            schedule: PollSchedule. Defaults to the configured one.
+        """
+        self.driver = driver
+        self.timeout = settings.WAIT_TIMEOUT if timeout is None else timeout
+        self.schedule = schedule or PollSchedule.from_settings()
+
+    def until(self, method, message="", timeout=None, key=None):
+        """Wait until method returns a truthy value.
+
+        Args:
+            method: Callable taking the driver, e.g. an expected condition.
+            message: Message of the TimeoutException.
+            timeout: Timeout in seconds overriding the default.
+            key: Hashable identifying what is waited for (usually the
+                locator), enables learned latency for the first poll.
+
+        Returns:
+            Value returned by method.
+
+        Raises:
+            TimeoutException: If method isn't satisfied within the timeout or
+                the remaining test wait budget.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        current_budget = getattr(_budget, "current", None)
+        if current_budget is not None:
+            timeout = min(timeout, current_budget.remaining)
+
+        started = time.monotonic()
+        deadline = started + timeout
+        intervals = self.schedule.intervals()
+        learned = learned_latency(key) if key is not None else None
+        polls = 0
+        last_error = None
+
+        while True:
+            polls += 1
+            try:
+                value = method(self.driver)
+                if value:
+                    self._record(key, polls, started, True, current_budget)
+                    return value
+            except IGNORED_EXCEPTIONS as e:
+                last_error = e
+
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            if polls == 1 and learned:
+                delay = max(learned - (now - started), self.schedule.first)
+            else:
+                delay = next(intervals)
+            time.sleep(min(delay, deadline - now))
+
+        self._record(key, polls, started, False, current_budget)
+        if current_budget is not None and current_budget.remaining <= 0:
+            message = (
+                f"{message} (test wait budget of {current_budget.seconds}s used up)"
+            )
+        raise TimeoutException(message) from last_error
+
+    def _record(self, key, polls, started, satisfied, current_budget):
+        elapsed = time.monotonic() - started
+        if current_budget is not None:
+            current_budget.spent += elapsed
+        if satisfied and key is not None:
+            _learn(key, elapsed)
+        with _lock:
+            _records.append((polls, elapsed, satisfied))
+        logger.debug(
+            f"Wait for {key or 'condition'}: {'satisfied' if satisfied else 'timeout'} "
+            f"after {polls} polls, {elapsed:.2f}s"
+        )